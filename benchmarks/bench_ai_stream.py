@@ -0,0 +1,158 @@
+"""Time-to-first-token of ``--explain`` against a local stub completion server.
+
+Starts an OpenAI-compatible stub on localhost that produces ``--tokens``
+tokens, ``--token-delay`` seconds apart, and answers the first
+``--fail-first`` requests with 503 so the retry path is exercised. Then it
+compares the old one-shot ``requests.post`` per call with the pooled
+``AIClient`` in non-streaming and streaming mode. No API key or network
+access is needed.
+
+Usage::
+
+    python benchmarks/bench_ai_stream.py --tokens 200 --token-delay 0.01 --repeat 3 --fail-first 1
+
+To try the real CLI against the stub, run it with ``--serve`` and point
+smartman at it::
+
+    SMARTMAN_AI_BASE_URL=http://127.0.0.1:8765/v1 GROQ_API_KEY=stub smartman --explain --no-cache ls
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from smartman.utils.ai_client import AIClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            fail = server.failures_left > 0
+            server.failures_left -= fail
+        if fail:
+            self._send(503, "application/json", b'{"error": "overloaded"}')
+            return
+
+        words = [f"word{i} " for i in range(server.tokens)]
+        if not payload.get("stream"):
+            time.sleep(server.token_delay * server.tokens)
+            body = {"choices": [{"message": {"role": "assistant", "content": "".join(words)}}]}
+            self._send(200, "application/json", json.dumps(body).encode("utf-8"))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in words:
+            time.sleep(server.token_delay)
+            event = {"choices": [{"delta": {"content": word}}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_stub(port: int, tokens: int, token_delay: float, fail_first: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.tokens = tokens
+    server.token_delay = token_delay
+    server.failures_left = fail_first
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def one_shot(url: str, payload: dict) -> tuple[float, float]:
+    start = time.perf_counter()
+    response = requests.post(f"{url}/chat/completions", json=payload, timeout=60)
+    response.json()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def pooled(client: AIClient, payload: dict) -> tuple[float, float]:
+    start = time.perf_counter()
+    client.complete(payload)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def streamed(client: AIClient, payload: dict) -> tuple[float, float]:
+    start = time.perf_counter()
+    first = None
+    for _ in client.stream(payload):
+        if first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI client streaming benchmark against a local stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer this many requests with 503 first")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--serve", action="store_true", help="Only run the stub server")
+    args = parser.parse_args()
+
+    server = start_stub(args.port, args.tokens, args.token_delay, args.fail_first)
+    url = f"http://127.0.0.1:{args.port}/v1"
+    if args.serve:
+        print(f"Stub listening on {url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            return
+
+    client = AIClient("stub", url)
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "explain ls"}]}
+    # The first request absorbs the injected failures (via the client's retries).
+    streamed(client, payload)
+    print(f"warm-up took {server.requests} request(s) ({args.fail_first} injected 503s)")
+
+    modes = {
+        "one-shot requests.post": lambda: one_shot(url, payload),
+        "pooled, whole answer": lambda: pooled(client, payload),
+        "pooled, streamed": lambda: streamed(client, payload),
+    }
+    print(f"{args.tokens} tokens, {args.token_delay * 1000:.0f} ms apart, median of {args.repeat}")
+    print(f"  {'mode':24} {'first token':>12} {'total':>10}")
+    for name, run in modes.items():
+        samples = [run() for _ in range(args.repeat)]
+        first = statistics.median(s[0] for s in samples)
+        total = statistics.median(s[1] for s in samples)
+        print(f"  {name:24} {first * 1000:9.1f} ms {total * 1000:7.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Stage-level timing of the man fetch pipeline.
+
+Compares the original implementation (``man`` buffered into a str, then a
+second ``col -b`` process, then a full-text section split) against the
+streaming pipeline in :class:`ManParser`, where overstrikes are stripped and
+sections are split line by line as bytes arrive from man's pipe.
+
+Usage::
+
+    python benchmarks/bench_fetch.py ls tar bash gcc --repeat 5
+
+Requires ``man`` and ``col`` on PATH.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import time
+
+from smartman.parser.man_parser import ManParser, SectionSplitter, is_section_header, split_sections
+from smartman.utils import get_man_binary
+
+
+def legacy_fetch(parser: ManParser, command: str) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    man_bin = get_man_binary()
+
+    start = time.perf_counter()
+    man_result = subprocess.run(
+        [man_bin] + command.split(),
+        capture_output=True,
+        text=True,
+        timeout=15,
+        env=parser._man_env(),
+    )
+    timings["man"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    col_result = subprocess.run(["col", "-b"], input=man_result.stdout, capture_output=True, text=True)
+    timings["col -b"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    split_sections(col_result.stdout.splitlines())
+    timings["split"] = time.perf_counter() - start
+
+    timings["total"] = timings["man"] + timings["col -b"] + timings["split"]
+    return timings
+
+
+def streaming_fetch(parser: ManParser, command: str) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    splitter = SectionSplitter(is_section_header)
+
+    start = time.perf_counter()
+    first_section = None
+    for line in parser._stream_man(command):
+        if splitter.feed(line) is not None and first_section is None:
+            first_section = time.perf_counter() - start
+        if "first line" not in timings:
+            timings["first line"] = time.perf_counter() - start
+    splitter.finish()
+    timings["first section"] = first_section if first_section is not None else float("nan")
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def _median(runs: list[dict[str, float]]) -> dict[str, float]:
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("commands", nargs="+")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    parser = ManParser(use_cache=False, native=False)
+    for command in args.commands:
+        legacy = _median([legacy_fetch(parser, command) for _ in range(args.repeat)])
+        streaming = _median([streaming_fetch(parser, command) for _ in range(args.repeat)])
+
+        print(f"\n{command}")
+        for label, timings in (("legacy", legacy), ("streaming", streaming)):
+            stages = "  ".join(f"{stage}={value * 1000:7.1f}ms" for stage, value in timings.items())
+            print(f"  {label:<10} {stages}")
+        print(f"  speedup    {legacy['total'] / streaming['total']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
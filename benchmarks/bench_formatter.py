@@ -0,0 +1,99 @@
+"""Micro-benchmark of section rendering in :class:`Formatter`.
+
+Compares the original per-line renderer (``FLAG_PATTERN.split`` into a new
+``Text`` per line, each wrapped in ``Padding`` and printed on its own)
+against ``Formatter.style_section``, which styles a whole section with one
+``finditer`` pass and prints it once. Output goes to an in-memory console
+so terminal speed is not measured.
+
+Usage::
+
+    python benchmarks/bench_formatter.py --page gcc --section OPTIONS --repeat 5
+
+If the page is not installed, a synthetic OPTIONS section of similar size
+is used instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import time
+
+from rich.console import Console
+from rich.padding import Padding
+from rich.text import Text
+
+from smartman.parser.man_parser import ManPageNotFoundError, ManParser
+from smartman.renderer.formatter import FLAG_PATTERN, Formatter, SectionBlock
+from smartman.utils import load_theme
+
+
+def legacy_render(formatter: Formatter, content: str) -> None:
+    flag_style = formatter.theme.get("flag", "bold yellow")
+    desc_style = formatter.theme.get("description", "white")
+    for line in content.splitlines():
+        text = Text()
+        for part in FLAG_PATTERN.split(line):
+            if FLAG_PATTERN.match(part):
+                text.append(part, style=flag_style)
+            else:
+                text.append(part, style=desc_style)
+        formatter.console.print(Padding(text, (0, 4)))
+
+
+def batched_render(formatter: Formatter, name: str, content: str) -> None:
+    formatter.console.print(SectionBlock(formatter.style_section(name, content), 4), crop=False)
+
+
+def synthetic_options(lines: int) -> str:
+    out = []
+    for i in range(lines // 3):
+        out.append(f"       -fopt-{i}, --long-option-{i}=VALUE")
+        out.append(f"           Enable optimisation {i}; implies -O2 and -fno-opt-{i + 1} unless")
+        out.append("           --no-implied is given.")
+    return "\n".join(out)
+
+
+def time_it(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Formatter section rendering benchmark")
+    parser.add_argument("--page", default="gcc")
+    parser.add_argument("--section", default="OPTIONS")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--width", type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        content = ManParser().parse(args.page).get_section(args.section)
+    except (ManPageNotFoundError, FileNotFoundError):
+        content = ""
+    if not content:
+        print(f"{args.page}({args.section}) not available, using a synthetic section")
+        content = synthetic_options(12000)
+
+    formatter = Formatter(load_theme("default"))
+    formatter.console = Console(file=io.StringIO(), width=args.width, force_terminal=True, color_system="truecolor")
+
+    lines = content.count("\n") + 1
+    legacy = time_it(lambda: legacy_render(formatter, content), args.repeat)
+    batched = time_it(lambda: batched_render(formatter, args.section, content), args.repeat)
+    style_only = time_it(lambda: formatter.style_section(args.section, content), args.repeat)
+
+    print(f"{lines} lines, median of {args.repeat}")
+    print(f"  per-line Text + print   {legacy * 1000:9.1f} ms")
+    print(f"  one Text per section    {batched * 1000:9.1f} ms  ({legacy / batched:.1f}x)")
+    print(f"    of which styling      {style_only * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
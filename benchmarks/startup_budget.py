@@ -0,0 +1,76 @@
+"""Fail when cold CLI startup exceeds its millisecond budget.
+
+Each run is a fresh ``python -m smartman.cli`` process, so module imports are
+paid every time, exactly as they are behind ``alias man=smartman``. The
+``--plain`` case is warmed once first so that it measures startup and a
+page-cache hit rather than man itself. Budgets are for the time spent beyond
+a bare ``python -c pass``, so they do not depend on how slow the machine's
+interpreter startup is.
+
+Usage::
+
+    python benchmarks/startup_budget.py --runs 10 --page ls
+
+Exits with status 1 if the median of any case is over budget; run
+``smartman --startup-profile`` to see which imports grew.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+DEFAULT_VERSION_BUDGET_MS = 150.0
+DEFAULT_PLAIN_BUDGET_MS = 250.0
+
+
+def time_run(args: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "smartman.cli", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def time_interpreter() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--page", default="ls", help="Page rendered by the --plain case")
+    parser.add_argument("--version-budget", type=float, default=DEFAULT_VERSION_BUDGET_MS, metavar="MS")
+    parser.add_argument("--plain-budget", type=float, default=DEFAULT_PLAIN_BUDGET_MS, metavar="MS")
+    args = parser.parse_args()
+
+    interpreter = statistics.median(time_interpreter() for _ in range(args.runs))
+
+    cases = [
+        ("--version", ["--version"], args.version_budget),
+        ("--plain", ["--plain", args.page], args.plain_budget),
+    ]
+    time_run(["--plain", args.page])
+
+    failed = False
+    print(f"{'case':<12}{'median':>10}{'overhead':>10}{'budget':>10}   (bare interpreter: {interpreter:.1f} ms)")
+    for name, argv, budget in cases:
+        median = statistics.median(time_run(argv) for _ in range(args.runs))
+        overhead = median - interpreter
+        status = "ok" if overhead <= budget else "OVER BUDGET"
+        failed |= overhead > budget
+        print(f"{name:<12}{median:>8.1f}ms{overhead:>8.1f}ms{budget:>8.0f}ms   {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
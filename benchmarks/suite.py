@@ -0,0 +1,265 @@
+"""Stage-by-stage benchmark suite over a fixed corpus; no ``man`` binary needed.
+
+The corpus in ``benchmarks/corpus`` holds rendered man pages captured once
+(``true`` as a small page, ``ls`` and ``tar`` as typical ones, ``bash`` at
+the large end), and synthetic pages of several megabytes are generated on
+the fly. For every page each stage is timed on its own:
+
+* ``split``: section splitting (``split_sections``)
+* ``options``: option table extraction
+* ``examples``: ``ManPage.get_quick_examples``
+* ``format``: ``Formatter.render_plain`` into an in-memory console
+* ``context``: AI context selection (``build_context``)
+* ``tui_mount``: ``SmartManApp`` start-up and first paint in Textual's headless pilot
+* ``tui_search``: highlighting every match of a query in the mounted view
+
+Timings are the median of ``--repeat`` runs. Peak memory comes from a
+separate ``tracemalloc`` run, so tracing does not slow down the timed runs.
+
+Usage::
+
+    python benchmarks/suite.py --repeat 5 --output before.json
+    python benchmarks/suite.py --repeat 5 --output after.json --compare before.json
+
+``--stages`` and ``--pages`` select a subset, ``--synthetic-mb 2,8`` sets
+the generated page sizes and ``--capture ls tar`` refreshes corpus entries
+from the installed pages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.console import Console
+
+from smartman.parser.man_parser import ManPage, ManParser, split_sections
+from smartman.parser.options import OptionTable, parse_options
+from smartman.renderer.formatter import Formatter
+from smartman.utils import load_theme
+from smartman.utils.ai_context import build_context
+
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+STAGES = ("split", "options", "examples", "format", "context", "tui_mount", "tui_search")
+SEARCH_QUERY = "file"
+
+
+def load_corpus(names: list[str] | None) -> dict[str, str]:
+    pages = {}
+    for path in sorted(CORPUS_DIR.glob("*.txt.gz")):
+        name = path.name.removesuffix(".txt.gz")
+        if names is None or name in names:
+            pages[name] = gzip.decompress(path.read_bytes()).decode("utf-8")
+    return pages
+
+
+def capture(commands: list[str]) -> None:
+    """Store the installed pages as corpus entries (needs the page sources)."""
+    parser = ManParser(use_cache=False)
+    CORPUS_DIR.mkdir(exist_ok=True)
+    for command in commands:
+        text = parser.parse(command).raw_text
+        name = command.split()[-1]
+        # mtime=0 keeps the file byte-identical between captures of the same text.
+        (CORPUS_DIR / f"{name}.txt.gz").write_bytes(gzip.compress(text.encode("utf-8"), mtime=0))
+        print(f"captured {name}: {len(text)} characters")
+
+
+def synthetic_page(megabytes: float) -> str:
+    """A gcc-shaped page: short header sections, then a very long OPTIONS list."""
+    lines = [
+        "NAME",
+        "       synthetic - generated page for benchmarks",
+        "",
+        "SYNOPSIS",
+        "       synthetic [-c|-S|-E] [-std=standard] [-g] [-pg] [-Olevel] [-Wwarn...]",
+        "                 [-Idir...] [-Ldir...] [-o outfile] infile...",
+        "",
+        "DESCRIPTION",
+        "       When you invoke synthetic, it normally does preprocessing, compilation,",
+        "       assembly and linking. The -c option says not to run the linker.",
+        "",
+        "OPTIONS",
+    ]
+    target = int(megabytes * 1024 * 1024)
+    size = sum(len(line) + 1 for line in lines)
+    i = 0
+    while size < target:
+        entry = [
+            f"       -fopt-{i}, --long-option-{i}=VALUE",
+            f"           Enable optimisation {i} for every file; implies -O2 and -fno-opt-{i + 1}",
+            "           unless --no-implied is given. See also -Wall and the EXAMPLES below.",
+            "",
+        ]
+        lines.extend(entry)
+        size += sum(len(line) + 1 for line in entry)
+        i += 1
+    lines += [
+        "EXAMPLES",
+        "       Compile one file with the first optimisation enabled:",
+        "",
+        "              synthetic -fopt-0 -o out file.c",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def build_page(name: str, text: str) -> ManPage:
+    text, spans = split_sections(text.split("\n"))
+    return ManPage(name, text, spans, OptionTable(text, parse_options(text, spans)))
+
+
+def stage_runners(name: str, text: str, theme: dict) -> dict[str, Callable[[], object]]:
+    page = build_page(name, text)
+    lines = text.split("\n")
+    spans = page.spans
+
+    def render() -> None:
+        console = Console(file=io.StringIO(), width=100, force_terminal=True, color_system="truecolor")
+        Formatter(theme, console).render_plain(page)
+
+    return {
+        "split": lambda: split_sections(lines),
+        "options": lambda: OptionTable(page.raw_text, parse_options(page.raw_text, spans)),
+        "examples": page.get_quick_examples,
+        "format": render,
+        "context": lambda: build_context(page),
+        "tui_mount": lambda: asyncio.run(_tui(page, theme, search=False)),
+        "tui_search": lambda: asyncio.run(_tui(page, theme, search=True)),
+    }
+
+
+async def _tui(page: ManPage, theme: dict, search: bool) -> float | None:
+    """Mount the app headlessly; returns the search time when ``search`` is set."""
+    from smartman.renderer.page_view import ManPageView
+    from smartman.renderer.tui import SmartManApp
+
+    app = SmartManApp(page, theme)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        if not search:
+            return None
+        view = app.query_one(ManPageView)
+        start = time.perf_counter()
+        view.set_highlight(SEARCH_QUERY)
+        view.select_match(0)
+        return time.perf_counter() - start
+
+
+def measure(stage: str, run: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        # The search stage only counts the search itself, not mounting the app around it.
+        samples.append(result if stage == "tui_search" else elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = {(r["page"], r["stage"]): r for r in json.loads(baseline_path.read_text())["results"]}
+    print(f"\ncompared with {baseline_path}")
+    print(f"  {'page':14} {'stage':11} {'before':>10} {'after':>10} {'change':>8}")
+    for result in results:
+        old = baseline.get((result["page"], result["stage"]))
+        if old is None or not old["median_ms"]:
+            continue
+        change = result["median_ms"] / old["median_ms"] - 1
+        print(
+            f"  {result['page']:14} {result['stage']:11} {old['median_ms']:8.2f}ms "
+            f"{result['median_ms']:8.2f}ms {change:+8.0%}"
+        )
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SmartMan stage benchmark suite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stages", help=f"Comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument("--pages", help="Comma-separated corpus pages (default: all)")
+    parser.add_argument("--synthetic-mb", default="2,8", help="Sizes of generated pages; empty for none")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON from an earlier run to compare against")
+    parser.add_argument("--capture", nargs="+", metavar="PAGE", help="Refresh corpus entries and exit")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture(args.capture)
+        return
+
+    stages = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    pages = load_corpus(args.pages.split(",") if args.pages else None)
+    for size in filter(None, args.synthetic_mb.split(",")):
+        pages[f"synthetic-{size}mb"] = synthetic_page(float(size))
+
+    theme = load_theme("default")
+    results = []
+    print(f"{'page':14} {'size':>8} {'stage':11} {'median':>10} {'min':>10} {'peak':>10}")
+    for name, text in pages.items():
+        runners = stage_runners(name, text, theme)
+        for stage in stages:
+            result = {"page": name, "chars": len(text), "stage": stage, **measure(stage, runners[stage], args.repeat)}
+            results.append(result)
+            print(
+                f"{name:14} {len(text) // 1024:6}kB {stage:11} {result['median_ms']:8.2f}ms "
+                f"{result['min_ms']:8.2f}ms {result['peak_kb'] / 1024:8.1f}MB"
+            )
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
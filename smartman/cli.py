@@ -1,44 +1,275 @@
+import os
+import signal
 import sys
+from contextlib import closing
 from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
 
 from smartman import __version__
-from smartman.parser.man_parser import ManParser, ManPageNotFoundError
-from smartman.renderer.formatter import Formatter
-from smartman.renderer.tui import SmartManApp
-from smartman.utils import load_theme
-from smartman.utils.ai import explain_command
-from smartman.utils.tips import get_random_tip
+from smartman.utils import trace
+
+# Everything else is imported inside the code path that needs it: with
+# "alias man=smartman" this module is loaded hundreds of times a day, and
+# --version or --plain should not pay for Textual or requests.
+# `smartman --startup-profile` shows what each mode costs.
 
 app = typer.Typer(
     name="smartman",
     help="SmartMan — Modern Linux Man Page Enhancer CLI",
+    epilog="Maintenance: smartman --search WORDS..., --warm, --cache, --daemon (each takes --help).",
     add_completion=False,
 )
 console = Console()
 
+# Maintenance commands live on their own Typer app and are spelled as options
+# ("smartman --warm"): any bare word must stay a page name, so that with
+# "alias man=smartman", "man daemon" still opens daemon(7).
+tools = typer.Typer(
+    name="smartman",
+    help="SmartMan maintenance commands",
+    add_completion=False,
+)
+
+
+@tools.callback()
+def tools_main() -> None:
+    """SmartMan maintenance commands."""
+
+
+@tools.command()
+def warm(
+    sections: Optional[str] = typer.Option(None, "--sections", "-s", help="Comma-separated sections to warm, e.g. 1,8"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Worker processes (default: all cores)"),
+):
+    """
+    Pre-parse every installed man page into the cache.
+    """
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+    from smartman.parser.warm import warm_cache
+
+    section_list = [s for s in sections.split(",") if s.strip()] if sections else None
+
+    with Progress(
+        TextColumn("[bold blue]Warming cache"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("warm", total=None)
+
+        def update(result) -> None:
+            progress.update(task, total=result.total, completed=result.warmed + result.skipped + result.failed)
+
+        try:
+            result = warm_cache(section_list, jobs=jobs, on_progress=update)
+        except KeyboardInterrupt:
+            console.print("[yellow]Interrupted.[/yellow] Run [bold cyan]smartman --warm[/bold cyan] again to resume.")
+            raise typer.Exit(130)
+
+    console.print(
+        f"[bold green]Warmed {result.warmed}[/bold green] pages "
+        f"([dim]{result.skipped} already cached, {result.failed} failed[/dim])"
+    )
+
+
+@tools.command()
+def search(
+    terms: list[str] = typer.Argument(..., help="Words to search for across all man pages"),
+    limit: int = typer.Option(15, "--limit", "-n", help="Maximum number of results"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Rebuild the search index first"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Worker processes for indexing"),
+):
+    """
+    Search the text of every installed man page.
+    """
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+    from smartman.index.fulltext import FullTextIndex, build_fulltext_index, default_index_path, hit_snippet
+    from smartman.parser.man_parser import ManParser
+    from smartman.renderer.formatter import Formatter
+    from smartman.utils import load_theme
+
+    index = None
+    if not rebuild and default_index_path().exists():
+        try:
+            index = FullTextIndex()
+        except ValueError:
+            index = None
+        if index is not None and index.is_stale():
+            index.close()
+            index = None
+
+    if index is None:
+        with Progress(
+            TextColumn("[bold blue]Indexing man pages"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task("index", total=None)
+            build_fulltext_index(
+                jobs=jobs,
+                on_progress=lambda done, total: progress.update(task, completed=done, total=total),
+            )
+        index = FullTextIndex()
+
+    with index:
+        hits = index.search(" ".join(terms), limit=limit)
 
-@app.callback(invoke_without_command=True)
+    if not hits:
+        console.print(f"[bold yellow]No pages mention[/bold yellow] {' '.join(terms)}")
+        raise typer.Exit(1)
+
+    parser = ManParser()
+    formatter = Formatter(load_theme("default"), console)
+    formatter.render_search_hits(hits, [hit_snippet(hit, parser) for hit in hits])
+
+
+@tools.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    idle_timeout: float = typer.Option(15 * 60, "--idle-timeout", help="Exit after this many idle seconds"),
+):
+    """
+    Run the resident daemon that serves --plain and search from memory.
+    """
+    from smartman.daemon import request, serve, socket_path
+
+    if stop:
+        if request({"op": "stop"}, autostart=False) is None:
+            console.print("[dim]No daemon running.[/dim]")
+        else:
+            console.print("[bold green]Daemon stopped.[/bold green]")
+        return
+
+    console.print(f"[bold blue]Listening on[/bold blue] {socket_path()} [dim](Ctrl+C to stop)[/dim]")
+    try:
+        started = serve(idle_timeout)
+    except KeyboardInterrupt:
+        return
+    if not started:
+        console.print("[bold yellow]A daemon is already running.[/bold yellow]")
+        raise typer.Exit(1)
+
+
+@tools.command()
+def cache(
+    clear: bool = typer.Option(False, "--clear", help="Delete cached pages and explanations"),
+):
+    """
+    Show (or clear) what the page and explanation caches hold.
+    """
+    from rich.table import Table
+
+    from smartman.parser.cache import PageCache
+    from smartman.utils.ai_cache import ExplanationCache
+
+    pages = PageCache()
+    explanations = ExplanationCache()
+    if clear:
+        pages.store.clear()
+        explanations.clear()
+        console.print("[bold green]Caches cleared.[/bold green]")
+        return
+
+    stats = explanations.stats()
+    page_entries, page_bytes = pages.store.usage()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "-"
+
+    table = Table(header_style="bold cyan", box=None)
+    table.add_column("Cache", style="bold yellow", no_wrap=True)
+    table.add_column("Entries", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit rate", justify="right")
+    table.add_row("pages", str(page_entries), f"{page_bytes / 1e6:.1f} MB", "-", "-", "-")
+    table.add_row(
+        "explanations",
+        str(stats["entries"]),
+        f"{stats['bytes'] / 1e6:.1f} MB",
+        str(stats["hits"]),
+        str(stats["misses"]),
+        hit_rate,
+    )
+    console.print(table)
+
+
+TOOL_OPTIONS = {"--warm": "warm", "--search": "search", "--daemon": "daemon", "--cache": "cache"}
+
+
+def run() -> None:
+    """Console entry point: dispatch maintenance commands, else look up a page."""
+    trace.enable_from_env()
+    if len(sys.argv) > 1 and sys.argv[1] in TOOL_OPTIONS:
+        command = typer.main.get_command(tools).commands[TOOL_OPTIONS[sys.argv[1]]]
+        command.main(args=sys.argv[2:], prog_name=f"smartman {sys.argv[1]}")
+    else:
+        app()
+
+
+# Unknown options are left in `command`, so "smartman tar -z --xattrs" reaches
+# the flag lookup. Click stops parsing options at the page name; smartman's
+# long options after it are picked out by _own_options. Short ones there
+# ("tar -t") are the page's flags, as is everything after "--".
+@app.callback(
+    invoke_without_command=True,
+    context_settings={"ignore_unknown_options": True, "allow_extra_args": True},
+)
 def main(
     ctx: typer.Context,
-    command: Optional[list[str]] = typer.Argument(None, help="The command to look up"),
+    command: Optional[list[str]] = typer.Argument(None, help="The command to look up, optionally followed by flags to explain"),
     version: Optional[bool] = typer.Option(None, "--version", "-v", help="Show version", is_eager=True),
     plain: bool = typer.Option(False, "--plain", help="Force plain output mode"),
+    multi: bool = typer.Option(False, "--multi", "-m", help="Open each argument as its own page (in tabs)"),
+    section: Optional[str] = typer.Option(
+        None, "--section", "-S", help="Print only these sections (comma-separated), e.g. SYNOPSIS,EXAMPLES"
+    ),
     theme_name: str = typer.Option("default", "--theme", "-t", help="Visual theme to use"),
     explain: bool = typer.Option(False, "--explain", help="Get AI-powered explanation"),
+    ask: Optional[str] = typer.Option(None, "--ask", help="Ask the AI a question about the command"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ask the AI again instead of reusing a cached explanation"),
     tip: bool = typer.Option(False, "--tip", help="Show a random Linux tip"),
+    startup_profile: bool = typer.Option(False, "--startup-profile", help="Show import time for each mode and exit"),
+    trace_spec: Optional[str] = typer.Option(
+        None, "--trace", help="Time each stage: summary, json or chrome (add :PATH to write a file)"
+    ),
+    trace_memory: bool = typer.Option(False, "--trace-memory", help="With --trace, also record peak memory per stage"),
 ):
     """
     Enhanced man page viewer with structured sections and TUI.
     """
+    command, moved = _own_options(ctx, command or [])
+    if moved:
+        # "smartman ls --plain": run as if the options had come before the page name.
+        return main(ctx, **{**ctx.params, **moved, "command": command})
+
+    if trace_spec:
+        try:
+            trace.enable(trace_spec, memory=trace_memory)
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise typer.Exit(2)
+
     if version:
         console.print(f"SmartMan version: [bold cyan]{__version__}[/bold cyan]")
         raise typer.Exit()
 
+    if startup_profile:
+        _print_startup_profile()
+        raise typer.Exit()
+
     if tip:
+        from rich.panel import Panel
+
+        from smartman.utils.tips import get_random_tip
+
         t = get_random_tip()
         console.print()
         console.print(Panel(
@@ -52,36 +283,92 @@ def main(
         raise typer.Exit()
 
     if not command:
-        console.print("[bold yellow]Usage:[/bold yellow] smartman <command>")
-        console.print("Try [bold cyan]smartman --help[/bold cyan] for more info.")
-        raise typer.Exit()
+        if plain or not sys.stdout.isatty() or not sys.stdin.isatty():
+            console.print("[bold yellow]Usage:[/bold yellow] smartman <command>")
+            console.print("Try [bold cyan]smartman --help[/bold cyan] for more info.")
+            raise typer.Exit()
+        # No page named: pick one from every installed page by fuzzy search.
+        from smartman.renderer.picker import PagePicker
+
+        choice = PagePicker().run()
+        if not choice:
+            raise typer.Exit()
+        command = [choice]
+
+    from smartman.parser.man_parser import ManPageNotFoundError, ManParser
+
+    # Join multi-word commands (smartman docker run). Everything after the
+    # first flag is looked up; words in between are the flags' values and
+    # are ignored ("--" itself reaches us too, as unknown options pass through).
+    command = [word for word in command if word != "--"]
+    first_flag = next((i for i, word in enumerate(command) if word.startswith("-")), len(command))
+    words = command[:first_flag]
+    flags = [word for word in command[first_flag:] if word.startswith("-")]
+    if not words:
+        console.print("[bold yellow]Usage:[/bold yellow] smartman <command> \\[flags...]")
+        raise typer.Exit(2)
+    cmd_str = " ".join(words)
+    # Several pages: "smartman --multi ls tar" or "smartman docker run, git commit".
+    if multi:
+        pages = list(dict.fromkeys(words))
+    else:
+        pages = list(dict.fromkeys(filter(None, (part.strip() for part in cmd_str.split(",")))))
+    if len(pages) > 1 and (flags or explain or ask or section):
+        console.print("[bold yellow]Flag lookup, --section, --explain and --ask take a single page.[/bold yellow]")
+        raise typer.Exit(2)
+    cmd_str = pages[0] if pages else cmd_str
 
-    # Join multi-word commands (smartman docker run)
-    cmd_str = " ".join(command)
+    if flags:
+        _print_flags(ManParser(), cmd_str, flags, theme_name)
+
+    if explain or ask:
+        from rich.live import Live
+
+        from smartman.utils.ai import stream_explanation
+        from smartman.utils.ai_cache import ExplanationCache
+        from smartman.utils.ai_context import build_context
 
-    if explain:
         try:
             parser = ManParser()
             with console.status(f"[bold blue]Fetching manual for {cmd_str} for AI explanation...[/bold blue]"):
                 page = parser.parse(cmd_str)
         except ManPageNotFoundError as e:
-            console.print(f"[bold red]Error:[/bold red] {e}")
+            _print_not_found(e)
             sys.exit(1)
         except Exception as e:
             console.print(f"[bold red]An unexpected error occurred during man page fetch for AI:[/bold red] {e}")
             sys.exit(1)
 
-        with console.status(f"[bold blue]Generating AI explanation for {cmd_str}...[/bold blue]"):
-            explanation_text = explain_command(cmd_str, page.raw_text)
-
-        console.print(Panel(
-            explanation_text,
-            title=f"[bold green]AI Explanation for {cmd_str.upper()}[/bold green]",
-            border_style="green",
-            expand=False
-        ))
+        with trace.span("ai.context"):
+            context = build_context(page, ask)
+        cache = ExplanationCache()
+        kind = "Answer" if ask else "Explanation"
+        title = f"[bold green]AI {kind} for {cmd_str.upper()}[/bold green]"
+        parts = stream_explanation(cmd_str, context.text, question=ask, cache=cache, refresh=no_cache)
+        with closing(parts):
+            # The spinner runs until the first token; from then on the panel grows as tokens arrive.
+            with console.status(f"[bold blue]Generating AI explanation for {cmd_str}...[/bold blue]"):
+                explanation_text = next(parts, "")
+            if console.is_terminal:
+                live_panel = _explanation_panel(explanation_text, title)
+                with Live(live_panel, console=console, refresh_per_second=15, transient=True) as live:
+                    for part in parts:
+                        explanation_text += part
+                        live.update(_explanation_panel(explanation_text, title))
+            else:
+                # Piped output only gets the finished panel.
+                explanation_text += "".join(parts)
+        subtitle = "[dim]cached — use --no-cache to refresh[/dim]" if cache.hits else None
+        console.print(_explanation_panel(explanation_text, title, subtitle))
+        if not cache.hits:
+            console.print(
+                f"[dim]Context: ~{context.tokens} tokens of the page's ~{context.page_tokens} "
+                f"({context.chunks} of {context.total_chunks} excerpts)[/dim]"
+            )
         raise typer.Exit()
 
+    from smartman.utils import load_theme
+
     try:
         # Load theme
         try:
@@ -89,27 +376,198 @@ def main(
         except Exception:
             theme_dict = load_theme("default")
 
-        # Parse man page
         parser = ManParser()
-        with console.status(f"[bold blue]Fetching manual for {cmd_str}...[/bold blue]"):
-            page = parser.parse(cmd_str)
 
-        if plain:
-            # Rich plain rendering
+        if len(pages) > 1:
+            _open_pages(parser, pages, theme_dict, plain)
+        elif plain or section:
+            # Rich plain rendering, printed section by section as the page is parsed.
+            # With --section the fetch stops once the last requested section is in.
+            from smartman.renderer.formatter import Formatter
+
+            only = [name.strip() for name in section.split(",") if name.strip()] if section else None
             formatter = Formatter(theme_dict)
-            formatter.render_plain(page)
+            sections = parser.iter_sections(cmd_str, only)
+            try:
+                with closing(sections), trace.span("cli.plain"):
+                    printed = formatter.render_stream(cmd_str, sections)
+            except BrokenPipeError:
+                # The reader went away (`| head`): closing the iterator has
+                # already stopped the fetch, so just exit like a SIGPIPE'd tool.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                sys.exit(128 + signal.SIGPIPE)
+            if only:
+                found = {name.upper() for name in printed}
+                missing = [name for name in only if name.upper() not in found]
+                for name in missing:
+                    console.print(f"[bold yellow]No {name.upper()} section in {cmd_str}[/bold yellow]")
+                if missing and not printed:
+                    sys.exit(1)
         else:
-            # Textual TUI
-            tui_app = SmartManApp(page, theme_dict)
-            tui_app.run()
+            # Textual TUI: it opens at once and fetches the page in a worker,
+            # showing each section as soon as it is parsed.
+            from smartman.renderer.tui import SmartManApp
+
+            tui_app = SmartManApp(None, theme_dict, commands=[cmd_str], parser=parser)
+            with trace.span("cli.tui"):
+                tui_app.run()
+            if tui_app.return_code:
+                sys.exit(tui_app.return_code)
 
     except ManPageNotFoundError as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+        _print_not_found(e)
         sys.exit(1)
     except Exception as e:
         console.print(f"[bold red]An unexpected error occurred:[/bold red] {e}")
         sys.exit(1)
 
 
+def _own_options(ctx: typer.Context, words: list[str]) -> tuple[list[str], dict]:
+    """Take smartman's long options (``--plain``, ``--theme nord``) out of the words after the page name.
+
+    Returns the remaining words and ``{parameter name: value}`` of the options found.
+    """
+    options = {
+        opt: param
+        for param in ctx.command.params
+        if param.param_type_name == "option"
+        for opt in param.opts
+        if opt.startswith("--")
+    }
+    rest: list[str] = []
+    values: dict = {}
+    args = iter(words)
+    for word in args:
+        if word == "--":
+            rest.append(word)
+            rest.extend(args)
+            break
+        name, has_value, value = word.partition("=")
+        param = options.get(name)
+        if param is None:
+            rest.append(word)
+        elif param.is_flag:
+            values[param.name] = True
+        else:
+            if not has_value:
+                value = next(args, None)
+                if value is None:
+                    console.print(f"[bold red]Error:[/bold red] {name} needs a value")
+                    raise typer.Exit(2)
+            values[param.name] = value
+    return rest, values
+
+
+def _open_pages(parser, commands: list[str], theme: dict, plain: bool) -> None:
+    """Fetch several pages at once: tabs in the TUI, or printed one after another."""
+    if not plain:
+        from smartman.renderer.tui import SmartManApp
+
+        # The app starts at once and fetches the pages itself, filling in each tab as it arrives.
+        tui_app = SmartManApp(None, theme, commands=commands, parser=parser)
+        with trace.span("cli.tui", pages=len(commands)):
+            tui_app.run()
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from smartman.parser.man_parser import FETCH_WORKERS, ManPageNotFoundError
+    from smartman.renderer.formatter import Formatter
+
+    formatter = Formatter(theme)
+    missing = False
+    with ThreadPoolExecutor(max_workers=min(len(commands), FETCH_WORKERS)) as executor:
+        futures = [executor.submit(parser.parse, command) for command in commands]
+        # Printed in the order given; each page goes out as soon as it and those before it are ready.
+        with trace.span("cli.plain", pages=len(commands)):
+            for future in futures:
+                try:
+                    page = future.result()
+                except ManPageNotFoundError as e:
+                    _print_not_found(e)
+                    missing = True
+                    continue
+                formatter.render_plain(page)
+    if missing:
+        sys.exit(1)
+
+
+def _print_not_found(error) -> None:
+    """Report a missing page, with the installed pages named most like it."""
+    from smartman.index.finder import did_you_mean
+
+    console.print(f"[bold red]Error:[/bold red] {error}")
+    suggestion = did_you_mean(error.command)
+    if suggestion:
+        console.print(f"[bold yellow]{suggestion}[/bold yellow]")
+
+
+def _explanation_panel(text: str, title: str, subtitle: Optional[str] = None):
+    from rich.errors import MarkupError
+    from rich.panel import Panel
+    from rich.text import Text
+
+    try:
+        body = Text.from_markup(text)
+    except MarkupError:
+        # A half-streamed answer can contain a stray "[/...]"; show it as typed.
+        body = Text(text)
+    return Panel(body, title=title, subtitle=subtitle, border_style="green", expand=False)
+
+
+def _print_flags(parser, cmd_str: str, flags: list[str], theme_name: str) -> None:
+    """Answer "smartman tar -z" from the option table, without rendering the page."""
+    from smartman.parser.man_parser import ManPageNotFoundError
+    from smartman.renderer.formatter import Formatter
+    from smartman.utils import load_theme
+
+    try:
+        table = parser.parse_options(cmd_str)
+    except ManPageNotFoundError as e:
+        _print_not_found(e)
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[bold red]An unexpected error occurred:[/bold red] {e}")
+        raise typer.Exit(1)
+    try:
+        theme_dict = load_theme(theme_name)
+    except Exception:
+        theme_dict = load_theme("default")
+
+    formatter = Formatter(theme_dict, console)
+    missing = []
+    shown = set()
+    for flag in dict.fromkeys(flags):
+        entries = table.lookup(flag)
+        if not entries:
+            missing.append(flag)
+            continue
+        # "-zxvf -z" describes -z once.
+        entries = [entry for entry in entries if entry not in shown]
+        shown.update(entries)
+        if entries:
+            formatter.render_options(table, entries)
+    for flag in missing:
+        console.print(f"[bold yellow]No entry for[/bold yellow] {flag} [dim]in {cmd_str}[/dim]")
+    raise typer.Exit(1 if missing else 0)
+
+
+def _print_startup_profile() -> None:
+    from rich.table import Table
+
+    from smartman.utils.startup import STARTUP_MODES, by_package, profile_imports, startup_cost
+
+    table = Table(title="Import time per mode (fresh interpreter)", header_style="bold cyan", box=None)
+    table.add_column("Mode", style="bold yellow", no_wrap=True)
+    table.add_column("Imports", justify="right", no_wrap=True)
+    table.add_column("Heaviest packages (self time)", style="dim")
+    with console.status("[bold blue]Profiling imports...[/bold blue]"):
+        for mode, modules in STARTUP_MODES.items():
+            timings = profile_imports(modules)
+            heaviest = ", ".join(f"{name} {ms:.1f}ms" for name, ms in by_package(timings)[:5])
+            table.add_row(mode, f"{startup_cost(timings):.1f} ms", heaviest)
+    console.print(table)
+
+
 if __name__ == "__main__":
-    app()
+    run()
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .client import build_request, request, socket_path
+
+if TYPE_CHECKING:
+    from .server import DaemonServer, serve
+
+__all__ = ["DaemonServer", "build_request", "request", "serve", "socket_path"]
+
+
+def __getattr__(name: str):
+    # The server pulls in asyncio, Rich and the parser; the client must stay light.
+    if name in ("DaemonServer", "serve"):
+        from . import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
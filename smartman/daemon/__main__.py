@@ -0,0 +1,3 @@
+from smartman.daemon.server import serve
+
+serve()
@@ -0,0 +1,164 @@
+"""Thin client for the resident daemon, and the installed ``smartman`` entry point.
+
+This module is imported on every invocation, so it sticks to the standard
+library: forwarding a request must not cost more than the daemon saves.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+from smartman.utils import get_cache_dir
+
+
+DAEMON_ENV = "SMARTMAN_DAEMON"
+RESPONSE_TIMEOUT = 30.0
+START_TIMEOUT = 3.0
+
+# Response status codes; anything else is the exit status of the request.
+STATUS_OK = 0
+STATUS_UNAVAILABLE = 75
+
+
+def socket_path() -> Path:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "smartman.sock"
+    return get_cache_dir() / "daemon.sock"
+
+
+def request(payload: dict, autostart: bool = True) -> tuple[int, bytes] | None:
+    """Send one request; ``None`` means no daemon could be reached."""
+    sock = _connect()
+    if sock is None and autostart:
+        sock = _start_and_connect()
+    if sock is None:
+        return None
+    try:
+        with sock:
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                header = stream.readline()
+                if not header:
+                    return None
+                status = json.loads(header)["status"]
+                return status, stream.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_request(argv: list[str]) -> dict | None:
+    """Translate command-line arguments the daemon can serve; ``None`` for everything else."""
+    if argv[:1] == ["--search"]:
+        payload = {"op": "search", "terms": [], "limit": 15}
+        args = iter(argv[1:])
+        for arg in args:
+            if arg in ("--limit", "-n"):
+                value = next(args, "")
+                if not value.isdigit():
+                    return None
+                payload["limit"] = int(value)
+            elif arg.startswith("-"):
+                return None
+            else:
+                payload["terms"].append(arg)
+        if not payload["terms"]:
+            return None
+    else:
+        payload = {"op": "plain", "command": [], "theme": "default"}
+        plain = False
+        args = iter(argv)
+        for arg in args:
+            if arg == "--plain":
+                plain = True
+            elif arg in ("--theme", "-t"):
+                payload["theme"] = next(args, "default")
+            elif arg.startswith("--theme="):
+                payload["theme"] = arg.split("=", 1)[1]
+            elif arg.startswith("-"):
+                return None
+            else:
+                payload["command"].append(arg)
+        if not plain or not payload["command"]:
+            return None
+        payload["command"] = " ".join(payload["command"])
+        if "," in payload["command"]:
+            # Several pages ("ls, tar") are fetched concurrently in-process.
+            return None
+
+    payload["width"], payload["color_system"] = _terminal()
+    return payload
+
+
+def main() -> None:
+    """Console entry point: use the daemon when enabled, else run the CLI in-process."""
+    if os.environ.get(DAEMON_ENV):
+        payload = build_request(sys.argv[1:])
+        response = request(payload) if payload is not None else None
+        if response is not None and response[0] != STATUS_UNAVAILABLE:
+            status, body = response
+            try:
+                sys.stdout.buffer.write(body)
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # Reader went away (e.g. piped into head); nothing left to do.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(status)
+
+    from smartman.cli import run
+
+    run()
+
+
+def _connect() -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(RESPONSE_TIMEOUT)
+    try:
+        sock.connect(str(socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _start_and_connect() -> socket.socket | None:
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, "-m", "smartman.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect()
+        if sock is not None:
+            return sock
+        time.sleep(0.02)
+    return None
+
+
+def _terminal() -> tuple[int, str | None]:
+    """Width and Rich colour system the in-process CLI would have used for stdout."""
+    if not sys.stdout.isatty():
+        columns = os.environ.get("COLUMNS", "")
+        return (int(columns) if columns.isdigit() else 80), None
+    try:
+        width = os.get_terminal_size(sys.stdout.fileno()).columns
+    except OSError:
+        width = 80
+    if os.environ.get("NO_COLOR"):
+        return width, None
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return width, "truecolor"
+    term = os.environ.get("TERM", "").lower()
+    if term in ("dumb", "unknown"):
+        return width, None
+    return width, "256" if term.endswith("256color") else "standard"
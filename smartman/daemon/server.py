@@ -0,0 +1,239 @@
+"""Resident daemon that answers ``--plain`` and ``search`` requests from memory.
+
+Protocol: the client sends one JSON object per connection, terminated by a
+newline. The server answers with a JSON header line (``{"status": N}``)
+followed by the rendered ANSI output, then closes the connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+
+from smartman.daemon.client import STATUS_OK, STATUS_UNAVAILABLE, socket_path
+from smartman.parser.man_parser import ManPage, ManPageNotFoundError, ManParser
+from smartman.parser.names import resolve_source
+from smartman.renderer.formatter import Formatter
+from smartman.utils import load_theme
+
+
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+IDLE_CHECK_INTERVAL = 5.0
+MAX_PAGES = 128
+MAX_OUTPUTS = 256
+
+
+class DaemonServer:
+    """Keeps parsed pages, rendered output, themes and the search index in memory."""
+
+    def __init__(self, path: Path | None = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.parser = ManParser()
+        self._pages: OrderedDict[tuple, ManPage] = OrderedDict()
+        self._outputs: OrderedDict[tuple, tuple[int, bytes]] = OrderedDict()
+        self._themes: dict[str, dict] = {}
+        self._index = None
+        self._lock = threading.Lock()
+        self._workers = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        self._active = 0
+        self._last_activity = time.monotonic()
+        self._stop: asyncio.Event | None = None
+
+    async def serve(self) -> None:
+        self._stop = asyncio.Event()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        os.chmod(self.path, 0o600)
+        try:
+            async with server:
+                await self._wait_until_idle()
+        finally:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self._workers.shutdown(wait=False, cancel_futures=True)
+            if self._index is not None:
+                self._index.close()
+
+    async def _wait_until_idle(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), IDLE_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            if self._active == 0 and time.monotonic() - self._last_activity > self.idle_timeout:
+                return
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._active += 1
+        try:
+            try:
+                payload = json.loads(await reader.readline())
+                if payload["op"] in ("ping", "stop"):
+                    if payload["op"] == "stop":
+                        self._stop.set()
+                    response = STATUS_OK, b""
+                else:
+                    # Even a cached answer resolves the page on disk first; that stays off the loop.
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(self._workers, self._dispatch, payload)
+            except Exception:
+                # Whatever went wrong, the client falls back to running the CLI itself.
+                response = STATUS_UNAVAILABLE, b""
+            status, body = response
+            writer.write(json.dumps({"status": status}).encode("utf-8") + b"\n" + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._active -= 1
+            self._last_activity = time.monotonic()
+            writer.close()
+
+    def _output_key(self, payload: dict) -> tuple | None:
+        """Cache key for a rendered page; includes the source stamp so updates show up."""
+        if payload["op"] != "plain":
+            return None
+        stamp = _source_stamp(payload["command"])
+        return payload["command"], payload["theme"], payload["width"], payload["color_system"], stamp
+
+    def _dispatch(self, payload: dict) -> tuple[int, bytes]:
+        op = payload["op"]
+        if op == "search":
+            return self._search(payload)
+        if op == "plain":
+            key = self._output_key(payload)
+            if key[-1] is None:
+                # No file to stamp, so nothing would tell us when the page changes.
+                return self._plain(payload, key)
+            with self._lock:
+                response = self._outputs.get(key)
+                if response is not None:
+                    self._outputs.move_to_end(key)
+                    return response
+            response = self._plain(payload, key)
+            with self._lock:
+                self._outputs[key] = response
+                while len(self._outputs) > MAX_OUTPUTS:
+                    self._outputs.popitem(last=False)
+            return response
+        return STATUS_UNAVAILABLE, b""
+
+    def _plain(self, payload: dict, key: tuple) -> tuple[int, bytes]:
+        console, buffer = _console(payload)
+        command = payload["command"]
+        try:
+            page = self._page(command, key[-1])
+        except ManPageNotFoundError as e:
+            from smartman.index.finder import did_you_mean
+
+            # Same output as the in-process CLI.
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            suggestion = did_you_mean(e.command)
+            if suggestion:
+                console.print(f"[bold yellow]{suggestion}[/bold yellow]")
+            return 1, buffer.getvalue().encode("utf-8")
+        Formatter(self._theme(payload["theme"]), console).render_plain(page)
+        return STATUS_OK, buffer.getvalue().encode("utf-8")
+
+    def _search(self, payload: dict) -> tuple[int, bytes]:
+        from smartman.index.fulltext import FullTextIndex, default_index_path, hit_snippet
+
+        with self._lock:
+            if self._index is None or self._index.is_stale():
+                if self._index is not None:
+                    self._index.close()
+                    self._index = None
+                if not default_index_path().exists():
+                    return STATUS_UNAVAILABLE, b""
+                try:
+                    self._index = FullTextIndex()
+                except ValueError:
+                    return STATUS_UNAVAILABLE, b""
+                if self._index.is_stale():
+                    # Let the CLI rebuild it with its progress bar.
+                    return STATUS_UNAVAILABLE, b""
+            hits = self._index.search(" ".join(payload["terms"]), limit=payload["limit"])
+
+        console, buffer = _console(payload)
+        if not hits:
+            console.print(f"[bold yellow]No pages mention[/bold yellow] {' '.join(payload['terms'])}")
+            return 1, buffer.getvalue().encode("utf-8")
+        snippets = [hit_snippet(hit, self.parser) for hit in hits]
+        Formatter(self._theme("default"), console).render_search_hits(hits, snippets)
+        return STATUS_OK, buffer.getvalue().encode("utf-8")
+
+    def _page(self, command: str, stamp: tuple | None) -> ManPage:
+        if stamp is None:
+            return self.parser.parse(command)
+        key = (command, stamp)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                return page
+        page = self.parser.parse(command)
+        with self._lock:
+            self._pages[key] = page
+            while len(self._pages) > MAX_PAGES:
+                self._pages.popitem(last=False)
+        return page
+
+    def _theme(self, name: str) -> dict:
+        with self._lock:
+            theme = self._themes.get(name)
+            if theme is None:
+                try:
+                    theme = load_theme(name)
+                except Exception:
+                    theme = load_theme("default")
+                self._themes[name] = theme
+            return theme
+
+
+def serve(idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> bool:
+    """Run the daemon until it is stopped or idle; ``False`` if one is already running."""
+    path = socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        asyncio.run(DaemonServer(path, idle_timeout).serve())
+    return True
+
+
+def _console(payload: dict) -> tuple[Console, io.StringIO]:
+    buffer = io.StringIO()
+    color_system = payload["color_system"]
+    console = Console(
+        file=buffer,
+        width=payload["width"],
+        color_system=color_system,
+        force_terminal=color_system is not None,
+    )
+    return console, buffer
+
+
+def _source_stamp(command: str) -> tuple | None:
+    source = resolve_source(command)
+    if source is None:
+        return None
+    try:
+        st = os.stat(source)
+    except OSError:
+        return None
+    return str(source), st.st_mtime_ns, st.st_size
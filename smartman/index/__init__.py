@@ -0,0 +1,14 @@
+from .finder import FinderHit, FinderIndex, build_finder_index, did_you_mean, open_finder_index
+from .fulltext import FullTextIndex, SearchHit, build_fulltext_index, hit_snippet
+
+__all__ = [
+    "FinderHit",
+    "FinderIndex",
+    "FullTextIndex",
+    "SearchHit",
+    "build_finder_index",
+    "build_fulltext_index",
+    "did_you_mean",
+    "hit_snippet",
+    "open_finder_index",
+]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append ``value`` to ``out`` as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf, pos: int) -> tuple[int, int]:
+    """Read one varint from ``buf`` at ``pos``; returns ``(value, next_pos)``."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
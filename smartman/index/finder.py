@@ -0,0 +1,463 @@
+"""Trigram index of page names and NAME summaries, for finding a page by a rough name.
+
+One file under the cache directory::
+
+    header | meta (JSON) | page records | strings | lexicon | keys | postings
+
+Every installed page is a record (name, section, one-line description).
+Names and descriptions are split into words, and each word into trigrams
+padded with a space on both ends (``" gr"``, ``"gre"``, ``"rep"``,
+``"ep "``). The sorted lexicon maps each trigram to the pages that have
+it, once for names and once for descriptions. Postings are plain
+``uint32`` arrays, counted straight from the memory map without decoding.
+Each query word is scored by the share of its trigrams a page's name or
+description has, and only the best candidates are ranked more carefully.
+A query takes a few milliseconds across all pages.
+
+Summaries come from the page sources (the ``.SH NAME`` line, or mdoc's
+``.Nd``), so building never runs ``man``. As with the name index, the
+meta block keeps the mtime of every ``manN`` directory, and a rebuild only
+reads the directories that changed.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from smartman.parser.names import scan_man_directory
+from smartman.parser.source import (
+    SECTION_ORDER,
+    get_manpath,
+    manpath_fingerprint,
+    open_man_source,
+    resolve_include,
+    split_command_words,
+)
+from smartman.utils import get_cache_dir
+
+
+FINDER_MAGIC = b"SMFD"
+FINDER_VERSION = 1
+FINDER_FILE = "finder.idx"
+
+# magic, version, page count, key count, meta/records/strings/lexicon/keys/postings offsets
+_HEADER = struct.Struct("<4sHIIQQQQQQ")
+# string offset, name length, section length, description length, directory index
+_RECORD = struct.Struct("<IHHHH")
+# key offset, key length, postings offset, postings length
+_LEXICON = struct.Struct("<IBQI")
+
+# Keys are a field byte followed by the trigram.
+NAME_FIELD = "n"
+DESCRIPTION_FIELD = "d"
+
+WORD = re.compile(r"[^\W_]+")
+# The NAME section ends well within this many source lines on every real page.
+MAX_SUMMARY_LINES = 400
+MAX_SUMMARY_CHARS = 200
+MAX_REDIRECTS = 4
+SUMMARY_SEPARATOR = re.compile(r"\s+[-—–]+\s+")
+FONT_MACROS = {"B", "I", "BR", "BI", "IB", "IR", "RB", "RI", "SM", "SB"}
+
+# Pages ranked carefully after counting shared trigrams.
+CANDIDATE_POOL = 200
+# A query word found in a name counts this much more than one found in a description.
+NAME_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+SIMILARITY_WEIGHT = 2.0
+EXACT_BONUS = 10.0
+PREFIX_BONUS = 2.0
+# Queries shorter than a trigram match name prefixes instead.
+MIN_TRIGRAM_QUERY = 3
+# Suggestions for a missing page must look this much like what was typed.
+SUGGEST_CUTOFF = 0.6
+SUGGEST_LIMIT = 3
+
+
+@dataclass
+class FinderHit:
+    name: str
+    section: str
+    description: str
+    score: float
+
+    @property
+    def reference(self) -> str:
+        """``name(section)``, which every smartman command accepts."""
+        return f"{self.name}({self.section})"
+
+
+def default_finder_path() -> Path:
+    return get_cache_dir() / FINDER_FILE
+
+
+def trigrams(text: str) -> set[str]:
+    """Padded trigrams of every word in ``text``; ``git-commit`` and ``git commit`` match."""
+    grams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def build_finder_index(path: Path | None = None, previous: FinderIndex | None = None) -> int:
+    """Write a fresh index; directories unchanged since ``previous`` are not read again.
+
+    Returns the number of pages indexed.
+    """
+    path = path or default_finder_path()
+    reusable = previous.directories() if previous is not None else {}
+
+    directories: list[tuple[str, int]] = []
+    seen: set[tuple[str, str]] = set()
+    pages: list[tuple[str, str, str, int]] = []
+    for root in get_manpath():
+        try:
+            subdirs = sorted(d for d in os.listdir(root) if d.startswith("man"))
+        except OSError:
+            continue
+        for subdir in subdirs:
+            directory = str(root / subdir)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            old = reusable.get(directory)
+            if old is not None and old[0] == mtime:
+                entries = old[1]
+            else:
+                entries = [
+                    (name, section, read_summary(Path(page))) for name, section, page in scan_man_directory(directory)
+                ]
+            dir_index = len(directories)
+            directories.append((directory, mtime))
+            for name, section, description in entries:
+                # The same page under a later root is hidden by the first one, as for man.
+                if (name, section) not in seen:
+                    seen.add((name, section))
+                    pages.append((name, section, description, dir_index))
+
+    pages.sort()
+    _write_index(path, directories, pages)
+    return len(pages)
+
+
+def read_summary(path: Path) -> str:
+    """The one-line description from a page source's NAME section, or ``""``."""
+    from smartman.parser.roff import ESCAPE, PREDEFINED_STRINGS, SINGLE_ESCAPES, _clean, _named_char, _split_args
+
+    def unescape(match: re.Match) -> str:
+        if match.group("char2") is not None:
+            return _named_char(match.group("char2"))
+        if match.group("named") is not None:
+            return _named_char(match.group("named"))
+        for group in ("strb", "str2", "str1"):
+            if match.group(group) is not None:
+                return PREDEFINED_STRINGS.get(match.group(group), "")
+        single = match.group("single")
+        if single is not None:
+            return SINGLE_ESCAPES.get(single, single)
+        return ""
+
+    for _ in range(MAX_REDIRECTS):
+        parts: list[str] = []
+        redirect = None
+        in_name = False
+        try:
+            with open_man_source(path) as stream:
+                for number, line in enumerate(stream):
+                    if number >= MAX_SUMMARY_LINES:
+                        break
+                    line = line.rstrip("\n")
+                    if line.startswith((".", "'")):
+                        request, _, args = line[1:].lstrip().partition(" ")
+                        if request == "so" and not parts and not in_name:
+                            redirect = args.strip()
+                            break
+                        if request in ("SH", "Sh", "SS", "Ss"):
+                            if in_name:
+                                break
+                            in_name = " ".join(_split_args(args)).strip().upper() == "NAME"
+                        elif in_name and request in FONT_MACROS:
+                            # .B and .I keep their words apart; .BR and friends alternate fonts without a space.
+                            joiner = " " if request in ("B", "I", "SM", "SB") else ""
+                            parts.append(joiner.join(_split_args(args)))
+                        elif in_name and request in ("Nm", "Nd"):
+                            # mdoc: ".Nm ls" then ".Nd list directory contents".
+                            parts.append(("- " if request == "Nd" else "") + " ".join(_split_args(args)))
+                    elif in_name and not line.startswith(('.\\"', '\\"')):
+                        parts.append(line)
+        except (OSError, EOFError, ValueError):
+            return ""
+        if redirect is None:
+            break
+        target = resolve_include(path, redirect)
+        if target is None:
+            return ""
+        path = target
+
+    text = _clean(" ".join(ESCAPE.sub(unescape, part) for part in parts))
+    pieces = SUMMARY_SEPARATOR.split(" ".join(text.split()), 1)
+    return pieces[1][:MAX_SUMMARY_CHARS] if len(pieces) == 2 else ""
+
+
+class FinderIndex:
+    """Read-only, memory-mapped view of a finder index file."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_finder_path()
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error as exc:
+            self._mm.close()
+            raise ValueError("truncated index") from exc
+        (
+            magic, version, self.count, self.key_count, meta_off,
+            self._records_off, self._strings_off, self._lex_off, self._keys_off, self._post_off,
+        ) = fields
+        if magic != FINDER_MAGIC or version != FINDER_VERSION:
+            self._mm.close()
+            raise ValueError("incompatible index format")
+        meta = json.loads(self._mm[meta_off:self._records_off])
+        self.roots = meta["roots"]
+        self._directories = meta["directories"]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> FinderIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_stale(self) -> bool:
+        fingerprint = {directory: mtime for directory, mtime in self._directories}
+        return self.roots != [str(root) for root in get_manpath()] or fingerprint != manpath_fingerprint()
+
+    def find(self, query: str, limit: int = 20) -> list[FinderHit]:
+        """Pages whose name or description looks like ``query``, best first."""
+        words = list(dict.fromkeys(WORD.findall(query.lower())))
+        if not words:
+            return []
+        wanted = "-".join(words)
+
+        # Each query word adds the share of its trigrams found in a page's name or description.
+        coverage: Counter[int] = Counter()
+        for word in words:
+            grams = trigrams(word)
+            in_name: Counter[int] = Counter()
+            in_description: Counter[int] = Counter()
+            for gram in grams:
+                in_name.update(self._postings(NAME_FIELD + gram))
+                in_description.update(self._postings(DESCRIPTION_FIELD + gram))
+            for i in in_name.keys() | in_description.keys():
+                coverage[i] += max(NAME_WEIGHT * in_name[i], DESCRIPTION_WEIGHT * in_description[i]) / len(grams)
+        if len(wanted) < MIN_TRIGRAM_QUERY:
+            for i in self._prefixed(wanted):
+                coverage[i] += NAME_WEIGHT
+
+        pool = heapq.nlargest(CANDIDATE_POOL, coverage, key=lambda i: (coverage[i], -i))
+        hits = []
+        for i in pool:
+            name, section, description = self._entry(i)
+            lowered = name.lower()
+            score = coverage[i] + SIMILARITY_WEIGHT * SequenceMatcher(None, wanted, lowered, autojunk=False).ratio()
+            if lowered == wanted:
+                score += EXACT_BONUS
+            elif lowered.startswith(wanted):
+                score += PREFIX_BONUS
+            hits.append(FinderHit(name, section, description, score - _section_rank(section)))
+        hits.sort(key=lambda hit: -hit.score)
+        return hits[:limit]
+
+    def suggest(self, command: str, limit: int = SUGGEST_LIMIT) -> list[FinderHit]:
+        """Pages named like ``command``, for a "did you mean" after a miss."""
+        words, section = split_command_words(command)
+        wanted = "-".join(words).lower()
+        if not wanted:
+            return []
+        # Closest spelling first: a transposed letter ("grpe") shares few trigrams with the page meant.
+        scored = []
+        for hit in self.find(" ".join(words), limit=CANDIDATE_POOL):
+            ratio = SequenceMatcher(None, wanted, hit.name.lower(), autojunk=False).ratio()
+            if ratio >= SUGGEST_CUTOFF:
+                scored.append((ratio, hit))
+        # With a section asked for (``printff(3)``), pages in it come first.
+        scored.sort(key=lambda item: (
+            section is not None and not item[1].section.startswith(section), -item[0], -item[1].score,
+        ))
+        return [hit for _, hit in scored[:limit]]
+
+    def directories(self) -> dict[str, tuple[int, list[tuple[str, str, str]]]]:
+        """``{directory: (mtime, [(name, section, description), ...])}`` as recorded in the index."""
+        pages: list[list[tuple[str, str, str]]] = [[] for _ in self._directories]
+        for i in range(self.count):
+            pages[self._record(i)[4]].append(self._entry(i))
+        return {directory: (mtime, pages[i]) for i, (directory, mtime) in enumerate(self._directories)}
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._records_off + i * _RECORD.size)
+
+    def _entry(self, i: int) -> tuple[str, str, str]:
+        offset, name_len, section_len, description_len, _dir = self._record(i)
+        start = self._strings_off + offset
+        blob = self._mm[start:start + name_len + section_len + description_len].decode("utf-8", "surrogateescape")
+        return blob[:name_len], blob[name_len:name_len + section_len], blob[name_len + section_len:]
+
+    def _prefixed(self, prefix: str) -> range:
+        """Ids of the first pages whose name starts with ``prefix``; records are sorted by name."""
+        key = prefix.encode("utf-8")
+        mm, size = self._mm, _RECORD.size
+
+        def bisect(target: bytes) -> int:
+            lo, hi = 0, self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                offset, name_len = _RECORD.unpack_from(mm, self._records_off + mid * size)[:2]
+                start = self._strings_off + offset
+                if mm[start:start + name_len] < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        first = bisect(key)
+        return range(first, min(bisect(key + b"\xff"), first + CANDIDATE_POOL))
+
+    def _postings(self, key: str) -> memoryview:
+        target = key.encode("utf-8")
+        mm = self._mm
+        lo, hi = 0, self.key_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_off, key_len, post_off, post_len = _LEXICON.unpack_from(mm, self._lex_off + mid * _LEXICON.size)
+            start = self._keys_off + key_off
+            candidate = mm[start:start + key_len]
+            if candidate == target:
+                break
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        else:
+            return memoryview(b"").cast("I")
+        start = self._post_off + post_off
+        return memoryview(mm)[start:start + post_len].cast("I")
+
+
+def open_finder_index(path: Path | None = None) -> FinderIndex | None:
+    """The finder index, built or brought up to date first; ``None`` without a writable cache."""
+    path = path or default_finder_path()
+    previous = None
+    try:
+        previous = FinderIndex(path)
+        if not previous.is_stale():
+            return previous
+    except (OSError, ValueError):
+        pass
+    try:
+        build_finder_index(path, previous)
+        return FinderIndex(path)
+    except (OSError, ValueError):
+        return None
+    finally:
+        if previous is not None:
+            previous.close()
+
+
+def did_you_mean(command: str) -> str | None:
+    """``"Did you mean grep(1) or egrep(1)?"`` for a page that was not found, if any look close."""
+    index = open_finder_index()
+    if index is None:
+        return None
+    with index:
+        hits = index.suggest(command)
+    if not hits:
+        return None
+    names = [hit.reference for hit in hits]
+    listed = names[0] if len(names) == 1 else f"{', '.join(names[:-1])} or {names[-1]}"
+    return f"Did you mean {listed}?"
+
+
+def _section_rank(section: str) -> float:
+    """A small tie-breaker: man's section order, so ``printf(1)`` comes before ``printf(3)``."""
+    try:
+        return SECTION_ORDER.index(section[0]) / 100
+    except ValueError:
+        return len(SECTION_ORDER) / 100
+
+
+def _write_index(path: Path, directories: list[tuple[str, int]], pages: list[tuple[str, str, str, int]]) -> None:
+    meta = json.dumps(
+        {"roots": [str(root) for root in get_manpath()], "directories": directories},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    records = bytearray()
+    strings = bytearray()
+    postings: dict[str, list[int]] = {}
+    for page_id, (name, section, description, dir_index) in enumerate(pages):
+        parts = [part.encode("utf-8", "surrogateescape") for part in (name, section, description)]
+        records += _RECORD.pack(len(strings), len(parts[0]), len(parts[1]), len(parts[2]), dir_index)
+        for part in parts:
+            strings += part
+        for field, text in ((NAME_FIELD, name), (DESCRIPTION_FIELD, description)):
+            for gram in trigrams(text):
+                postings.setdefault(field + gram, []).append(page_id)
+
+    lexicon = bytearray()
+    keys = bytearray()
+    encoded_postings = bytearray()
+    for key in sorted(postings, key=lambda k: k.encode("utf-8")):
+        encoded = key.encode("utf-8")
+        start = len(encoded_postings)
+        encoded_postings += array("I", postings[key]).tobytes()
+        lexicon += _LEXICON.pack(len(keys), len(encoded), start, len(encoded_postings) - start)
+        keys += encoded
+
+    meta_off = _HEADER.size
+    records_off = meta_off + len(meta)
+    strings_off = records_off + len(records)
+    lex_off = strings_off + len(strings)
+    keys_off = lex_off + len(lexicon)
+    # Postings start on a 4-byte boundary, so they can be read as uint32 in place.
+    padding = -(keys_off + len(keys)) % 4
+    post_off = keys_off + len(keys) + padding
+    header = _HEADER.pack(
+        FINDER_MAGIC, FINDER_VERSION, len(pages), len(postings),
+        meta_off, records_off, strings_off, lex_off, keys_off, post_off,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(meta)
+            f.write(records)
+            f.write(strings)
+            f.write(lexicon)
+            f.write(keys)
+            f.write(bytes(padding))
+            f.write(encoded_postings)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,356 @@
+"""Full-text inverted index over every installed man page.
+
+The index is a single file under the cache directory::
+
+    header | meta (JSON) | lexicon table | term strings | postings
+
+The lexicon is a sorted table of fixed-size records, so a term is found by
+binary search straight over the memory-mapped file. Each term's postings are
+varint-encoded, grouped per page (page-id delta, term frequency, byte
+length) and then per occurrence (section index, line delta), which lets a
+query rank pages from the per-page frequencies without decoding positions it
+will never show.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from smartman.index.encoding import decode_varint, encode_varint
+from smartman.parser.man_parser import ManPageNotFoundError, ManParser
+from smartman.parser.source import iter_man_pages, manpath_fingerprint
+from smartman.utils import get_cache_dir
+from smartman.utils.pool import run_bounded
+
+
+INDEX_MAGIC = b"SMFT"
+INDEX_VERSION = 2
+INDEX_FILE = "fulltext.idx"
+
+# magic, version, page count, term count, meta/lexicon/terms/postings offsets
+_HEADER = struct.Struct("<4sHIIQQQQ")
+# term offset, term length, postings offset, postings length, document frequency
+_LEXICON = struct.Struct("<IHQII")
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9_]{1,39}")
+STOPWORDS = frozenset(
+    "the and of to in is for or be if this that with are by it as on an not "
+    "can from which when will at all no any its has have may but so than then "
+    "there these they was were into also such".split()
+)
+
+# BM25 parameters, plus a boost for pages whose NAME line mentions the term.
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_BOOST = 2.0
+
+
+@dataclass
+class SearchHit:
+    name: str
+    section: str
+    score: float
+    section_name: str
+    line: int
+    # Other names of the same file (symlinks), as "name(section)".
+    aliases: list[str] = field(default_factory=list)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def hit_snippet(hit: SearchHit, parser: ManParser) -> str:
+    """The page line a hit points at, for display next to the result."""
+    try:
+        return parser.parse(f"{hit.section} {hit.name}").raw_text.split("\n")[hit.line].strip()
+    except (ManPageNotFoundError, IndexError):
+        return ""
+
+
+def default_index_path() -> Path:
+    return get_cache_dir() / INDEX_FILE
+
+
+def build_fulltext_index(
+    path: Path | None = None,
+    jobs: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """Parse every page and write a fresh index; returns the number of pages indexed."""
+    path = path or default_index_path()
+    fingerprint = manpath_fingerprint()
+    pages = _unique_pages()
+    total = len(pages)
+
+    postings: dict[str, bytearray] = {}
+    last_page: dict[str, int] = {}
+    doc_freq: dict[str, int] = {}
+    meta_pages: list[list] = []
+    done_count = 0
+
+    def add(result: tuple | None) -> None:
+        if result is None:
+            return
+        name, section, aliases, section_names, length, terms = result
+        page_id = len(meta_pages)
+        meta_pages.append([name, section, section_names, length, aliases])
+        for term, (count, chunk) in terms.items():
+            buf = postings.get(term)
+            if buf is None:
+                buf = postings[term] = bytearray()
+                last_page[term] = 0
+                doc_freq[term] = 0
+            encode_varint(page_id - last_page[term], buf)
+            encode_varint(count, buf)
+            encode_varint(len(chunk), buf)
+            buf += chunk
+            last_page[term] = page_id
+            doc_freq[term] += 1
+
+    def finish(result: tuple | None) -> None:
+        nonlocal done_count
+        add(result)
+        done_count += 1
+        if on_progress:
+            on_progress(done_count, total)
+
+    run_bounded(_index_page, pages, finish, jobs=jobs)
+
+    _write_index(path, meta_pages, fingerprint, postings, doc_freq)
+    return len(meta_pages)
+
+
+def _unique_pages() -> list[tuple[str, str, list[str]]]:
+    """``(name, section, aliases)`` once per file: symlinked names become aliases.
+
+    gunzip, zcat and uncompress all point at gzip.1.gz; indexing each of them
+    would repeat the hit and inflate every term's document frequency.
+    """
+    groups: dict[str, list[tuple[str, str, Path]]] = {}
+    for name, section, path in iter_man_pages():
+        groups.setdefault(os.path.realpath(path), []).append((name, section, path))
+    pages = []
+    for group in groups.values():
+        # The real file, not a link to it, names the page (stable sort keeps manpath order).
+        group.sort(key=lambda page: page[2].is_symlink())
+        (name, section, _path), *links = group
+        pages.append((name, section, [f"{link_name}({link_section})" for link_name, link_section, _ in links]))
+    return pages
+
+
+def _index_page(name: str, section: str, aliases: list[str]) -> tuple | None:
+    """Worker: parse one page and encode its per-term occurrence lists."""
+    try:
+        page = ManParser().parse(f"{section} {name}")
+    except Exception:
+        return None
+
+    section_names = list(page.sections)
+    section_index = {sec_name: i for i, sec_name in enumerate(section_names)}
+
+    occurrences: dict[str, list[tuple[int, int]]] = {}
+    length = 0
+    sec_idx = None
+    for line_no, line in enumerate(page.raw_text.split("\n")):
+        if line[:1].strip() and line in section_index:
+            sec_idx = section_index[line]
+        if sec_idx is None:
+            # The title line before NAME only repeats the page name.
+            continue
+        for term in tokenize(line):
+            length += 1
+            occurrences.setdefault(term, []).append((sec_idx, line_no))
+
+    terms = {}
+    for term, occ in occurrences.items():
+        chunk = bytearray()
+        previous = 0
+        seen_lines = set()
+        for sec, line_no in occ:
+            if line_no in seen_lines:
+                continue
+            seen_lines.add(line_no)
+            encode_varint(sec, chunk)
+            encode_varint(line_no - previous, chunk)
+            previous = line_no
+        terms[term] = (len(occ), bytes(chunk))
+    return name, section, aliases, section_names, length, terms
+
+
+def _write_index(
+    path: Path,
+    pages: list[list],
+    fingerprint: dict[str, int],
+    postings: dict[str, bytearray],
+    doc_freq: dict[str, int],
+) -> None:
+    avg_length = sum(p[3] for p in pages) / len(pages) if pages else 0.0
+    meta = json.dumps(
+        {"pages": pages, "fingerprint": fingerprint, "avg_length": avg_length},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    terms = sorted(postings)
+    lexicon = bytearray()
+    term_blob = bytearray()
+    postings_offset = 0
+    for term in terms:
+        encoded = term.encode("utf-8")
+        lexicon += _LEXICON.pack(len(term_blob), len(encoded), postings_offset, len(postings[term]), doc_freq[term])
+        term_blob += encoded
+        postings_offset += len(postings[term])
+
+    meta_off = _HEADER.size
+    lex_off = meta_off + len(meta)
+    terms_off = lex_off + len(lexicon)
+    postings_off = terms_off + len(term_blob)
+    header = _HEADER.pack(
+        INDEX_MAGIC, INDEX_VERSION, len(pages), len(terms), meta_off, lex_off, terms_off, postings_off
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(meta)
+            f.write(lexicon)
+            f.write(term_blob)
+            for term in terms:
+                f.write(postings[term])
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class FullTextIndex:
+    """Read-only, memory-mapped view of a full-text index file."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_index_path()
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error as exc:
+            self._mm.close()
+            raise ValueError("truncated index") from exc
+        magic, version, self.page_count, self.term_count, meta_off, self._lex_off, self._terms_off, self._post_off = fields
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._mm.close()
+            raise ValueError("incompatible index format")
+        meta = json.loads(self._mm[meta_off:self._lex_off])
+        self.pages = meta["pages"]
+        self.fingerprint = meta["fingerprint"]
+        self.avg_length = meta["avg_length"] or 1.0
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> FullTextIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_stale(self) -> bool:
+        return self.fingerprint != manpath_fingerprint()
+
+    def search(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """Rank pages by BM25 over the query terms; all terms must match if any page has them all."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        per_term: list[dict[int, tuple[int, int]]] = []
+        idfs: list[float] = []
+        for term in terms:
+            entry = self._lookup(term)
+            if entry is None:
+                per_term.append({})
+                idfs.append(0.0)
+                continue
+            offset, length, df = entry
+            per_term.append(self._pages_for(offset, length))
+            idfs.append(math.log(1 + (self.page_count - df + 0.5) / (df + 0.5)))
+
+        candidates = set.intersection(*(set(p) for p in per_term)) if all(per_term) else set()
+        if not candidates:
+            candidates = set().union(*(set(p) for p in per_term))
+
+        scored = []
+        for page_id in candidates:
+            name, section, section_names, length, aliases = self.pages[page_id]
+            names = " ".join([name, *aliases]).lower()
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length)
+            score = 0.0
+            for term, pages, idf in zip(terms, per_term, idfs):
+                if page_id in pages:
+                    tf = pages[page_id][0]
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    if term in names:
+                        score += idf * NAME_BOOST
+            scored.append((score, page_id))
+
+        scored.sort(reverse=True)
+        hits = []
+        for score, page_id in scored[:limit]:
+            name, section, section_names, _length, aliases = self.pages[page_id]
+            sec_idx, line = self._first_occurrence(per_term, page_id)
+            section_name = section_names[sec_idx] if sec_idx < len(section_names) else ""
+            hits.append(SearchHit(name, section, score, section_name, line, aliases))
+        return hits
+
+    def _lookup(self, term: str) -> tuple[int, int, int] | None:
+        target = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            term_off, term_len, post_off, post_len, df = _LEXICON.unpack_from(
+                self._mm, self._lex_off + mid * _LEXICON.size
+            )
+            start = self._terms_off + term_off
+            candidate = self._mm[start:start + term_len]
+            if candidate == target:
+                return self._post_off + post_off, post_len, df
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _pages_for(self, offset: int, length: int) -> dict[int, tuple[int, int]]:
+        """Map page id to (term frequency, offset of its occurrence chunk)."""
+        pages: dict[int, tuple[int, int]] = {}
+        mm = self._mm
+        pos, end = offset, offset + length
+        page_id = 0
+        while pos < end:
+            delta, pos = decode_varint(mm, pos)
+            tf, pos = decode_varint(mm, pos)
+            chunk_len, pos = decode_varint(mm, pos)
+            page_id += delta
+            pages[page_id] = (tf, pos)
+            pos += chunk_len
+        return pages
+
+    def _first_occurrence(self, per_term: list[dict[int, tuple[int, int]]], page_id: int) -> tuple[int, int]:
+        best = None
+        for pages in per_term:
+            if page_id in pages:
+                sec_idx, pos = decode_varint(self._mm, pages[page_id][1])
+                line, _ = decode_varint(self._mm, pos)
+                if best is None or line < best[1]:
+                    best = (sec_idx, line)
+        return best or (0, 0)
@@ -1,3 +1,4 @@
 from .man_parser import ManParser, ManPage, ManPageNotFoundError
+from .options import OptionEntry, OptionTable
 
-__all__ = ["ManParser", "ManPage", "ManPageNotFoundError"]
+__all__ = ["ManParser", "ManPage", "ManPageNotFoundError", "OptionEntry", "OptionTable"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+from smartman.parser.options import OptionEntry
+from smartman.utils.cache import DiskCache
+
+
+CACHE_MAGIC = b"SMPG"
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# magic, format version, number of sections
+_HEADER = struct.Struct("<4sHI")
+# encoded name length, start offset, end offset (character offsets into the text)
+_SPAN = struct.Struct("<HII")
+# number of option entries, after the spans
+_COUNT = struct.Struct("<I")
+# start offset, end offset, length of the tab-joined argument and flags
+_OPTION = struct.Struct("<IIH")
+
+Spans = dict[str, tuple[int, int]]
+
+
+def encode_page(text: str, spans: Spans, options: list[OptionEntry] = ()) -> bytes:
+    """Pack page text, its section offsets and option entries into a compact binary blob."""
+    out = [_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(spans))]
+    for name, (start, end) in spans.items():
+        encoded = name.encode("utf-8")
+        out.append(_SPAN.pack(len(encoded), start, end))
+        out.append(encoded)
+    out.append(_COUNT.pack(len(options)))
+    for entry in options:
+        encoded = "\t".join([entry.argument or "", *entry.flags]).encode("utf-8")
+        out.append(_OPTION.pack(entry.start, entry.end, len(encoded)))
+        out.append(encoded)
+    out.append(text.encode("utf-8"))
+    return b"".join(out)
+
+
+def decode_page(data: bytes) -> tuple[str, Spans, list[OptionEntry]] | None:
+    """Inverse of :func:`encode_page`. Returns ``None`` for foreign or stale blobs."""
+    try:
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            return None
+        offset = _HEADER.size
+        spans: dict[str, tuple[int, int]] = {}
+        for _ in range(count):
+            name_len, start, end = _SPAN.unpack_from(data, offset)
+            offset += _SPAN.size
+            name = data[offset:offset + name_len].decode("utf-8")
+            offset += name_len
+            spans[name] = (start, end)
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        options = []
+        for _ in range(count):
+            start, end, length = _OPTION.unpack_from(data, offset)
+            offset += _OPTION.size
+            argument, *flags = data[offset:offset + length].decode("utf-8").split("\t")
+            offset += length
+            options.append(OptionEntry(tuple(flags), argument or None, start, end))
+        text = data[offset:].decode("utf-8")
+    except (struct.error, UnicodeDecodeError):
+        return None
+    return text, spans, options
+
+
+class PageCache:
+    """Persistent cache of parsed man pages keyed by their source file."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, store: DiskCache | None = None) -> None:
+        self.store = store or DiskCache("pages", max_bytes)
+
+    def get(self, source: Path, width: int) -> tuple[str, Spans, list[OptionEntry]] | None:
+        key = self._key(source, width)
+        if key is None:
+            return None
+        data = self.store.get(key)
+        return decode_page(data) if data is not None else None
+
+    def contains(self, source: Path, width: int) -> bool:
+        key = self._key(source, width)
+        return key is not None and self.store.contains(key)
+
+    def put(self, source: Path, width: int, text: str, spans: Spans, options: list[OptionEntry] = ()) -> None:
+        key = self._key(source, width)
+        if key is not None:
+            self.store.put(key, encode_page(text, spans, options))
+
+    @staticmethod
+    def _key(source: Path, width: int) -> str | None:
+        try:
+            resolved = source.resolve()
+            st = os.stat(resolved)
+        except OSError:
+            return None
+        # The format version is part of the key so ``contains`` (and thus
+        # ``smartman warm``) does not count blobs an older release wrote.
+        return f"{resolved}\0{st.st_mtime_ns}\0{st.st_size}\0{width}\0{CACHE_VERSION}"
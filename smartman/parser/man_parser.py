@@ -1,33 +1,41 @@
 from __future__ import annotations
 
+import codecs
+import lzma
 import re
 import subprocess
-from dataclasses import dataclass, field
+import threading
+import zlib
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from contextlib import closing
+from pathlib import Path
 
+from smartman.parser.cache import PageCache
+from smartman.parser.options import DASHES, OptionEntry, OptionTable, parse_options
+from smartman.parser.names import resolve_source
+from smartman.parser.source import man_arguments
 from smartman.utils import get_man_binary
+from smartman.utils.trace import span
 
 
-SECTION_HEADERS = re.compile(
-    r"^([A-Z][A-Z\s\-]+[A-Z])$", re.MULTILINE
-)
-
-KNOWN_SECTIONS = [
-    "NAME",
-    "SYNOPSIS",
-    "DESCRIPTION",
-    "OPTIONS",
-    "EXAMPLES",
-    "EXAMPLE",
-    "EXIT STATUS",
-    "RETURN VALUE",
-    "ENVIRONMENT",
-    "FILES",
-    "SEE ALSO",
-    "BUGS",
-    "NOTES",
-    "AUTHORS",
-    "COPYRIGHT",
-]
+# man renders at 80 columns when its output is not a terminal.
+DEFAULT_WIDTH = 80
+FETCH_TIMEOUT = 15
+CHUNK_SIZE = 64 * 1024
+# Pages fetched at once when several are opened together; each fetch mostly
+# waits on a man/groff process, so threads overlap well.
+FETCH_WORKERS = 8
+
+OVERSTRIKE = re.compile(r".\x08")
+SGR_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+# Anything the in-process renderer may raise means "let man do it"
+# (together with its own UnsupportedRoff).
+NATIVE_RENDER_ERRORS = (OSError, EOFError, ValueError, lzma.LZMAError, zlib.error)
+
+# A page reference such as ``tar(1)``, ``systemd.unit(5)`` or ``Git::Repo(3pm)``;
+# man prints hyphens in names as U+2010.
+PAGE_LINK = re.compile(r"(?<![\w.:‐-])([A-Za-z0-9_][\w.:+‐-]*)\(([0-9][a-z]*|[nl])\)")
 
 
 class ManPageNotFoundError(Exception):
@@ -38,18 +46,77 @@ class ManPageNotFoundError(Exception):
         super().__init__(f"No manual entry for '{command}'")
 
 
-@dataclass
+class Sections(Mapping[str, str]):
+    """Read-only ``{name: body}`` view of a page's sections.
+
+    Bodies are sliced out of the page text when they are looked up, so a page
+    in memory holds its text once, not once more per section.
+    """
+
+    __slots__ = ("_text", "_spans")
+
+    def __init__(self, text: str, spans: dict[str, tuple[int, int]]) -> None:
+        self._text = text
+        self._spans = spans
+
+    def __getitem__(self, name: str) -> str:
+        start, end = self._spans[name]
+        return self._text[start:end]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._spans
+
+    def __repr__(self) -> str:
+        return f"Sections({list(self._spans)!r})"
+
+
 class ManPage:
-    command: str
-    raw_text: str
-    sections: dict[str, str] = field(default_factory=dict)
+    """A rendered page: its text, where each section sits in it, and its options."""
+
+    __slots__ = ("command", "raw_text", "spans", "options", "_keys")
+
+    def __init__(
+        self,
+        command: str,
+        raw_text: str,
+        spans: dict[str, tuple[int, int]] | None = None,
+        options: OptionTable | None = None,
+    ) -> None:
+        self.command = command
+        self.raw_text = raw_text
+        # Section name -> (start, end) of its body in raw_text, in page order.
+        self.spans = spans if spans is not None else {}
+        self.options = options if options is not None else OptionTable()
+        # Upper-cased name -> name as printed; the first spelling on the page wins.
+        self._keys: dict[str, str] = {}
+        for name in self.spans:
+            self._keys.setdefault(name.upper(), name)
+
+    def __repr__(self) -> str:
+        return f"ManPage(command={self.command!r}, sections={list(self.spans)!r}, chars={len(self.raw_text)})"
+
+    @property
+    def sections(self) -> Sections:
+        return Sections(self.raw_text, self.spans)
 
     def get_section(self, name: str) -> str:
         """Return content of a section, case-insensitively."""
-        for key, value in self.sections.items():
-            if key.upper() == name.upper():
-                return value
-        return ""
+        key = self._keys.get(name.upper())
+        if key is None:
+            return ""
+        start, end = self.spans[key]
+        return self.raw_text[start:end]
+
+    def see_also(self) -> list[str]:
+        """Pages named in SEE ALSO, as ``name(section)`` in page order, without repeats."""
+        links = find_page_links(self.get_section("SEE ALSO"))
+        return list(dict.fromkeys(target for _, _, target in links))
 
     def get_quick_examples(self) -> list[dict[str, str]]:
         """Extract command + description pairs from the EXAMPLES section."""
@@ -88,70 +155,351 @@ class ManPage:
 class ManParser:
     """Parses Linux man page output into structured sections."""
 
-    def parse(self, command: str) -> ManPage:
-        raw = self._fetch_raw(command)
-        sections = self._split_sections(raw)
-        return ManPage(command=command, raw_text=raw, sections=sections)
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        cache: PageCache | None = None,
+        use_cache: bool = True,
+        native: bool = True,
+    ) -> None:
+        self.width = width
+        self.cache = (cache or PageCache()) if use_cache else None
+        self.native = native
 
-    def _fetch_raw(self, command: str) -> str:
-        man_bin = get_man_binary()
-        parts = command.split()
+    def parse(self, command: str, on_section: Callable[[str, str], None] | None = None) -> ManPage:
+        """Fetch and split ``command``'s page.
+
+        ``on_section(name, body)`` is called as each section is complete, so a
+        caller can show the page before it has been read to the end. An
+        exception raised from it stops the fetch (and kills ``man``).
+        """
+        if on_section is not None:
+            return self._parse_progressively(command, on_section)
+        source = self._resolve_source(command)
+        cached = self._cache_get(source)
+        if cached is not None:
+            return self._build_page(command, *cached)
+        return self._build_page(command, *self._fetch(command, source))
+
+    def parse_options(self, command: str) -> OptionTable:
+        """Only the option table of a page; the sections are never sliced out."""
+        source = self._resolve_source(command)
+        cached = self._cache_get(source)
+        text, _, options = cached if cached is not None else self._fetch(command, source)
+        return OptionTable(text, options)
+
+    def iter_sections(self, command: str, only: Iterable[str] | None = None) -> Iterator[tuple[str, str]]:
+        """Yield ``(name, body)`` pairs as soon as each section is complete.
+
+        Closing the iterator early stops the fetch (and kills ``man``); only a
+        page that was read to the end is written to the cache. With ``only``,
+        just those sections are yielded (names match case-insensitively), and
+        the fetch stops as soon as the last of them is complete.
+        """
+        if only is None:
+            yield from self._iter_sections(command)
+            return
+
+        wanted = {name.strip().upper() for name in only}
+        sections = self._iter_sections(command)
+        with closing(sections):
+            for name, body in sections:
+                if name.upper() in wanted:
+                    yield name, body
+                    wanted.discard(name.upper())
+                    if not wanted:
+                        return
+
+    def _parse_progressively(self, command: str, on_section: Callable[[str, str], None]) -> ManPage:
+        sections = self._iter_sections(command)
+        with closing(sections):
+            while True:
+                try:
+                    name, body = next(sections)
+                except StopIteration as done:
+                    text, spans, options = done.value
+                    break
+                on_section(name, body)
+        if options is None:
+            options = self._parse_options(text, spans)
+        return self._build_page(command, text, spans, options)
+
+    def _iter_sections(
+        self, command: str
+    ) -> Generator[tuple[str, str], None, tuple[str, dict[str, tuple[int, int]], list[OptionEntry] | None]]:
+        """Yield each section as it is complete; returns the page's text, spans and
+        options (``None`` when they were not needed for the cache)."""
+        source = self._resolve_source(command)
+        cached = self._cache_get(source)
+        if cached is not None:
+            yield from self._build_page(command, *cached).sections.items()
+            return cached
+
+        # Rendered to the end before anything is shown: the renderer can give
+        # up anywhere in a page (a late .so, a macro it does not know), and a
+        # page is never a mix of its sections and man's. Even bash(1) takes
+        # about a tenth of a second.
+        lines = self._render_native(source)
+        splitter = SectionSplitter(is_section_header)
+        yield from _emit_sections(splitter, lines if lines is not None else self._stream_man(command))
+
+        text, spans = splitter.finish()
+        options = None
+        if source is not None and self.cache is not None:
+            options = self._parse_options(text, spans)
+            self._cache_put(source, text, spans, options)
+        return text, spans, options
+
+    def _fetch(
+        self, command: str, source: Path | None
+    ) -> tuple[str, dict[str, tuple[int, int]], list[OptionEntry]]:
+        """Render a page that missed the cache, and store it."""
+        parsed = self._parse_native(source)
+        if parsed is None:
+            with span("parser.man"):
+                parsed = split_sections(self._stream_man(command))
+        text, spans = parsed
+        options = self._parse_options(text, spans)
+        if source is not None and self.cache is not None:
+            self._cache_put(source, text, spans, options)
+        return text, spans, options
+
+    def _cache_get(self, source: Path | None) -> tuple[str, dict[str, tuple[int, int]], list[OptionEntry]] | None:
+        if source is None or self.cache is None:
+            return None
+        with span("parser.cache_get"):
+            return self.cache.get(source, self.width)
+
+    def _cache_put(self, source: Path, text: str, spans: dict[str, tuple[int, int]], options: list[OptionEntry]) -> None:
+        with span("parser.cache_put"):
+            self.cache.put(source, self.width, text, spans, options)
+
+    def _parse_options(self, text: str, spans: dict[str, tuple[int, int]]) -> list[OptionEntry]:
+        with span("parser.options"):
+            return parse_options(text, spans)
+
+    def _parse_native(self, source: Path | None) -> tuple[str, dict[str, tuple[int, int]]] | None:
+        """Render in-process when the source allows it; ``None`` means use man."""
+        lines = self._render_native(source)
+        return split_sections(lines) if lines is not None else None
+
+    def _render_native(self, source: Path | None) -> list[str] | None:
+        """Every rendered line of the page, or ``None`` if the renderer gives up anywhere in it."""
+        if source is None or not self.native:
+            return None
+        # Deferred: the renderer compiles many patterns, and cache hits never need it.
+        from smartman.parser.roff import UnsupportedRoff, render_man_source
+
+        try:
+            with span("parser.render_native"):
+                return list(render_man_source(source, self.width))
+        except (UnsupportedRoff, *NATIVE_RENDER_ERRORS):
+            return None
+
+    def _build_page(
+        self,
+        command: str,
+        text: str,
+        spans: dict[str, tuple[int, int]],
+        options: list[OptionEntry],
+    ) -> ManPage:
+        with span("parser.build_page"):
+            return ManPage(command, text, spans, OptionTable(text, options))
+
+    def _man_env(self) -> dict[str, str]:
+        return {
+            "MANPAGER": "cat",
+            "PAGER": "cat",
+            "MANWIDTH": str(self.width),
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+        }
+
+    def _resolve_source(self, command: str) -> Path | None:
+        """Find the page source, falling back to ``man -w`` for unusual layouts."""
+        with span("parser.resolve"):
+            source = resolve_source(command)
+        if source is not None:
+            return source
 
         try:
-            man_result = subprocess.run(
-                [man_bin] + parts,
-                capture_output=True,
-                text=True,
-                timeout=15,
-                env={"MANPAGER": "cat", "PAGER": "cat", "PATH": "/usr/bin:/bin:/usr/local/bin"},
+            man_bin = get_man_binary()
+            with span("parser.man_w"):
+                result = subprocess.run(
+                    [man_bin, "-w", *man_arguments(command)],
+                    capture_output=True,
+                    text=True,
+                    timeout=5,
+                    env=self._man_env(),
+                )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+
+        paths = result.stdout.split()
+        if result.returncode != 0 or not paths:
+            return None
+        return Path(paths[0])
+
+    def _stream_man(self, command: str) -> Iterator[str]:
+        """Yield cleaned lines from ``man`` as they arrive on its pipe.
+
+        Overstrikes and SGR escapes are stripped in-process, so there is no
+        ``col -b`` stage and the page is never held as one undecoded blob.
+        Closing the generator early kills ``man``.
+        """
+        man_bin = get_man_binary()
+        try:
+            proc = subprocess.Popen(
+                [man_bin, *man_arguments(command)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=self._man_env(),
             )
         except FileNotFoundError as exc:
             raise ManPageNotFoundError(command) from exc
-        except subprocess.TimeoutExpired as exc:
-            raise ManPageNotFoundError(command) from exc
 
-        if man_result.returncode != 0 or not man_result.stdout.strip():
+        timer = threading.Timer(FETCH_TIMEOUT, proc.kill)
+        timer.start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        produced = False
+        try:
+            while True:
+                chunk = proc.stdout.read1(CHUNK_SIZE)
+                pending += decoder.decode(chunk, final=not chunk)
+                *complete, pending = pending.split("\n")
+                for raw in complete:
+                    for line in _clean_line(raw):
+                        produced = produced or bool(line)
+                        yield line
+                if not chunk:
+                    break
+            if pending:
+                for line in _clean_line(pending):
+                    produced = produced or bool(line)
+                    yield line
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if returncode != 0 or not produced:
             raise ManPageNotFoundError(command)
 
-        raw = man_result.stdout
-
-        col_result = subprocess.run(
-            ["col", "-b"],
-            input=raw,
-            capture_output=True,
-            text=True,
-        )
-
-        return col_result.stdout if col_result.returncode == 0 else raw
-
-    def _split_sections(self, raw: str) -> dict[str, str]:
-        sections: dict[str, str] = {}
-        lines = raw.splitlines()
-        current_section: str | None = None
-        buffer: list[str] = []
-
-        for line in lines:
-            stripped = line.rstrip()
-            if self._is_section_header(stripped):
-                if current_section is not None:
-                    sections[current_section] = "\n".join(buffer).strip()
-                current_section = stripped.strip()
-                buffer = []
-            else:
-                if current_section is not None:
-                    buffer.append(stripped)
 
-        if current_section is not None and buffer:
-            sections[current_section] = "\n".join(buffer).strip()
+class SectionSplitter:
+    """Incrementally splits rendered page lines into section offsets.
+
+    Lines are normalized (trailing whitespace dropped) as they are fed, and
+    each section body is tracked as a ``(start, end)`` span into the joined
+    text, trimmed the way ``str.strip`` would trim it.
+    """
+
+    def __init__(self, is_header: Callable[[str], bool]) -> None:
+        self._is_header = is_header
+        self._lines: list[str] = []
+        self._pos = 0
+        self.spans: dict[str, tuple[int, int]] = {}
+        self._current: str | None = None
+        self._body_start = 0
+        self._first: int | None = None
+        self._last = 0
+        self._has_body = False
+        self._body_line = 0
+        self._ranges: dict[str, tuple[int, int, int]] = {}
+
+    def feed(self, raw: str) -> str | None:
+        """Add one line; returns the name of the section it closed, if any."""
+        closed = None
+        for line in raw.splitlines() or [""]:
+            line = line.rstrip()
+            if self._is_header(line):
+                if self._current is not None:
+                    closed = self._close()
+                self._current = line.strip()
+                self._body_start = self._pos + len(line) + 1
+                self._body_line = len(self._lines) + 1
+                self._first = None
+                self._has_body = False
+            elif self._current is not None:
+                self._has_body = True
+                if line:
+                    if self._first is None:
+                        self._first = self._pos + len(line) - len(line.lstrip())
+                    self._last = self._pos + len(line)
+            self._lines.append(line)
+            self._pos += len(line) + 1
+        return closed
+
+    def finish(self) -> tuple[str, dict[str, tuple[int, int]]]:
+        if self._current is not None and self._has_body:
+            self._close()
+        self._current = None
+        return "\n".join(self._lines), self.spans
+
+    @property
+    def current(self) -> str | None:
+        return self._current
+
+    def section_text(self, name: str) -> str:
+        """Body of a closed section, without joining the whole page."""
+        first_line, end_line, base = self._ranges[name]
+        start, end = self.spans[name]
+        return "\n".join(self._lines[first_line:end_line])[start - base:end - base]
+
+    def _close(self) -> str:
+        name = self._current
+        if self._first is None:
+            start = end = min(self._body_start, self._pos)
+        else:
+            start, end = self._first, self._last
+        self.spans[name] = (start, end)
+        self._ranges[name] = (self._body_line, len(self._lines), self._body_start)
+        return name
 
-        return sections
 
-    def _is_section_header(self, line: str) -> bool:
-        stripped = line.strip()
-        if not stripped:
-            return False
-        if not line.startswith(" ") and stripped == stripped.upper():
-            if len(stripped) >= 2 and stripped.replace(" ", "").replace("-", "").isalpha():
-                return True
+def is_section_header(line: str) -> bool:
+    """A heading line of a rendered page: flush left and all capitals (``SEE ALSO``)."""
+    stripped = line.strip()
+    if not stripped:
         return False
+    if not line.startswith(" ") and stripped == stripped.upper():
+        if len(stripped) >= 2 and stripped.replace(" ", "").replace("-", "").isalpha():
+            return True
+    return False
+
+
+def split_sections(lines: Iterable[str]) -> tuple[str, dict[str, tuple[int, int]]]:
+    """Join rendered page lines into one text and locate each section body in it."""
+    splitter = SectionSplitter(is_section_header)
+    for line in lines:
+        splitter.feed(line)
+    return splitter.finish()
+
+
+def find_page_links(line: str) -> Iterator[tuple[int, int, str]]:
+    """``(start, end, "name(section)")`` of every page reference in ``line``."""
+    for match in PAGE_LINK.finditer(line):
+        yield match.start(), match.end(), f"{match.group(1).translate(DASHES)}({match.group(2)})"
+
+
+def _emit_sections(splitter: SectionSplitter, lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Feed ``lines`` to ``splitter``, yielding each section once it is closed."""
+    for line in lines:
+        closed = splitter.feed(line)
+        if closed is not None:
+            yield closed, splitter.section_text(closed)
+    last = splitter.current
+    splitter.finish()
+    if last is not None and last in splitter.spans:
+        yield last, splitter.section_text(last)
+
 
+def _clean_line(raw: str) -> list[str]:
+    """Strip backspace overstrikes and SGR escapes, as ``col -b`` would."""
+    if "\x08" in raw:
+        raw = OVERSTRIKE.sub("", raw)
+    if "\x1b" in raw:
+        raw = SGR_ESCAPE.sub("", raw)
+    return [line.rstrip() for line in raw.splitlines()] or [""]
@@ -0,0 +1,331 @@
+"""Persistent index of man page names, so resolving a page never walks the manpath.
+
+Like mandb's database, one file under the cache directory maps every page
+on the manpath to its section and source file::
+
+    header | meta (JSON) | record table | strings
+
+Records are fixed-size and sorted by name, then by man-db's precedence
+(section order, then manpath order, plain sections before extended ones
+such as ``3p``). A lookup is a binary search straight over the
+memory-mapped file. The meta block keeps the mtime of every ``manN``
+directory. When one changes, only that directory is scanned again and the
+rest of the index is reused.
+
+Checking those mtimes costs more than a lookup, so it is done at most once
+per ``CHECK_INTERVAL`` (the index file's own mtime records the last check),
+and whenever a name is missing or its file has gone.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from smartman.parser.source import (
+    SECTION_ORDER,
+    find_man_source,
+    get_manpath,
+    manpath_fingerprint,
+    split_command_words,
+    _looks_like_section,
+    _strip_compression,
+)
+from smartman.utils import get_cache_dir
+
+
+NAMES_MAGIC = b"SMNI"
+NAMES_VERSION = 1
+NAMES_FILE = "names.idx"
+# Seconds between checks of the manpath for installed or removed pages.
+CHECK_INTERVAL = 60.0
+
+# magic, version, record count, meta/records/strings offsets
+_HEADER = struct.Struct("<4sHIQQQ")
+# string offset, name length, section length, path length, directory index, precedence
+_RECORD = struct.Struct("<IHHHHI")
+# The leading string offset and name length of a record, all a binary search step needs.
+_NAME_REF = struct.Struct("<IH")
+
+_lock = threading.Lock()
+_index: NameIndex | None = None
+
+
+@dataclass
+class PageLocation:
+    name: str
+    section: str
+    path: Path
+
+
+def default_names_path() -> Path:
+    return get_cache_dir() / NAMES_FILE
+
+
+def precedence(section: str, root_index: int) -> int:
+    """Sort key of a page among pages of the same name; lower wins."""
+    try:
+        rank = SECTION_ORDER.index(section[0])
+    except ValueError:
+        rank = len(SECTION_ORDER)
+    extended = 0 if len(section) == 1 else 1
+    return (rank << 16) | (min(root_index, 0xFF) << 8) | extended
+
+
+def scan_man_directory(directory: str) -> list[tuple[str, str, str]]:
+    """``(name, section, path)`` of every page file in one ``manN`` directory."""
+    pages = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                name, _, section = _strip_compression(entry.name).rpartition(".")
+                if name and section and _looks_like_section(section) and entry.is_file():
+                    pages.append((name, section, entry.path))
+    except OSError:
+        pass
+    return pages
+
+
+def build_name_index(path: Path | None = None, previous: NameIndex | None = None) -> int:
+    """Write a fresh index; directories unchanged since ``previous`` are not scanned again.
+
+    Returns the number of pages indexed.
+    """
+    path = path or default_names_path()
+    reusable = previous.directories() if previous is not None else {}
+    roots = get_manpath()
+
+    directories: list[tuple[str, int]] = []
+    records: list[tuple[str, int, str, str, int]] = []
+    for root_index, root in enumerate(roots):
+        try:
+            subdirs = sorted(d for d in os.listdir(root) if d.startswith("man"))
+        except OSError:
+            continue
+        for subdir in subdirs:
+            directory = str(root / subdir)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            old = reusable.get(directory)
+            pages = old[1] if old is not None and old[0] == mtime else scan_man_directory(directory)
+            dir_index = len(directories)
+            directories.append((directory, mtime))
+            for name, section, page_path in pages:
+                records.append((name, precedence(section, root_index), section, page_path, dir_index))
+
+    records.sort()
+    _write_index(path, roots, directories, records)
+    return len(records)
+
+
+def resolve_source(command: str) -> Path | None:
+    """Find the source file of a page through the name index.
+
+    ``"docker run"`` looks for ``docker-run`` first, then ``docker``; a
+    leading section (``"3 printf"``) or a ``printf(3)`` reference picks one
+    section. Without a usable index this falls back to probing the manpath.
+    """
+    words, section = split_command_words(command)
+    if not words:
+        return None
+    index = _shared_index()
+    if index is None:
+        return find_man_source(command)
+
+    location = index.find_command(words, section)
+    if location is None or not os.path.exists(location.path):
+        # A page installed or removed since the last check.
+        index = _shared_index(refresh=True)
+        if index is None:
+            return find_man_source(command)
+        location = index.find_command(words, section)
+    return location.path if location is not None else None
+
+
+class NameIndex:
+    """Read-only, memory-mapped view of a name index file."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_names_path()
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error as exc:
+            self._mm.close()
+            raise ValueError("truncated index") from exc
+        magic, version, self.count, meta_off, self._records_off, self._strings_off = fields
+        if magic != NAMES_MAGIC or version != NAMES_VERSION:
+            self._mm.close()
+            raise ValueError("incompatible index format")
+        meta = json.loads(self._mm[meta_off:self._records_off])
+        self.roots = meta["roots"]
+        self._directories = meta["directories"]
+        # When the manpath was last compared with the index, by this or any other process.
+        self.checked = os.stat(self.path).st_mtime
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> NameIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_stale(self) -> bool:
+        fingerprint = {directory: mtime for directory, mtime in self._directories}
+        return self.roots != [str(root) for root in get_manpath()] or fingerprint != manpath_fingerprint()
+
+    def lookup(self, name: str) -> list[PageLocation]:
+        """Every page called ``name``, best first."""
+        return [PageLocation(name, section, Path(path)) for name, section, path in self._entries(name)]
+
+    def find(self, name: str, section: str | None = None) -> PageLocation | None:
+        """The page man would show for ``name``, optionally in ``section`` (``3`` also matches ``3p``)."""
+        entries = self._entries(name)
+        if section is not None:
+            entries = [e for e in entries if e[1] == section] or [e for e in entries if e[1].startswith(section)]
+        if not entries:
+            return None
+        name, section, path = entries[0]
+        return PageLocation(name, section, Path(path))
+
+    def find_command(self, words: list[str], section: str | None = None) -> PageLocation | None:
+        """Resolve ``["git", "remote", "add"]`` as git-remote-add, then git-remote, then git."""
+        for end in range(len(words), 0, -1):
+            location = self.find("-".join(words[:end]), section)
+            if location is not None:
+                return location
+        return None
+
+    def directories(self) -> dict[str, tuple[int, list[tuple[str, str, str]]]]:
+        """``{directory: (mtime, [(name, section, path), ...])}`` as recorded in the index."""
+        pages: list[list[tuple[str, str, str]]] = [[] for _ in self._directories]
+        for i in range(self.count):
+            pages[self._record(i)[4]].append(self._entry(i))
+        return {directory: (mtime, pages[i]) for i, (directory, mtime) in enumerate(self._directories)}
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._records_off + i * _RECORD.size)
+
+    def _entries(self, name: str) -> list[tuple[str, str, str]]:
+        """``(name, section, path)`` of every record for ``name``, found by binary search."""
+        key = name.encode("utf-8")
+        mm, unpack, size = self._mm, _NAME_REF.unpack_from, _RECORD.size
+        records, strings = self._records_off, self._strings_off
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, name_len = unpack(mm, records + mid * size)
+            if mm[strings + offset:strings + offset + name_len] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        entries = []
+        while lo < self.count:
+            entry = self._entry(lo)
+            if entry[0] != name:
+                break
+            entries.append(entry)
+            lo += 1
+        return entries
+
+    def _entry(self, i: int) -> tuple[str, str, str]:
+        offset, name_len, section_len, path_len, _dir, _rank = self._record(i)
+        start = self._strings_off + offset
+        blob = self._mm[start:start + name_len + section_len + path_len].decode("utf-8", "surrogateescape")
+        return blob[:name_len], blob[name_len:name_len + section_len], blob[name_len + section_len:]
+
+
+def _shared_index(refresh: bool = False) -> NameIndex | None:
+    """The process-wide index, (re)built when missing, outdated or unreadable."""
+    global _index
+    with _lock:
+        index = _index
+        if index is None:
+            try:
+                index = NameIndex()
+            except (OSError, ValueError):
+                index = _rebuild(default_names_path(), None)
+            else:
+                # A different $MANPATH than the index was built for is caught at once.
+                refresh = refresh or index.roots != [str(root) for root in get_manpath()]
+        if index is not None and (refresh or time.time() - index.checked >= CHECK_INTERVAL):
+            if index.is_stale():
+                index = _rebuild(index.path, index)
+            else:
+                _mark_checked(index)
+        _index = index
+        return index
+
+
+def _mark_checked(index: NameIndex) -> None:
+    index.checked = time.time()
+    try:
+        # Other processes see the check through the file's mtime.
+        os.utime(index.path)
+    except OSError:
+        pass
+
+
+def _rebuild(path: Path, previous: NameIndex | None) -> NameIndex | None:
+    try:
+        build_name_index(path, previous)
+        index = NameIndex(path)
+    except (OSError, ValueError):
+        # No writable cache: resolve by probing the manpath instead.
+        return None
+    # The previous mapping is left to the garbage collector: another thread
+    # may still be reading from it.
+    return index
+
+
+def _write_index(
+    path: Path,
+    roots: list[Path],
+    directories: list[tuple[str, int]],
+    records: list[tuple[str, int, str, str, int]],
+) -> None:
+    meta = json.dumps(
+        {"roots": [str(root) for root in roots], "directories": directories},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    table = bytearray()
+    strings = bytearray()
+    for name, rank, section, page_path, dir_index in records:
+        parts = [part.encode("utf-8", "surrogateescape") for part in (name, section, page_path)]
+        table += _RECORD.pack(len(strings), len(parts[0]), len(parts[1]), len(parts[2]), dir_index, rank)
+        for part in parts:
+            strings += part
+
+    meta_off = _HEADER.size
+    records_off = meta_off + len(meta)
+    strings_off = records_off + len(table)
+    header = _HEADER.pack(NAMES_MAGIC, NAMES_VERSION, len(records), meta_off, records_off, strings_off)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(meta)
+            f.write(table)
+            f.write(strings)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
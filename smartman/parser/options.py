@@ -0,0 +1,130 @@
+"""Structured option entries extracted from rendered man page text."""
+
+from __future__ import annotations
+
+import re
+import textwrap
+from dataclasses import dataclass
+
+
+# Sections whose items are never option descriptions.
+SKIP_SECTIONS = {"NAME", "SYNOPSIS", "SEE ALSO"}
+
+# Typographic dashes groff may emit in place of "-".
+DASHES = str.maketrans({"‐": "-", "‑": "-", "−": "-"})
+
+FLAG_TOKEN = re.compile(r"(-{1,2}[A-Za-z0-9?@#][^\s=\[,]*)(.*)")
+# An item head is separated from an inline description by a run of spaces.
+INLINE_GAP = re.compile(r"\s{2,}")
+HEAD_SEPARATOR = re.compile(r",\s+|\s+\|\s+")
+
+
+@dataclass(frozen=True)
+class OptionEntry:
+    flags: tuple[str, ...]
+    argument: str | None
+    # Character offsets of the whole item (head and description) in the page text.
+    start: int
+    end: int
+
+
+class OptionTable:
+    """Option entries of one page, indexed by every alias they carry."""
+
+    def __init__(self, text: str = "", entries: list[OptionEntry] | None = None) -> None:
+        self.text = text
+        self.entries = entries or []
+        self.index: dict[str, OptionEntry] = {}
+        for entry in self.entries:
+            for flag in entry.flags:
+                self.index.setdefault(flag, entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, flag: str) -> list[OptionEntry]:
+        """Entries for ``flag``; ``-zxv`` falls back to one entry per bundled letter."""
+        flag = flag.translate(DASHES).split("=", 1)[0]
+        entry = self.index.get(flag)
+        if entry is not None:
+            return [entry]
+        if len(flag) > 2 and flag[0] == "-" and flag[1] != "-":
+            found = [self.index.get(f"-{letter}") for letter in flag[1:]]
+            if all(found):
+                return list(dict.fromkeys(found))
+        return []
+
+    def describe(self, entry: OptionEntry) -> str:
+        """The entry's description, without its head line."""
+        item = self.text[entry.start:entry.end]
+        head, _, body = item.partition("\n")
+        inline = INLINE_GAP.split(head.strip(), 1)
+        lines = [inline[1]] if len(inline) > 1 else []
+        if body:
+            lines.append(textwrap.dedent(body))
+        return "\n".join(lines).strip()
+
+
+def parse_options(text: str, spans: dict[str, tuple[int, int]]) -> list[OptionEntry]:
+    """Find option items (``-a, --all`` heads followed by an indented description)."""
+    entries = []
+    for name, (start, end) in spans.items():
+        if name.upper() in SKIP_SECTIONS or start == end:
+            continue
+        # Section spans start after the indentation of their first line.
+        start = text.rfind("\n", 0, start) + 1
+        entries.extend(_section_options(text, start, end))
+    return entries
+
+
+def _section_options(text: str, start: int, end: int) -> list[OptionEntry]:
+    lines = []
+    pos = start
+    for line in text[start:end].split("\n"):
+        lines.append((pos, line))
+        pos += len(line) + 1
+
+    entries = []
+    i = 0
+    while i < len(lines):
+        offset, line = lines[i]
+        stripped = line.lstrip()
+        indent = len(line) - len(stripped)
+        i += 1
+        if not stripped.translate(DASHES).startswith("-"):
+            continue
+        head = INLINE_GAP.split(stripped, 1)
+        flags, argument = _parse_head(head[0].translate(DASHES))
+        if not flags:
+            continue
+
+        item_end = offset + len(line)
+        has_body = len(head) > 1
+        j = i
+        while j < len(lines):
+            next_offset, next_line = lines[j]
+            if next_line.strip():
+                if len(next_line) - len(next_line.lstrip()) <= indent:
+                    break
+                item_end = next_offset + len(next_line)
+                has_body = True
+            j += 1
+        if has_body:
+            # Scanning resumes inside the description, so nested items
+            # (sub-options listed under a parent) are indexed too.
+            entries.append(OptionEntry(flags, argument, offset + indent, item_end))
+    return entries
+
+
+def _parse_head(head: str) -> tuple[tuple[str, ...], str | None]:
+    flags = []
+    argument = None
+    for token in HEAD_SEPARATOR.split(head):
+        match = FLAG_TOKEN.fullmatch(token.strip())
+        if match is None:
+            return (), None
+        flags.append(match.group(1))
+        rest = match.group(2).strip().lstrip("=")
+        if rest:
+            argument = rest
+    return tuple(flags), argument
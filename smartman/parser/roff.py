@@ -0,0 +1,937 @@
+"""In-process renderer for man(7) sources.
+
+Turns roff source into the same column layout ``man | col -b`` produces
+(section headings flush left, body text indented seven columns), so the
+output feeds straight into :class:`ManParser`'s section splitter. Only the
+man(7) macro package and the handful of low-level requests that page
+generators (help2man, pod2man, DocBook, asciidoc) emit are understood;
+anything else raises :class:`UnsupportedRoff` and the caller falls back to
+the real ``man`` pipeline.
+"""
+
+from __future__ import annotations
+
+import re
+import textwrap
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from smartman.parser.source import open_man_source, resolve_include
+
+
+# Private-use stand-ins that survive str.split() until the final output pass.
+NBSP = "\ue000"
+NOSPACE = "\ue001"
+
+BODY_INDENT = 7
+SUBHEADING_INDENT = 3
+MAX_INCLUDE_DEPTH = 4
+MAX_MACRO_DEPTH = 32
+
+SPECIAL_CHARS = {
+    "em": "—", "en": "–", "hy": "-", "mi": "-", "-": "-", "bu": "•",
+    "lq": "“", "rq": "”", "oq": "‘", "cq": "’", "aq": "'", "dq": '"',
+    "Fo": "«", "Fc": "»", "fo": "‹", "fc": "›",
+    "co": "©", "rg": "®", "tm": "™", "de": "°", "+-": "±", "mu": "×",
+    "di": "÷", "<=": "≤", ">=": "≥", "!=": "≠", "==": "≡", "->": "→",
+    "<-": "←", "ua": "↑", "da": "↓", "ti": "~", "ha": "^", "rs": "\\",
+    "sl": "/", "ba": "|", "or": "|", "at": "@", "sh": "#", "Do": "$",
+    "lB": "[", "rB": "]", "lC": "{", "rC": "}", "la": "⟨", "ra": "⟩",
+    "fm": "′", "sd": "″", "sq": "□", "ci": "○", "ss": "ß", "pl": "+",
+    "eq": "=", "ct": "¢", "Po": "£", "Ye": "¥", "Eu": "€", "ps": "¶",
+    "sc": "§", "dg": "†", "dd": "‡", "hbar": "ħ", "OK": "✓", "**": "*",
+    "ga": "`", "aa": "´", "a-": "¯", "ab": "˘", "a.": "˙", "ad": "¨",
+    "ao": "˚", "a~": "~", "a^": "^", "ul": "_", "ru": "_", "br": "|",
+    "bv": "|", "rn": "‾", "cr": "", "lh": "☜", "rh": "☞", "~~": "≈",
+    "if": "∞", "mc": "µ", "*a": "α", "*b": "β", "*g": "γ", "*d": "δ",
+    "*p": "π", "*m": "μ", "*W": "Ω",
+}
+
+SINGLE_ESCAPES = {
+    "-": "-", "e": "\\", "E": "\\", "\\": "\\", "&": "", " ": NBSP,
+    "~": NBSP, "0": NBSP, "|": "", "^": "", "%": "", ":": "", "'": "'",
+    "`": "`", ".": ".", "t": "\t", "a": "", "c": NOSPACE, "d": "",
+    "u": "", "r": "", "p": "", "z": "", "{": "", "}": "", "!": "",
+    ",": "", "/": "", ")": "", "\n": "",
+}
+
+PREDEFINED_STRINGS = {"lq": "“", "rq": "”", "R": "®", "Tm": "™", "S": ""}
+
+ESCAPE = re.compile(
+    r"""\\(?:
+        [fF](?:\[[^\]]*\]|\(..|.)
+      | s(?:[-+]?\(\d\d|\[[^\]]*\]|'[^']*'|[-+]?\d)
+      | \((?P<char2>..)
+      | \[(?P<named>[^\]]*)\]
+      | \*(?:\[(?P<strb>[^\]\s]*)[^\]]*\]|\((?P<str2>..)|(?P<str1>.))
+      | n[-+]?(?:\[(?P<regb>[^\]]*)\]|\((?P<reg2>..)|(?P<reg1>.))
+      | (?P<argop>[hvwlLDNbRoXZxSHY])(?P<delim>['|"])(?P<argval>.*?)(?P=delim)
+      | [mMgkVO](?:\[[^\]]*\]|\(..|.)
+      | \$(?:\*|@|\d)
+      | (?P<single>.)
+    )""",
+    re.X | re.S,
+)
+
+# Registers the man macros and page preambles commonly probe.
+BUILTIN_REGISTERS = {".g": 1, ".H": 24, ".V": 40, ".l": 78 * 24, ".i": 0, "LL": 78 * 24}
+
+UNIT_SCALE = {
+    "i": 10.0, "c": 3.94, "p": 10 / 72, "P": 10 / 6, "m": 1.0, "n": 1.0,
+    "v": 1.0, "u": 1 / 24, "M": 0.01, "s": 1.0, "z": 1.0, "f": 1.0,
+}
+
+NUMBER = re.compile(r"\d*\.?\d+")
+OPERATOR = re.compile(r"<=|>=|==|<\?|>\?|[-+*/%<>=&:]")
+
+
+class UnsupportedRoff(Exception):
+    """Raised when a source uses roff features this renderer does not handle."""
+
+
+class SourceRedirect(Exception):
+    """Raised when a page is nothing but a ``.so`` include of another page."""
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        super().__init__(target)
+
+
+def render_man_source(path: Path, width: int = 80) -> Iterator[str]:
+    """Yield the rendered lines of the man page source at ``path``."""
+    for _ in range(MAX_INCLUDE_DEPTH):
+        with open_man_source(path) as stream:
+            try:
+                yield from RoffRenderer(width).render(stream)
+                return
+            except SourceRedirect as redirect:
+                target = resolve_include(path, redirect.target)
+        if target is None:
+            raise UnsupportedRoff(f"unresolvable .so {redirect.target}")
+        path = target
+    raise UnsupportedRoff("too many nested .so includes")
+
+
+class RoffRenderer:
+    """A small man(7) formatter producing ``man``-style plain text lines."""
+
+    def __init__(self, width: int = 80) -> None:
+        self.width = width
+        self._out: list[str] = []
+        self._emitted_any = False
+        self._last_blank = True
+        self._no_space = False
+
+        self._fill = True
+        self._text = ""
+        self._margin = BODY_INDENT
+        self._body_indent = 0
+        self._prevailing = BODY_INDENT
+        self._rs_stack: list[tuple[int, int, int]] = []
+        self._in_stack: list[int] = []
+        self._tag: str | None = None
+        self._want_tag = False
+        self._pending_request: str | None = None
+        self._link: str | None = None
+
+        self._strings: dict[str, str] = dict(PREDEFINED_STRINGS)
+        self._registers: dict[str, float] = dict(BUILTIN_REGISTERS)
+        self._macros: dict[str, list[str]] = {}
+        self._macro_depth = 0
+        self._string_depth = 0
+        self._macro_args: list[list[str]] = []
+        self._last_condition = True
+
+        self._lines: Iterator[str] = iter(())
+
+    # -- driver ---------------------------------------------------------------
+
+    def render(self, source: Iterable[str]) -> Iterator[str]:
+        self._lines = self._logical_lines(source)
+        for line in self._lines:
+            self._handle(line)
+            if self._out:
+                yield from self._out
+                self._out = []
+        self._break()
+        yield from self._out
+        self._out = []
+
+    def _logical_lines(self, source: Iterable[str]) -> Iterator[str]:
+        """Join lines ending in an escaped newline, as roff does."""
+        pending = ""
+        for raw in source:
+            line = raw.rstrip("\n").rstrip("\r")
+            trailing = len(line) - len(line.rstrip("\\"))
+            if trailing % 2:
+                pending += line[:-1]
+                continue
+            yield pending + line
+            pending = ""
+        if pending:
+            yield pending
+
+    # -- input dispatch -------------------------------------------------------
+
+    def _handle(self, line: str) -> None:
+        line = _strip_comment(line)
+        if line[:1] in (".", "'"):
+            self._request(line[1:])
+        else:
+            self._text_line(line)
+
+    def _request(self, body: str) -> None:
+        body = body.lstrip(" \t")
+        match = re.match(r"[^\s\\]+", body)
+        if match is None:
+            # Bare "." or a lone "\}" closing a conditional block.
+            return
+        name = match.group(0)
+        rest = body[match.end():]
+        if name in self._macros:
+            self._call_macro(name, _split_args(self._interpolate_args(rest)))
+            return
+        handler = getattr(self, f"_req_{REQUEST_ALIASES.get(name, name)}", None)
+        if handler is None:
+            if name in UNSUPPORTED_REQUESTS:
+                raise UnsupportedRoff(f"unsupported request .{name}")
+            # groff ignores undefined requests; so do we (e.g. .IX, .hy, .ad).
+            return
+        if name in RAW_ARG_REQUESTS:
+            handler(rest)
+        else:
+            handler(_split_args(self._interpolate_args(rest)))
+
+    def _text_line(self, line: str) -> None:
+        if self._pending_request is not None:
+            # ".SH" or ".B" without arguments applies to the next input line.
+            request, self._pending_request = self._pending_request, None
+            getattr(self, f"_req_{request}")([line])
+            return
+
+        text = self._expand(line)
+        if self._want_tag:
+            self._want_tag = False
+            self._tag = text.strip().replace(NOSPACE, "")
+            return
+
+        if not self._fill:
+            self._break()
+            self._emit_nofill(text)
+            return
+
+        if not line.strip():
+            self._break()
+            self._blank()
+            return
+        if line[:1] in (" ", "\t"):
+            self._break()
+        self._add_text(text)
+
+    # -- output ---------------------------------------------------------------
+
+    def _emit(self, line: str) -> None:
+        line = line.replace(NBSP, " ").replace(NOSPACE, "").rstrip()
+        self._out.append(line)
+        self._emitted_any = True
+        self._last_blank = not line
+        if line:
+            self._no_space = False
+
+    def _blank(self) -> None:
+        if self._emitted_any and not self._last_blank and not self._no_space:
+            self._emit("")
+
+    def _emit_nofill(self, text: str) -> None:
+        indent = " " * (self._margin + self._body_indent)
+        self._emit(indent + text.expandtabs(8) if text.strip() else "")
+
+    def _add_text(self, text: str) -> None:
+        text = text.replace("\t", " ")
+        if self._text.endswith(NOSPACE):
+            self._text = self._text[:-1] + text
+        elif self._text:
+            self._text += " " + text
+        else:
+            self._text = text
+
+    def _break(self) -> None:
+        words = self._text.replace(NOSPACE, "").split()
+        self._text = ""
+        tag, self._tag = self._tag, None
+        indent = self._margin + self._body_indent
+
+        if tag is None and not words:
+            return
+
+        prefix = " " * indent
+        if tag is not None:
+            tag_prefix = " " * self._margin
+            if not words:
+                self._emit(tag_prefix + tag)
+                return
+            if len(tag) + 1 <= self._body_indent:
+                prefix = tag_prefix + tag.ljust(self._body_indent)
+            else:
+                self._emit(tag_prefix + tag)
+
+        avail = max(self.width - indent, 20)
+        line: list[str] = []
+        length = 0
+        for word in words:
+            if line and length + 1 + len(word) > avail:
+                self._emit(prefix + " ".join(line))
+                prefix = " " * indent
+                line, length = [], 0
+            length += len(word) + (1 if line else 0)
+            line.append(word)
+        if line:
+            self._emit(prefix + " ".join(line))
+
+    def _paragraph(self) -> None:
+        self._break()
+        self._blank()
+
+    # -- escapes --------------------------------------------------------------
+
+    def _expand(self, text: str) -> str:
+        if "\\" not in text:
+            return text
+        return ESCAPE.sub(self._escape, text)
+
+    def _interpolate_string(self, name: str) -> str:
+        if self._string_depth >= MAX_MACRO_DEPTH:
+            raise UnsupportedRoff(f"string recursion in \\*[{name}]")
+        self._string_depth += 1
+        try:
+            return self._expand(self._strings.get(name, ""))
+        finally:
+            self._string_depth -= 1
+
+    def _escape(self, match: re.Match) -> str:
+        groups = match.groupdict()
+        if groups["single"] is not None:
+            char = groups["single"]
+            return SINGLE_ESCAPES.get(char, char)
+        if groups["char2"] is not None:
+            return SPECIAL_CHARS.get(groups["char2"], "")
+        if groups["named"] is not None:
+            return _named_char(groups["named"])
+        string = groups["strb"] or groups["str2"] or groups["str1"]
+        if string is not None:
+            return self._interpolate_string(string)
+        register = groups["regb"] or groups["reg2"] or groups["reg1"]
+        if register is not None:
+            return str(int(self._registers.get(register, 0)))
+        op = groups["argop"]
+        if op == "w":
+            return str(len(self._expand(groups["argval"]).replace(NOSPACE, "")) * 24)
+        if op == "o":
+            return self._expand(groups["argval"])[:1]
+        return ""
+
+    def _interpolate_args(self, text: str) -> str:
+        """Substitute ``\\$1``... inside a macro body with the caller's arguments."""
+        if not self._macro_args or "\\$" not in text:
+            return text
+        args = self._macro_args[-1]
+
+        def arg(match: re.Match) -> str:
+            key = match.group(1)
+            if key in ("*", "@"):
+                return " ".join(_quote(a) for a in args) if key == "@" else " ".join(args)
+            index = int(key) - 1
+            return args[index] if 0 <= index < len(args) else ""
+
+        return re.sub(r"\\\$(\*|@|\d)", arg, text)
+
+    # -- conditionals, strings, registers, macros -----------------------------
+
+    def _condition(self, text: str) -> tuple[bool, str]:
+        text = text.lstrip()
+        negate = text.startswith("!")
+        if negate:
+            text = text[1:]
+
+        if text[:1] in ("n", "t", "o", "e", "v") and (len(text) == 1 or not text[1].isalnum()):
+            result, rest = text[0] in ("n", "o"), text[1:]
+        elif text[:1] in ("d", "r", "c") and len(text) > 1:
+            name, _, rest = text[1:].lstrip().partition(" ")
+            if text[0] == "d":
+                result = name in self._strings or name in self._macros
+            elif text[0] == "r":
+                result = name in self._registers
+            else:
+                result = True
+        elif text[:1] in ("'", '"', "|"):
+            delim = text[0]
+            parts = text[1:].split(delim, 2)
+            if len(parts) < 3:
+                raise UnsupportedRoff(f"malformed string comparison: {text}")
+            result = self._expand(parts[0]) == self._expand(parts[1])
+            rest = parts[2]
+        else:
+            expr, rest = _take_expression(text)
+            if not expr:
+                raise UnsupportedRoff(f"unsupported condition: {text}")
+            result = self._number(expr) > 0
+
+        return result != negate, rest
+
+    def _conditional_body(self, result: bool, body: str) -> None:
+        body = body.lstrip()
+        opens_block = body.startswith("\\{")
+        if opens_block:
+            body = body[2:]
+        if result:
+            if body.strip():
+                self._handle(body)
+            return
+        if opens_block:
+            self._skip_block(body)
+
+    def _skip_block(self, first: str) -> None:
+        depth = 1 + first.count("\\{") - first.count("\\}")
+        while depth > 0:
+            line = next(self._lines, None)
+            if line is None:
+                return
+            depth += line.count("\\{") - line.count("\\}")
+
+    def _number(self, expr: str, default_scale: float = 1.0) -> float:
+        return _evaluate(self._expand_registers(expr), default_scale)
+
+    def _expand_registers(self, expr: str) -> str:
+        return ESCAPE.sub(
+            lambda m: self._escape(m) if (m.group("regb") or m.group("reg2") or m.group("reg1") or m.group("argop")) else m.group(0),
+            expr,
+        )
+
+    def _indent_arg(self, args: list[str], fallback: int) -> int:
+        if not args or not args[0].strip():
+            return fallback
+        try:
+            value = self._number(args[0])
+        except (UnsupportedRoff, ValueError, ZeroDivisionError):
+            return fallback
+        return max(0, round(value))
+
+    def _call_macro(self, name: str, args: list[str]) -> None:
+        if self._macro_depth >= MAX_MACRO_DEPTH:
+            raise UnsupportedRoff(f"macro recursion in .{name}")
+        self._macro_depth += 1
+        self._macro_args.append(args)
+        saved, self._lines = self._lines, iter(self._macros[name])
+        try:
+            for line in self._lines:
+                self._handle(self._interpolate_args(line))
+        finally:
+            self._lines = saved
+            self._macro_args.pop()
+            self._macro_depth -= 1
+
+    # -- requests -------------------------------------------------------------
+
+    def _req_TH(self, args: list[str]) -> None:
+        title = self._expand(args[0]) if args else ""
+        section = self._expand(args[1]) if len(args) > 1 else ""
+        manual = self._expand(args[4]) if len(args) > 4 else ""
+        ident = f"{title}({section})" if section else title
+        gap = max(self.width - 2 * len(ident) - len(manual), 2)
+        left = gap // 2
+        self._emit(f"{ident}{' ' * left}{manual}{' ' * (gap - left)}{ident}")
+        self._emit("")
+
+    def _req_SH(self, args: list[str]) -> None:
+        self._heading(args, 0, "SH")
+
+    def _req_SS(self, args: list[str]) -> None:
+        self._heading(args, SUBHEADING_INDENT, "SS")
+
+    def _heading(self, args: list[str], indent: int, request: str) -> None:
+        if not args:
+            self._pending_request = request
+            return
+        self._break()
+        self._fill = True
+        self._margin = BODY_INDENT
+        self._body_indent = 0
+        self._prevailing = BODY_INDENT
+        self._rs_stack.clear()
+        self._in_stack.clear()
+        self._blank()
+        heading = " ".join(self._expand(a) for a in args).replace(NOSPACE, "")
+        self._emit(" " * indent + heading)
+        self._no_space = True
+
+    def _req_PP(self, args: list[str]) -> None:
+        self._paragraph()
+        self._body_indent = 0
+        self._prevailing = BODY_INDENT
+
+    def _req_TP(self, args: list[str]) -> None:
+        self._paragraph()
+        self._prevailing = self._indent_arg(args, self._prevailing)
+        self._body_indent = self._prevailing
+        self._want_tag = True
+
+    def _req_TQ(self, args: list[str]) -> None:
+        # Another tag for the same body: the previous tag gets its own line.
+        if self._tag is not None:
+            self._emit(" " * self._margin + self._tag)
+            self._tag = None
+        self._want_tag = True
+
+    def _req_IP(self, args: list[str]) -> None:
+        self._paragraph()
+        self._prevailing = self._indent_arg(args[1:], self._prevailing)
+        self._body_indent = self._prevailing
+        tag = self._expand(args[0]).replace(NOSPACE, "").strip() if args else ""
+        self._tag = tag or None
+
+    def _req_HP(self, args: list[str]) -> None:
+        self._req_PP(args)
+
+    def _req_RS(self, args: list[str]) -> None:
+        self._break()
+        self._rs_stack.append((self._margin, self._body_indent, self._prevailing))
+        self._margin += self._indent_arg(args, self._prevailing)
+        self._body_indent = 0
+        self._prevailing = BODY_INDENT
+
+    def _req_RE(self, args: list[str]) -> None:
+        self._break()
+        if self._rs_stack:
+            self._margin, self._body_indent, self._prevailing = self._rs_stack.pop()
+
+    def _req_in(self, args: list[str]) -> None:
+        self._break()
+        if not args:
+            if self._in_stack:
+                self._margin = self._in_stack.pop()
+            return
+        self._in_stack.append(self._margin)
+        arg = args[0]
+        delta = self._indent_arg([arg.lstrip("+-")], 0)
+        if arg.startswith("+"):
+            self._margin += delta
+        elif arg.startswith("-"):
+            self._margin = max(0, self._margin - delta)
+        else:
+            self._margin = delta
+
+    def _req_br(self, args: list[str]) -> None:
+        self._break()
+
+    def _req_sp(self, args: list[str]) -> None:
+        self._break()
+        count = self._indent_arg(args, 1)
+        if self._no_space:
+            return
+        for _ in range(min(count, 3)):
+            if self._emitted_any:
+                self._emit("")
+
+    def _req_nf(self, args: list[str]) -> None:
+        self._break()
+        self._fill = False
+
+    def _req_fi(self, args: list[str]) -> None:
+        self._break()
+        self._fill = True
+
+    def _req_B(self, args: list[str]) -> None:
+        if not args:
+            self._pending_request = "B"
+            return
+        self._text_line(" ".join(args))
+
+    def _req_I(self, args: list[str]) -> None:
+        if not args:
+            self._pending_request = "I"
+            return
+        self._text_line(" ".join(args))
+
+    def _req_BR(self, args: list[str]) -> None:
+        self._text_line("".join(args))
+
+    def _req_UR(self, args: list[str]) -> None:
+        self._link = self._expand(args[0]) if args else ""
+
+    def _req_UE(self, args: list[str]) -> None:
+        link, self._link = self._link, None
+        if link:
+            self._text_line(f"<{link}>" + "".join(args))
+
+    def _req_SY(self, args: list[str]) -> None:
+        self._break()
+        self._text_line(" ".join(args))
+
+    def _req_OP(self, args: list[str]) -> None:
+        self._text_line("[" + " ".join(args) + "]")
+
+    def _req_YS(self, args: list[str]) -> None:
+        self._break()
+
+    def _req_ds(self, rest: str) -> None:
+        name, _, value = rest.lstrip().partition(" ")
+        value = value.lstrip()
+        if value.startswith('"'):
+            value = value[1:]
+        self._strings[name] = value
+
+    def _req_as(self, rest: str) -> None:
+        name, _, value = rest.lstrip().partition(" ")
+        value = value.lstrip()
+        if value.startswith('"'):
+            value = value[1:]
+        self._strings[name] = self._strings.get(name, "") + value
+
+    def _req_nr(self, args: list[str]) -> None:
+        if len(args) < 2:
+            return
+        name, expr = args[0], args[1]
+        try:
+            value = self._number(expr.lstrip("+-"))
+        except (UnsupportedRoff, ValueError, ZeroDivisionError):
+            return
+        current = self._registers.get(name, 0)
+        if expr.startswith("+"):
+            value = current + value
+        elif expr.startswith("-"):
+            value = current - value
+        self._registers[name] = value
+
+    def _req_rr(self, args: list[str]) -> None:
+        for name in args:
+            self._registers.pop(name, None)
+
+    def _req_rm(self, args: list[str]) -> None:
+        for name in args:
+            self._strings.pop(name, None)
+            self._macros.pop(name, None)
+
+    def _req_als(self, args: list[str]) -> None:
+        if len(args) >= 2:
+            if args[1] in self._macros:
+                self._macros[args[0]] = self._macros[args[1]]
+            elif args[1] in self._strings:
+                self._strings[args[0]] = self._strings[args[1]]
+
+    def _req_de(self, args: list[str]) -> None:
+        if args:
+            self._macros[args[0]] = self._macro_body(args)
+
+    def _req_am(self, args: list[str]) -> None:
+        if args:
+            self._macros[args[0]] = self._macros.get(args[0], []) + self._macro_body(args)
+
+    def _macro_body(self, args: list[str]) -> list[str]:
+        terminator = "." + (args[1] if len(args) > 1 else ".")
+        body = []
+        for line in self._lines:
+            if line.strip().replace(" ", "") == terminator:
+                break
+            # Copy mode: an escaped backslash stands for a literal one.
+            body.append(line.replace("\\\\", "\\"))
+        return body
+
+    def _req_ig(self, args: list[str]) -> None:
+        terminator = "." + (args[0] if args else ".")
+        for line in self._lines:
+            if line.strip() == terminator:
+                break
+
+    def _req_if(self, rest: str) -> None:
+        result, body = self._condition(rest)
+        self._conditional_body(result, body)
+
+    def _req_ie(self, rest: str) -> None:
+        result, body = self._condition(rest)
+        self._last_condition = result
+        self._conditional_body(result, body)
+
+    def _req_el(self, rest: str) -> None:
+        self._conditional_body(not self._last_condition, rest)
+
+    def _req_so(self, args: list[str]) -> None:
+        if self._emitted_any or not args:
+            raise UnsupportedRoff(".so in the middle of a page")
+        raise SourceRedirect(args[0])
+
+    def _req_TS(self, args: list[str]) -> None:
+        self._break()
+        rows = self._read_table()
+        for line in _layout_table(rows, self.width - self._margin - self._body_indent):
+            self._emit(" " * (self._margin + self._body_indent) + line)
+
+    def _read_table(self) -> list[list[str]]:
+        """Consume a tbl(1) block up to ``.TE`` and return its data rows."""
+        tab = "\t"
+        rows: list[list[str]] = []
+        cells: list[str] = []
+        block: list[str] | None = None
+        in_format = True
+        first = True
+
+        for line in self._lines:
+            stripped = line.strip()
+            if block is not None:
+                if not stripped.startswith("T}"):
+                    block.append(line)
+                    continue
+                # A T{ ... T} text block ends one cell; more cells may follow.
+                text = " ".join(self._expand(b) for b in block if b[:1] not in (".", "'"))
+                cells.append(_clean(text))
+                block = None
+                rest = stripped[2:]
+                if rest.startswith(tab):
+                    block = self._table_row(rest[len(tab):], tab, cells, rows)
+                else:
+                    rows.append(cells)
+                if block is None:
+                    cells = []
+                continue
+
+            if stripped.startswith(".TE"):
+                break
+            if in_format:
+                if first and stripped.endswith(";"):
+                    found = re.search(r"tab\s*\((.)\)", stripped)
+                    if found:
+                        tab = found.group(1)
+                elif stripped.endswith("."):
+                    in_format = False
+                first = False
+                continue
+            if stripped.startswith(".T&"):
+                in_format = True
+                continue
+            if not stripped or stripped[:1] in (".", "'") or stripped in ("_", "="):
+                continue
+
+            block = self._table_row(line, tab, cells, rows)
+            if block is None:
+                cells = []
+        return rows
+
+    def _table_row(self, line: str, tab: str, cells: list[str], rows: list[list[str]]) -> list[str] | None:
+        """Add one input row's cells; returns a new block if the row opens ``T{``."""
+        parts = line.split(tab)
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1 and part.strip() == "T{":
+                return []
+            cells.append(_clean(self._expand(part)))
+        rows.append(cells)
+        return None
+
+    def _req_EX(self, args: list[str]) -> None:
+        self._req_nf(args)
+
+    def _req_EE(self, args: list[str]) -> None:
+        self._req_fi(args)
+
+
+# Requests whose arguments must be seen verbatim (conditions, string bodies).
+RAW_ARG_REQUESTS = {"if", "ie", "el", "ds", "as", "ds1", "as1"}
+
+REQUEST_ALIASES = {
+    "LP": "PP", "P": "PP", "SB": "B", "SM": "B",
+    "IR": "BR", "RI": "BR", "BI": "BR", "IB": "BR", "RB": "BR",
+    "MT": "UR", "ME": "UE", "de1": "de", "am1": "am", "ds1": "ds", "as1": "as",
+    "Vb": "nf", "Ve": "fi",
+}
+
+# mdoc(7), eqn, pic and similar preprocessors are left to the real man.
+UNSUPPORTED_REQUESTS = {
+    "Dd", "Dt", "Os", "Sh", "Nm", "Nd", "EQ", "EN", "PS", "PE", "G1", "G2",
+    "R1", "R2", "[", "]", "wh", "ch", "di", "da", "ev", "while",
+}
+
+
+def _strip_comment(line: str) -> str:
+    for match in re.finditer(r"\\(.)", line):
+        if match.group(1) in ('"', "#"):
+            return line[: match.start()]
+    return line
+
+
+def _split_args(text: str) -> list[str]:
+    """Split macro arguments, honouring roff's double-quote rules."""
+    args: list[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        while i < n and text[i] in " \t":
+            i += 1
+        if i >= n:
+            break
+        if text[i] == '"':
+            i += 1
+            buf = []
+            while i < n:
+                if text[i] == '"':
+                    if i + 1 < n and text[i + 1] == '"':
+                        buf.append('"')
+                        i += 2
+                        continue
+                    i += 1
+                    break
+                buf.append(text[i])
+                i += 1
+            args.append("".join(buf))
+        else:
+            start = i
+            while i < n and text[i] not in " \t":
+                if text[i] == "\\" and i + 1 < n:
+                    i += 1
+                i += 1
+            args.append(text[start:i])
+    return args
+
+
+def _quote(arg: str) -> str:
+    return f'"{arg}"' if (" " in arg or not arg) else arg
+
+
+def _clean(text: str) -> str:
+    return text.replace(NBSP, " ").replace(NOSPACE, "").strip()
+
+
+def _named_char(name: str) -> str:
+    if name in SPECIAL_CHARS:
+        return SPECIAL_CHARS[name]
+    if name.startswith("u") and len(name) >= 5:
+        try:
+            return "".join(chr(int(code, 16)) for code in name[1:].split("_"))
+        except ValueError:
+            return ""
+    return ""
+
+
+def _take_expression(text: str) -> tuple[str, str]:
+    """Split a numeric condition from the body that follows it."""
+    depth = 0
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\":
+            if depth <= 0 and text.startswith("\\{", i):
+                break
+            match = ESCAPE.match(text, i)
+            i = match.end() if match else i + 1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth <= 0 and char in " \t":
+            break
+        i += 1
+    return text[:i], text[i:]
+
+
+def _evaluate(expr: str, default_scale: float = 1.0) -> float:
+    """Evaluate a roff numeric expression (strictly left to right, no precedence)."""
+    value, pos = _evaluate_from(expr.strip(), 0, default_scale)
+    if pos != len(expr.strip()):
+        raise UnsupportedRoff(f"unsupported expression: {expr}")
+    return value
+
+
+def _evaluate_from(expr: str, pos: int, scale: float) -> tuple[float, int]:
+    value, pos = _term(expr, pos, scale)
+    while pos < len(expr) and expr[pos] != ")":
+        match = OPERATOR.match(expr, pos)
+        if match is None:
+            break
+        op = match.group(0)
+        rhs, pos = _term(expr, match.end(), scale)
+        value = _apply(op, value, rhs)
+    return value, pos
+
+
+def _term(expr: str, pos: int, scale: float) -> tuple[float, int]:
+    if pos < len(expr) and expr[pos] in "+-":
+        sign = -1.0 if expr[pos] == "-" else 1.0
+        value, pos = _term(expr, pos + 1, scale)
+        return sign * value, pos
+    if pos < len(expr) and expr[pos] == "(":
+        value, pos = _evaluate_from(expr, pos + 1, scale)
+        if pos >= len(expr) or expr[pos] != ")":
+            raise UnsupportedRoff(f"unbalanced expression: {expr}")
+        return value, pos + 1
+    match = NUMBER.match(expr, pos)
+    if match is None:
+        raise UnsupportedRoff(f"unsupported expression: {expr}")
+    value = float(match.group(0))
+    pos = match.end()
+    if pos < len(expr) and expr[pos] in UNIT_SCALE:
+        return value * UNIT_SCALE[expr[pos]], pos + 1
+    return value * scale, pos
+
+
+def _apply(op: str, lhs: float, rhs: float) -> float:
+    if op == "+":
+        return lhs + rhs
+    if op == "-":
+        return lhs - rhs
+    if op == "*":
+        return lhs * rhs
+    if op == "/":
+        return lhs / rhs if rhs else 0
+    if op == "%":
+        return lhs % rhs if rhs else 0
+    if op == "<":
+        return float(lhs < rhs)
+    if op == ">":
+        return float(lhs > rhs)
+    if op == "<=":
+        return float(lhs <= rhs)
+    if op == ">=":
+        return float(lhs >= rhs)
+    if op in ("=", "=="):
+        return float(lhs == rhs)
+    if op == "&":
+        return float(lhs > 0 and rhs > 0)
+    if op == ":":
+        return float(lhs > 0 or rhs > 0)
+    if op == "<?":
+        return min(lhs, rhs)
+    if op == ">?":
+        return max(lhs, rhs)
+    raise UnsupportedRoff(f"unsupported operator {op}")
+
+
+def _layout_table(rows: list[list[str]], avail: int) -> list[str]:
+    """Lay tbl rows out as space-separated columns, wrapping wide cells."""
+    rows = [r for r in rows if any(r)]
+    if not rows:
+        return []
+    ncols = max(len(r) for r in rows)
+    widths = [0] * ncols
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(cell))
+
+    gap = 2
+    total = sum(widths) + gap * (ncols - 1)
+    if total > avail:
+        # Keep narrow columns intact and give the remaining room to the widest.
+        widest = max(range(ncols), key=lambda i: widths[i])
+        others = total - widths[widest]
+        widths[widest] = max(avail - others, 20)
+
+    lines: list[str] = []
+    for row in rows:
+        wrapped = [
+            textwrap.wrap(cell, widths[i]) or [""]
+            for i, cell in enumerate(row)
+        ]
+        height = max(len(w) for w in wrapped)
+        for line_no in range(height):
+            parts = []
+            for i, cell_lines in enumerate(wrapped):
+                part = cell_lines[line_no] if line_no < len(cell_lines) else ""
+                parts.append(part.ljust(widths[i]) if i < len(wrapped) - 1 else part)
+            lines.append((" " * gap).join(parts).rstrip())
+    return lines
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO
+
+
+DEFAULT_MANPATH = ["/usr/local/share/man", "/usr/share/man", "/usr/local/man"]
+
+# man-db's default search order: user commands first, then admin, libraries, ...
+SECTION_ORDER = ["1", "n", "l", "8", "3", "2", "5", "4", "9", "6", "7"]
+
+SECTION_TOKEN = re.compile(r"^(?:[0-9][a-z]*|[nl])$")
+# A page reference as man pages write them: "printf(3)".
+PAGE_REFERENCE = re.compile(r"^(\S+)\(((?:[0-9][a-z]*|[nl]))\)$")
+
+COMPRESSORS = {
+    "": open,
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}
+
+
+def get_manpath() -> list[Path]:
+    """Return the man page roots to search, honouring $MANPATH like man-db does."""
+    env = os.environ.get("MANPATH")
+    if env is None:
+        entries = list(DEFAULT_MANPATH)
+    else:
+        entries = []
+        for entry in env.split(":"):
+            # An empty component splices in the system default path.
+            entries.extend(DEFAULT_MANPATH if not entry else [entry])
+
+    seen: set[str] = set()
+    roots = []
+    for entry in entries:
+        if entry not in seen and os.path.isdir(entry):
+            seen.add(entry)
+            roots.append(Path(entry))
+    return roots
+
+
+def split_command(command: str) -> tuple[str, str | None]:
+    """Turn ``"3 printf"`` / ``"docker run"`` into a page name and optional section."""
+    words, section = split_command_words(command)
+    return "-".join(words), section
+
+
+def split_command_words(command: str) -> tuple[list[str], str | None]:
+    """Like :func:`split_command`, but keeps the words: ``"3 printf"`` -> ``(["printf"], "3")``.
+
+    ``"printf(3)"`` selects a section too.
+    """
+    parts = command.split()
+    section = None
+    if len(parts) > 1 and _looks_like_section(parts[0]):
+        section, parts = parts[0], parts[1:]
+    elif len(parts) == 1:
+        reference = PAGE_REFERENCE.match(parts[0])
+        if reference is not None:
+            parts, section = [reference.group(1)], reference.group(2)
+    return parts, section
+
+
+def man_arguments(command: str) -> list[str]:
+    """What to pass to ``man`` for ``command``; ``printf(3)`` becomes ``3 printf``."""
+    reference = PAGE_REFERENCE.match(command.strip())
+    if reference is not None:
+        return [reference.group(2), reference.group(1)]
+    return command.split()
+
+
+def find_man_source(command: str) -> Path | None:
+    """Locate the source file of a man page without spawning ``man``."""
+    name, section = split_command(command)
+    if not name:
+        return None
+
+    roots = get_manpath()
+    sections = [section] if section else SECTION_ORDER
+    for sec in sections:
+        for root in roots:
+            path = _find_in_dir(root / f"man{sec[0]}", name, sec)
+            if path is not None:
+                return path
+    return None
+
+
+def iter_man_pages(sections: Iterable[str] | None = None) -> Iterator[tuple[str, str, Path]]:
+    """Yield ``(name, section, path)`` for every page on the manpath.
+
+    When a page exists under several roots only the one ``find_man_source``
+    would pick (the earliest root) is reported.
+    """
+    wanted = {s.strip() for s in sections} if sections else None
+    seen: set[tuple[str, str]] = set()
+    for root in get_manpath():
+        try:
+            subdirs = sorted(d for d in os.listdir(root) if d.startswith("man"))
+        except OSError:
+            continue
+        for subdir in subdirs:
+            if wanted is not None and subdir[3:] not in wanted:
+                continue
+            try:
+                with os.scandir(root / subdir) as it:
+                    entries = [e for e in it if e.is_file()]
+            except OSError:
+                continue
+            for entry in entries:
+                name, _, section = _strip_compression(entry.name).rpartition(".")
+                if not name or not section or not _looks_like_section(section):
+                    continue
+                if (name, section) in seen:
+                    continue
+                seen.add((name, section))
+                yield name, section, Path(entry.path)
+
+
+def manpath_fingerprint() -> dict[str, int]:
+    """Map every ``manN`` directory on the manpath to its mtime.
+
+    Installing or removing a page changes its directory's mtime, so comparing
+    fingerprints is a cheap way to tell whether an index needs rebuilding.
+    """
+    fingerprint = {}
+    for root in get_manpath():
+        try:
+            subdirs = [d for d in os.listdir(root) if d.startswith("man")]
+        except OSError:
+            continue
+        for subdir in subdirs:
+            try:
+                fingerprint[str(root / subdir)] = os.stat(root / subdir).st_mtime_ns
+            except OSError:
+                pass
+    return fingerprint
+
+
+def open_man_source(path: Path) -> IO[str]:
+    """Open a (possibly compressed) page source as a streaming text reader."""
+    opener = COMPRESSORS.get(path.suffix, open)
+    raw = opener(path, "rb")
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+
+
+def resolve_include(path: Path, target: str) -> Path | None:
+    """Resolve a ``.so man1/foo.1`` include relative to the page's man root."""
+    root = path.parent.parent
+    for base in (root / target, path.parent / target):
+        for ext in COMPRESSORS:
+            candidate = base.with_name(base.name + ext)
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def _find_in_dir(directory: Path, name: str, section: str) -> Path | None:
+    prefix = f"{name}.{section}"
+    for ext in COMPRESSORS:
+        candidate = directory / f"{prefix}{ext}"
+        if candidate.is_file():
+            return candidate
+
+    # Extended sections such as printf.3p or openssl.1ssl.
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(prefix) and _strip_compression(entry.name) != prefix:
+                    return Path(entry.path)
+    except OSError:
+        pass
+    return None
+
+
+def _strip_compression(filename: str) -> str:
+    for ext in COMPRESSORS:
+        if ext and filename.endswith(ext):
+            return filename[: -len(ext)]
+    return filename
+
+
+def _looks_like_section(token: str) -> bool:
+    return SECTION_TOKEN.match(token) is not None
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from smartman.parser.cache import PageCache
+from smartman.parser.man_parser import DEFAULT_WIDTH, ManParser
+from smartman.parser.source import iter_man_pages
+from smartman.utils.pool import run_bounded
+
+
+@dataclass
+class WarmResult:
+    total: int = 0
+    warmed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def warm_cache(
+    sections: Iterable[str] | None = None,
+    jobs: int | None = None,
+    width: int = DEFAULT_WIDTH,
+    on_progress: Callable[[WarmResult], None] | None = None,
+) -> WarmResult:
+    """Parse every page on the manpath into the page cache.
+
+    Pages already cached for their current source mtime and size are skipped
+    before any work is scheduled, so an interrupted run resumes where it
+    stopped and a repeat run only touches pages that changed.
+    """
+    cache = PageCache()
+    pages = list(iter_man_pages(sections))
+    result = WarmResult(total=len(pages))
+
+    pending = []
+    for name, section, path in pages:
+        if cache.contains(path, width):
+            result.skipped += 1
+        else:
+            pending.append(f"{section} {name}")
+    if on_progress:
+        on_progress(result)
+    if not pending:
+        return result
+
+    def count(warmed: bool) -> None:
+        if warmed:
+            result.warmed += 1
+        else:
+            result.failed += 1
+        if on_progress:
+            on_progress(result)
+
+    run_bounded(_warm_one, ((command, width) for command in pending), count, jobs=jobs)
+    return result
+
+
+def _warm_one(command: str, width: int) -> bool:
+    try:
+        ManParser(width=width).parse(command)
+    except Exception:
+        return False
+    return True
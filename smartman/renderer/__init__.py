@@ -1,4 +1,23 @@
-from .formatter import Formatter
-from .tui import SmartManApp
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .formatter import Formatter
+    from .tui import SmartManApp
 
 __all__ = ["Formatter", "SmartManApp"]
+
+
+def __getattr__(name: str):
+    # Resolved on first use so that importing the Rich formatter does not
+    # also pull in Textual.
+    if name == "Formatter":
+        from .formatter import Formatter
+
+        return Formatter
+    if name == "SmartManApp":
+        from .tui import SmartManApp
+
+        return SmartManApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,124 +1,206 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable
 
-from rich.console import Console
+from rich.cells import cell_len
+from rich.console import Console, ConsoleOptions, RenderResult
 from rich.padding import Padding
 from rich.panel import Panel
 from rich.rule import Rule
-from rich.syntax import Syntax
-from rich.text import Text
+from rich.segment import Segment
+from rich.style import Style
+from rich.table import Table
+from rich.text import Span, Text
 
 from smartman.parser.man_parser import ManPage
+from smartman.parser.options import OptionEntry, OptionTable
+from smartman.utils.themes import theme_styles
+from smartman.utils.trace import span
 
 
 FLAG_PATTERN = re.compile(r"(-{1,2}[a-zA-Z][\w-]*)")
 SYNOPSIS_CODE_PATTERN = re.compile(r"(`[^`]+`|\[[^\]]+\]|<[^>]+>)")
+BOLD = Style(bold=True)
+
+
+class SectionBlock:
+    """An indented section body, rendered as one renderable.
+
+    Produces the same output as printing ``Padding(line, (0, indent))`` for
+    each line, but builds the segments of every line that fits the width
+    straight from the Text's spans; only lines that have to wrap go through
+    Rich's layout.
+    """
+
+    def __init__(self, text: Text, indent: int) -> None:
+        self.text = text
+        self.indent = indent
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        text = self.text
+        plain = text.plain
+        if not plain:
+            return
+        width = options.max_width
+        available = width - 2 * self.indent
+        base = console.get_style(text.style)
+        styles: dict = {}
+        spans = sorted(text.spans, key=lambda span: span.start)
+        margin = Segment(" " * self.indent)
+        newline = Segment.line()
+
+        lines = plain.split("\n")
+        if len(lines) > 1 and not lines[-1]:
+            # Like Text.split: a trailing newline ends the last line rather than starting one.
+            lines.pop()
+
+        span_index = 0
+        line_start = 0
+        for line in lines:
+            line_end = line_start + len(line)
+            # Spans clipped to this line; a span running past the end of the
+            # line is kept for the next one.
+            pieces = []
+            while span_index < len(spans) and spans[span_index].start < line_end:
+                span = spans[span_index]
+                start, end = max(span.start, line_start), min(span.end, line_end)
+                if end > start:
+                    pieces.append((start, end, span.style))
+                if span.end > line_end:
+                    break
+                span_index += 1
+
+            cells = len(line) if line.isascii() else cell_len(line)
+            if cells > available or "\t" in line:
+                wrapped = Text(line, style=text.style, end="")
+                wrapped.spans = [Span(start - line_start, end - line_start, style) for start, end, style in pieces]
+                yield from console.render(Padding(wrapped, (0, self.indent)), options)
+            else:
+                yield margin
+                pos = line_start
+                for start, end, style_name in pieces:
+                    if start > pos:
+                        yield Segment(plain[pos:start], base)
+                    style = styles.get(style_name)
+                    if style is None:
+                        style = styles[style_name] = base + console.get_style(style_name)
+                    yield Segment(plain[start:end], style)
+                    pos = end
+                if pos < line_end:
+                    yield Segment(plain[pos:line_end], base)
+                yield Segment(" " * (width - self.indent - cells))
+                yield newline
+            line_start = line_end + 1
 
 
 class Formatter:
     """Rich-based formatter for man page sections."""
 
-    def __init__(self, theme: dict) -> None:
+    def __init__(self, theme: dict, console: Console | None = None) -> None:
         self.theme = theme
-        self.console = Console()
+        # Parsed once per theme (see smartman.utils.themes), not on every section.
+        self.styles = theme_styles(theme)
+        self.console = console or Console()
 
     def render_plain(self, page: ManPage) -> None:
         """Render the full man page to stdout using Rich markup."""
-        self._print_header(page.command)
+        with span("format.page"):
+            self._print_header(page.command)
 
-        for section_name, content in page.sections.items():
+            for section_name, content in page.sections.items():
+                self._print_section(section_name, content)
+
+    def render_stream(self, command: str, sections: Iterable[tuple[str, str]]) -> list[str]:
+        """Print sections as they are parsed; the header waits for the first one.
+
+        Returns the names of the sections printed.
+        """
+        printed = []
+        for section_name, content in sections:
+            if not printed:
+                self._print_header(command)
             self._print_section(section_name, content)
+            printed.append(section_name)
+        return printed
+
+    def render_search_hits(self, hits: list, snippets: list[str]) -> None:
+        """Print full-text search hits as a table, one matching line per page."""
+        table = Table(box=None, header_style="bold cyan", pad_edge=False, expand=True)
+        table.add_column("Page", style="bold yellow", no_wrap=True)
+        table.add_column("Section", style="blue", no_wrap=True)
+        table.add_column("Match", style="white", overflow="ellipsis", no_wrap=True, ratio=1)
+        for hit, snippet in zip(hits, snippets):
+            page = Text(f"{hit.name}({hit.section})")
+            if hit.aliases:
+                page.append(" " + " ".join(hit.aliases), style="dim")
+            table.add_row(page, hit.section_name, snippet)
+        self.console.print(table)
+
+    def render_options(self, table: OptionTable, entries: list[OptionEntry]) -> None:
+        """Print option entries on their own: the flag line, then its description."""
+        flag_style = self.styles["flag"]
+        argument_style = self.styles["synopsis"]
+        for entry in entries:
+            head = Text(", ".join(entry.flags), style=flag_style)
+            if entry.argument:
+                separator = "" if entry.argument.startswith("[") else " "
+                head.append(separator + entry.argument, style=argument_style)
+            self.console.print(Padding(head, (0, 2)))
+            self.console.print(SectionBlock(self.style_section("OPTIONS", table.describe(entry)), 6), crop=False)
+            self.console.print()
 
     def _print_header(self, command: str) -> None:
-        heading_style = self.theme.get("heading", "bold cyan")
-        accent = self.theme.get("accent", "cyan")
-
         self.console.print()
         self.console.print(
             Panel(
-                Text(f" {command.upper()} ", style=f"bold {heading_style}", justify="center"),
-                style=accent,
-                subtitle=f"[{self.theme.get('muted', 'dim white')}]smartman — modern man page viewer[/]",
+                Text(f" {command.upper()} ", style=BOLD + self.styles["heading"], justify="center"),
+                style=self.styles["accent"],
+                # A styled span rather than a Text style, so the padding around it stays in the border colour.
+                subtitle=Text.assemble(("smartman — modern man page viewer", self.styles["muted"])),
                 expand=True,
             )
         )
         self.console.print()
 
+    def style_section(self, name: str, content: str) -> Text:
+        """Style a whole section as one Text: alternating text and flag spans.
+
+        The spans come from a single ``finditer`` pass over the section, so no
+        per-line Text objects or string splitting is involved. The TUI uses
+        the same method for the lines it draws.
+        """
+        base = self.styles["synopsis" if name.upper() == "SYNOPSIS" else "description"]
+        flag_style = self.styles["flag"]
+        spans = []
+        pos = 0
+        for match in FLAG_PATTERN.finditer(content):
+            start, end = match.span()
+            if start > pos:
+                spans.append(Span(pos, start, base))
+            spans.append(Span(start, end, flag_style))
+            pos = end
+        if pos < len(content):
+            spans.append(Span(pos, len(content), base))
+        return Text(content, spans=spans, end="")
+
     def _print_section(self, name: str, content: str) -> None:
-        heading_style = self.theme.get("heading", "bold cyan")
-        border_style = self.theme.get("border", "blue")
+        with span("format.section", section=name):
+            self._render_section(name, content)
 
-        self.console.print(Rule(f"[{heading_style}]{name}[/]", style=border_style))
+    def _render_section(self, name: str, content: str) -> None:
+        self.console.print(Rule(Text.assemble((name, self.styles["heading"])), style=self.styles["border"]))
 
+        text = self.style_section(name, content)
         if name.upper() == "SYNOPSIS":
-            self._render_synopsis(content)
-        elif name.upper() == "OPTIONS":
-            self._render_options(content)
-        else:
-            self._render_body(content)
+            # The synopsis is followed by one extra blank line.
+            text.append("\n\n")
+        indent = 4 if name.upper() in ("SYNOPSIS", "OPTIONS") else 2
+        # Every row is already exactly the console width, so skip Rich's cropping pass.
+        self.console.print(SectionBlock(text, indent), crop=False)
 
         self.console.print()
 
-    def _render_synopsis(self, content: str) -> None:
-        synopsis_style = self.theme.get("synopsis", "italic bright_green")
-        flag_style = self.theme.get("flag", "bold yellow")
-        styled = Text()
-        for line in content.splitlines():
-            parts = FLAG_PATTERN.split(line)
-            for i, part in enumerate(parts):
-                if FLAG_PATTERN.match(part):
-                    styled.append(part, style=flag_style)
-                else:
-                    styled.append(part, style=synopsis_style)
-            styled.append("\n")
-        self.console.print(Padding(styled, (0, 4)))
-
-    def _render_options(self, content: str) -> None:
-        flag_style = self.theme.get("flag", "bold yellow")
-        desc_style = self.theme.get("description", "white")
-
-        for line in content.splitlines():
-            text = Text()
-            parts = FLAG_PATTERN.split(line)
-            for part in parts:
-                if FLAG_PATTERN.match(part):
-                    text.append(part, style=flag_style)
-                else:
-                    text.append(part, style=desc_style)
-            self.console.print(Padding(text, (0, 4)))
-
-    def _render_body(self, content: str) -> None:
-        desc_style = self.theme.get("description", "white")
-        flag_style = self.theme.get("flag", "bold yellow")
-        highlight_style = self.theme.get("highlight", "bold magenta")
-
-        for line in content.splitlines():
-            text = Text()
-            parts = FLAG_PATTERN.split(line)
-            for part in parts:
-                if FLAG_PATTERN.match(part):
-                    text.append(part, style=flag_style)
-                else:
-                    text.append(part, style=desc_style)
-            self.console.print(Padding(text, (0, 2)))
-
     def format_section_as_markup(self, name: str, content: str) -> str:
         """Return a section formatted as Rich markup string (used by TUI)."""
-        lines = [f"[bold cyan]{name}[/]", ""]
-        flag_open = f"[{self.theme.get('flag', 'bold yellow')}]"
-        flag_close = "[/]"
-        desc = self.theme.get("description", "white")
-
-        for line in content.splitlines():
-            parts = FLAG_PATTERN.split(line)
-            out = ""
-            for part in parts:
-                if FLAG_PATTERN.match(part):
-                    out += f"[bold yellow]{part}[/bold yellow]"
-                else:
-                    escaped = part.replace("[", r"\[")
-                    out += f"[{desc}]{escaped}[/{desc}]"
-            lines.append(out)
-
-        return "\n".join(lines)
+        return f"[bold cyan]{name}[/]\n\n" + self.style_section(name, content).markup
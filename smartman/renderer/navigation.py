@@ -0,0 +1,156 @@
+"""Moving between pages in the TUI: history, recently read pages and prefetching.
+
+Following a SEE ALSO link should not mean waiting for ``man`` again.
+Finished pages are kept in :class:`PageLRU`, bounded by an estimate of the
+memory they hold. While a page is being read, :class:`Prefetcher` fetches
+the pages it refers to on a small thread pool, so that most links open
+from memory.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from smartman.parser.man_parser import ManPage, ManParser
+
+
+# Memory the LRU may hold, estimated from page text and the entries indexing it.
+PAGE_LRU_BYTES = 64 * 1024 * 1024
+# Rough cost of one section span or option entry (tuple, dataclass, dict slots).
+ENTRY_OVERHEAD = 200
+PREFETCH_WORKERS = 2
+# Only the first references of a page are prefetched; long SEE ALSO lists
+# (bash, perl) would otherwise keep the pool busy with pages nobody opens.
+PREFETCH_LIMIT = 8
+
+
+def page_size(page: ManPage) -> int:
+    """Estimated bytes held by ``page``."""
+    return sys.getsizeof(page.raw_text) + ENTRY_OVERHEAD * (len(page.spans) + len(page.options.entries))
+
+
+class PageLRU:
+    """Parsed pages by command, least recently used dropped first once over ``max_bytes``.
+
+    Safe to use from the prefetch threads and the app's loop at once.
+    """
+
+    def __init__(self, max_bytes: int = PAGE_LRU_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._pages: OrderedDict[str, tuple[ManPage, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __contains__(self, command: object) -> bool:
+        return command in self._pages
+
+    def get(self, command: str) -> ManPage | None:
+        with self._lock:
+            item = self._pages.get(command)
+            if item is None:
+                return None
+            self._pages.move_to_end(command)
+            return item[0]
+
+    def put(self, command: str, page: ManPage) -> None:
+        size = page_size(page)
+        with self._lock:
+            old = self._pages.pop(command, None)
+            if old is not None:
+                self.size -= old[1]
+            self._pages[command] = (page, size)
+            self.size += size
+            # The newest page is kept even when it alone is over the limit.
+            while self.size > self.max_bytes and len(self._pages) > 1:
+                _, (_, dropped) = self._pages.popitem(last=False)
+                self.size -= dropped
+
+
+class PageHistory:
+    """Back and forward stacks of the pages shown in one tab, like a browser's."""
+
+    def __init__(self, command: str) -> None:
+        self.current = command
+        self._back: list[str] = []
+        self._forward: list[str] = []
+
+    @property
+    def can_go_back(self) -> bool:
+        return bool(self._back)
+
+    def visit(self, command: str) -> None:
+        if command == self.current:
+            return
+        self._back.append(self.current)
+        self._forward.clear()
+        self.current = command
+
+    def back(self) -> str | None:
+        if not self._back:
+            return None
+        self._forward.append(self.current)
+        self.current = self._back.pop()
+        return self.current
+
+    def forward(self) -> str | None:
+        if not self._forward:
+            return None
+        self._back.append(self.current)
+        self.current = self._forward.pop()
+        return self.current
+
+
+class Prefetcher:
+    """Fetches referenced pages into a :class:`PageLRU` before they are asked for."""
+
+    def __init__(self, parser: ManParser, pages: PageLRU, workers: int = PREFETCH_WORKERS) -> None:
+        self.parser = parser
+        self.pages = pages
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smartman-prefetch")
+        self._pending: dict[str, Future] = {}
+        # Reentrant: a fetch that is already done runs its callback inside prefetch().
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def prefetch(self, commands: Iterable[str]) -> None:
+        """Queue the first ``PREFETCH_LIMIT`` of ``commands``, skipping pages already loaded or queued."""
+        queued = 0
+        with self._lock:
+            if self._closed:
+                return
+            for command in commands:
+                if queued >= PREFETCH_LIMIT:
+                    break
+                queued += 1
+                if command in self.pages or command in self._pending:
+                    continue
+                future = self._executor.submit(self._fetch, command)
+                self._pending[command] = future
+                future.add_done_callback(lambda _, command=command: self._done(command))
+
+    def pending(self, command: str) -> Future | None:
+        """The prefetch of ``command`` still under way, if any; its result is the page."""
+        with self._lock:
+            return self._pending.get(command)
+
+    def shutdown(self) -> None:
+        # Queued pages are not needed any more; running fetches finish on their own.
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, command: str) -> ManPage:
+        page = self.parser.parse(command)
+        self.pages.put(command, page)
+        return page
+
+    def _done(self, command: str) -> None:
+        with self._lock:
+            self._pending.pop(command, None)
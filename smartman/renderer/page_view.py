@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+
+from rich.rule import Rule
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
+
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from smartman.parser.man_parser import ManPage, find_page_links
+from smartman.renderer.formatter import Formatter
+from smartman.utils.themes import theme_styles
+
+
+SEARCH_STYLE = "bold white on magenta"
+CURRENT_MATCH_STYLE = "bold black on yellow"
+LINK_STYLE = Style(underline=True)
+CURRENT_LINK_STYLE = Style(underline=True, reverse=True)
+# Sections whose page references become links.
+LINK_SECTIONS = {"SEE ALSO"}
+LEFT_MARGIN = 3
+TOP_MARGIN = 1
+SECTION_GAP = 2
+STRIP_CACHE_SIZE = 1024
+
+HEADING, SPACER, BODY = "heading", "spacer", "body"
+
+
+class ManPageView(ScrollView, can_focus=True):
+    """Virtualized man page body built on Textual's line API.
+
+    The page is kept as a flat list of plain text lines; only the lines that
+    scroll into the viewport are styled, and their strips are memoized in a
+    small LRU. Section headings are plain line offsets, so jumping to a
+    section is a scroll, not a widget lookup. Page references in SEE ALSO
+    are links: clicking one runs the app's ``follow_link`` action.
+    """
+
+    DEFAULT_CSS = """
+    ManPageView {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, theme: dict, *, id: str | None = None, classes: str | None = None) -> None:
+        super().__init__(id=id, classes=classes)
+        self.theme_data = theme
+        self.formatter = Formatter(theme)
+        self._strips: LRUCache[tuple[int, int], Strip] = LRUCache(STRIP_CACHE_SIZE)
+        self._theme_styles = theme_styles(theme)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.anchors: dict[str, int] = {}
+        self._lines: list[tuple[str, str, str]] = [(SPACER, "", "")] * TOP_MARGIN
+        self._text_width = 0
+        self._query = ""
+        # Lowercased body text joined into one string, plus the offset of each
+        # line in it; built on the first search and dropped when lines change.
+        self._search_text: str | None = None
+        self._search_starts: list[int] = []
+        self._search_rows: list[int] = []
+        self.matches: list[tuple[int, int]] = []
+        self._match_columns: dict[int, list[int]] = {}
+        self.current_match = -1
+        # (row, start, end, "name(section)") of every link, in page order.
+        self.links: list[tuple[int, int, int, str]] = []
+        self._link_columns: dict[int, list[tuple[int, int, str]]] = {}
+        self.current_link = -1
+        self._strips.clear()
+
+    # -- content --------------------------------------------------------------
+
+    def clear(self) -> None:
+        """Drop every section, to show another page in the same view."""
+        self._reset()
+        self.scroll_to(0, 0, animate=False)
+        self._update_virtual_size()
+        self.refresh()
+
+    def load_page(self, page: ManPage) -> None:
+        for name, content in page.sections.items():
+            self.add_section(name, content)
+
+    def add_section(self, name: str, content: str) -> None:
+        """Append a section; the view can be scrolled while more are added."""
+        self.anchors.setdefault(name.upper(), len(self._lines))
+        self._lines.append((HEADING, name, name))
+        self._lines.append((SPACER, name, ""))
+        linked = name.upper() in LINK_SECTIONS
+        for line in content.splitlines():
+            if linked:
+                self._add_links(len(self._lines), line)
+            self._lines.append((BODY, name, line))
+            self._text_width = max(self._text_width, len(line))
+        self._lines.extend([(SPACER, name, "")] * SECTION_GAP)
+        self._search_text = None
+        self._update_virtual_size()
+        self.refresh()
+
+    def _add_links(self, row: int, line: str) -> None:
+        for start, end, target in find_page_links(line):
+            self.links.append((row, start, end, target))
+            self._link_columns.setdefault(row, []).append((start, end, target))
+
+    def select_link(self, index: int) -> str | None:
+        """Make link ``index`` current (wrapping around), scroll to it and return its target."""
+        if not self.links:
+            return None
+        index %= len(self.links)
+        rows = {self.links[index][0]}
+        if self.current_link >= 0:
+            rows.add(self.links[self.current_link][0])
+        self.current_link = index
+        self._invalidate(rows)
+        row = self.links[index][0]
+        if not self.scroll_offset.y <= row < self.scroll_offset.y + self.size.height:
+            self.scroll_to(y=max(0, row - self.size.height // 3), animate=False)
+        return self.links[index][3]
+
+    @property
+    def link_target(self) -> str | None:
+        """Target of the current link, if one is selected."""
+        return self.links[self.current_link][3] if self.current_link >= 0 else None
+
+    def jump_to(self, section: str, animate: bool = True) -> bool:
+        anchor = self.anchors.get(section.upper())
+        if anchor is None:
+            return False
+        self.scroll_to(y=anchor, animate=animate)
+        return True
+
+    def set_highlight(self, query: str) -> int:
+        """Highlight every occurrence of ``query``; returns the number of matches.
+
+        Only lines whose set of matches changed are re-rendered. Sections
+        added since the last search are searched again for the same query.
+        """
+        needle = query.lower()
+        if needle == self._query.lower() and (self._search_text is not None or not needle):
+            return len(self.matches)
+
+        matches = self._find_all(needle) if needle else []
+
+        columns: dict[int, list[int]] = {}
+        for row, col in matches:
+            columns.setdefault(row, []).append(col)
+        if len(needle) == len(self._query):
+            stale = {row for row, cols in self._match_columns.items() if columns.get(row) != cols}
+            stale.update(row for row in columns if row not in self._match_columns)
+        else:
+            stale = self._match_columns.keys() | columns.keys()
+
+        self._query = query
+        self.matches = matches
+        self._match_columns = columns
+        self.current_match = -1
+        self._invalidate(stale)
+        return len(matches)
+
+    def select_match(self, index: int) -> None:
+        """Make match ``index`` current (wrapping around) and scroll it into view."""
+        if not self.matches:
+            return
+        index %= len(self.matches)
+        rows = {self.matches[index][0]}
+        if self.current_match >= 0:
+            rows.add(self.matches[self.current_match][0])
+        self.current_match = index
+        self._invalidate(rows)
+        row = self.matches[index][0]
+        if not self.scroll_offset.y <= row < self.scroll_offset.y + self.size.height:
+            self.scroll_to(y=max(0, row - self.size.height // 3), animate=False)
+
+    def first_match_below(self, row: int) -> int:
+        """Index of the first match at or below ``row``, wrapping to the top."""
+        index = bisect_right(self.matches, (row, -1))
+        return index if index < len(self.matches) else 0
+
+    def _search_index(self) -> tuple[str, list[int]]:
+        if self._search_text is None:
+            rows, starts, parts = [], [], []
+            offset = 0
+            for row, (kind, _section, text) in enumerate(self._lines):
+                if kind != BODY:
+                    continue
+                rows.append(row)
+                starts.append(offset)
+                lowered = text.lower()
+                parts.append(lowered)
+                offset += len(lowered) + 1
+            self._search_rows = rows
+            self._search_starts = starts
+            self._search_text = "\n".join(parts)
+        return self._search_text, self._search_starts
+
+    def _find_all(self, needle: str) -> list[tuple[int, int]]:
+        text, starts = self._search_index()
+        rows = self._search_rows
+        matches = []
+        find = text.find
+        last = len(starts) - 1
+        line = 0
+        pos = find(needle)
+        while pos != -1:
+            # Matches come in text order, so the owning line only moves forward.
+            while line < last and starts[line + 1] <= pos:
+                line += 1
+            matches.append((rows[line], pos - starts[line]))
+            pos = find(needle, pos + len(needle))
+        return matches
+
+    def _invalidate(self, rows) -> None:
+        for key in list(self._strips.keys()):
+            if key[0] in rows:
+                self._strips.discard(key)
+        self.refresh()
+
+    def _update_virtual_size(self) -> None:
+        self.virtual_size = Size(self._text_width + 2 * LEFT_MARGIN, len(self._lines))
+
+    def on_resize(self) -> None:
+        # Heading rules span the view, so cached strips depend on its width.
+        self._strips.clear()
+
+    # -- rendering ------------------------------------------------------------
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        if index >= len(self._lines):
+            return Strip.blank(width, self.rich_style)
+
+        content_width = max(self._text_width, width - 2 * LEFT_MARGIN)
+        key = (index, content_width)
+        strip = self._strips.get(key)
+        if strip is None:
+            strip = self._render_strip(index, content_width)
+            self._strips[key] = strip
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style)
+
+    def _render_strip(self, row: int, content_width: int) -> Strip:
+        kind, section, text = self._lines[row]
+        margin = Segment(" " * LEFT_MARGIN)
+        if kind == SPACER:
+            return Strip([margin], LEFT_MARGIN)
+
+        console = self.app.console
+        if kind == HEADING:
+            rule = Rule(Text(text, style=self._theme_styles["heading"]), style=self._theme_styles["border"])
+            options = console.options.update_width(content_width)
+            segments = console.render_lines(rule, options, pad=False)[0]
+        else:
+            segments = list(self._style_body(row, section, text).render(console))
+        return Strip([margin, *segments])
+
+    def _style_body(self, row: int, section: str, line: str) -> Text:
+        text = self.formatter.style_section(section, line)
+        links = self._link_columns.get(row)
+        if links:
+            current = self.links[self.current_link] if self.current_link >= 0 else None
+            for start, end, target in links:
+                style = CURRENT_LINK_STYLE if current == (row, start, end, target) else LINK_STYLE
+                text.stylize(style + Style(meta={"@click": f"app.follow_link({target!r})"}), start, end)
+        columns = self._match_columns.get(row)
+        if columns:
+            size = len(self._query)
+            current = self.matches[self.current_match] if self.current_match >= 0 else None
+            for col in columns:
+                style = CURRENT_MATCH_STYLE if current == (row, col) else SEARCH_STYLE
+                text.stylize(style, col, col + size)
+        return text
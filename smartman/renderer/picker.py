@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from rich.text import Text
+
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.widgets import Footer, Input, OptionList, Static
+from textual.widgets.option_list import Option
+from textual.worker import Worker, WorkerState
+
+from smartman.index.finder import FinderHit, FinderIndex, open_finder_index
+
+
+# Matches listed at once; more would only scroll off screen.
+PICKER_RESULTS = 50
+
+
+class PagePicker(App[str]):
+    """Find a page by typing part of its name or of what it does.
+
+    Every keystroke ranks all installed pages through the finder index
+    (names and NAME descriptions). Enter returns the highlighted page as
+    ``name(section)``; Escape returns ``None``.
+    """
+
+    TITLE = "SmartMan"
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel", show=True),
+        Binding("enter", "choose", "Open", show=True),
+        Binding("down", "move(1)", "Next", show=False),
+        Binding("up", "move(-1)", "Previous", show=False),
+        Binding("pagedown", "move(10)", "Page Down", show=False),
+        Binding("pageup", "move(-10)", "Page Up", show=False),
+    ]
+
+    CSS = """
+    Screen {
+        background: #0d1117;
+    }
+
+    #query {
+        border: tall $accent;
+        margin: 1 2 0 2;
+    }
+
+    #status {
+        color: $text-muted;
+        text-style: italic;
+        padding: 0 3;
+    }
+
+    #matches {
+        height: 1fr;
+        border: none;
+        margin: 0 2;
+        background: transparent;
+    }
+    """
+
+    def __init__(self, query: str = "") -> None:
+        super().__init__()
+        self.initial_query = query
+        self.index: FinderIndex | None = None
+        self.hits: list[FinderHit] = []
+
+    def compose(self) -> ComposeResult:
+        yield Input(value=self.initial_query, placeholder="Page name or what it does…", id="query")
+        yield Static("Indexing man pages…", id="status")
+        yield OptionList(id="matches")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        # The first run reads every page's NAME section; later runs only open the index.
+        self.run_worker(open_finder_index, thread=True, name="finder-index")
+
+    def on_unmount(self) -> None:
+        if self.index is not None:
+            self.index.close()
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        if event.worker.name != "finder-index" or event.state not in (WorkerState.SUCCESS, WorkerState.ERROR):
+            return
+        self.index = event.worker.result if event.state == WorkerState.SUCCESS else None
+        if self.index is None:
+            self.query_one("#status", Static).update("Could not build the page index.")
+            return
+        self._search(self.query_one("#query", Input).value)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if self.index is not None:
+            self._search(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        self.action_choose()
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        self.exit(self.hits[event.option_index].reference)
+
+    def action_move(self, step: int) -> None:
+        matches = self.query_one("#matches", OptionList)
+        if not self.hits:
+            return
+        current = matches.highlighted if matches.highlighted is not None else 0
+        matches.highlighted = max(0, min(len(self.hits) - 1, current + step))
+
+    def action_choose(self) -> None:
+        highlighted = self.query_one("#matches", OptionList).highlighted
+        if self.hits and highlighted is not None:
+            self.exit(self.hits[highlighted].reference)
+
+    def action_cancel(self) -> None:
+        self.exit(None)
+
+    def _search(self, query: str) -> None:
+        self.hits = self.index.find(query, limit=PICKER_RESULTS) if query.strip() else []
+        matches = self.query_one("#matches", OptionList)
+        matches.clear_options()
+        matches.add_options(Option(_hit_label(hit)) for hit in self.hits)
+        if self.hits:
+            matches.highlighted = 0
+        status = self.query_one("#status", Static)
+        if not query.strip():
+            status.update(f"{len(self.index)} pages — type to search")
+        elif not self.hits:
+            status.update("No matching pages")
+        else:
+            status.update("")
+
+
+def _hit_label(hit: FinderHit) -> Text:
+    return Text.assemble((hit.name, "bold cyan"), (f"({hit.section})", "cyan"), ("  " + hit.description, "dim"))
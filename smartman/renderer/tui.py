@@ -1,20 +1,30 @@
 from __future__ import annotations
 
-import re
-from rich.console import Group
-from rich.rule import Rule
+import threading
+from functools import partial
+
 from rich.text import Text
-from rich.panel import Panel
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.containers import Container, Horizontal, Vertical, VerticalScroll
-from textual.css.query import NoMatches
-from textual.widgets import Footer, Header, Label, ListItem, ListView, Static, Input
+from textual.containers import Container, Horizontal, Vertical
+from textual.message import Message
+from textual.widgets import Footer, Header, Label, ListItem, ListView, Static, Input, TabbedContent, TabPane
 from textual.reactive import reactive
+from textual.timer import Timer
+from textual.worker import Worker, WorkerCancelled, get_current_worker
 
-from smartman.parser.man_parser import ManPage
+from smartman.parser.man_parser import FETCH_WORKERS, ManPage, ManPageNotFoundError, ManParser
 from smartman.renderer.formatter import Formatter
+from smartman.renderer.navigation import PageHistory, PageLRU, Prefetcher
+from smartman.renderer.page_view import ManPageView
+from smartman.utils import trace
+
+
+# Seconds of typing inactivity before the search box re-runs the query.
+SEARCH_DEBOUNCE = 0.12
+# Seconds a page has been on screen before the pages it refers to are prefetched.
+PREFETCH_DELAY = 0.5
 
 
 class QuickExampleCard(Static):
@@ -50,8 +60,155 @@ class QuickExampleCard(Static):
         return f"[i dim]{self.desc}[/]\n\n[b cyan]> {self.cmd}[/]"
 
 
+class SectionLoaded(Message):
+    """One section of a page that is still being fetched is complete."""
+
+    def __init__(self, pane: PagePane, generation: int, name: str, body: str) -> None:
+        super().__init__()
+        self.pane = pane
+        self.generation = generation
+        self.name = name
+        self.body = body
+
+
+class PageLoaded(Message):
+    """A page fetched by a worker is complete (or failed)."""
+
+    def __init__(
+        self,
+        pane: PagePane,
+        generation: int,
+        page: ManPage | None,
+        error: BaseException | None = None,
+        suggestion: str | None = None,
+    ) -> None:
+        super().__init__()
+        self.pane = pane
+        self.generation = generation
+        self.page = page
+        self.error = error
+        # "Did you mean ...?" for a page that does not exist.
+        self.suggestion = suggestion
+
+
+class PagePane(Horizontal):
+    """Sidebar, example gallery and page body for one man page (one tab)."""
+
+    def __init__(self, command: str, theme: dict) -> None:
+        super().__init__(classes="layout")
+        self.command = command
+        self.theme_data = theme
+        self.page: ManPage | None = None
+        self._shown: set[str] = set()
+        # Bumped by reset(); a fetch tags its messages with the generation it was started for.
+        self.generation = 0
+        self.fetch_worker: Worker | None = None
+
+    def compose(self) -> ComposeResult:
+        with Container(classes="sidebar"):
+            yield Static(f" 📖 {self.command.upper()}", classes="sidebar-title")
+            yield ListView(classes="section-list")
+
+        with Vertical(classes="content-area"):
+            with Container(classes="gallery"):
+                yield Label("✨ QUICK-WIN EXAMPLES", classes="gallery-label")
+                yield Horizontal(classes="gallery-container gallery-cards")
+            yield Static(f"Loading manual for {self.command}...", classes="page-status")
+            yield ManPageView(self.theme_data, classes="main-scroll")
+
+    @property
+    def view(self) -> ManPageView:
+        return self.query_one(ManPageView)
+
+    def show_page(self, page: ManPage) -> None:
+        """Show a finished page; sections already added by :meth:`add_section` are kept."""
+        self.page = page
+        self.query_one(".page-status", Static).display = False
+
+        # 1. Populating Gallery
+        examples = page.get_quick_examples()
+        if examples:
+            self.query_one(".gallery").add_class("has-examples")
+            cards_container = self.query_one(".gallery-cards")
+            for ex in examples:
+                cards_container.mount(QuickExampleCard(ex["desc"], ex["cmd"]))
+
+        # 2. Populating Sections
+        for section_name, content in page.sections.items():
+            if section_name not in self._shown:
+                self.add_section(section_name, content)
+
+    def add_section(self, name: str, content: str) -> None:
+        """Append one section to the sidebar and the page body, while the rest is still loading."""
+        if not self._shown:
+            self.query_one(".page-status", Static).display = False
+        self._shown.add(name)
+        safe_name = name.replace(' ', '_')
+        item = ListItem(
+            Label(f" {name}", classes="section-label"),
+            id=f"nav-{safe_name}",
+        )
+        self.query_one(".section-list", ListView).append(item)
+        self.view.add_section(name, content)
+
+    async def reset(self, command: str) -> None:
+        """Empty the pane to show ``command`` instead; messages for the old page are ignored."""
+        if self.fetch_worker is not None:
+            # Stops man at the next section of the page being left.
+            self.fetch_worker.cancel()
+            self.fetch_worker = None
+        self.command = command
+        self.page = None
+        self._shown = set()
+        self.generation += 1
+        self.query_one(".sidebar-title", Static).update(f" 📖 {command.upper()}")
+        self.query_one(".gallery").remove_class("has-examples")
+        status = self.query_one(".page-status", Static)
+        status.remove_class("error")
+        status.update(f"Loading manual for {command}...")
+        status.display = True
+        self.view.clear()
+        await self.query_one(".section-list", ListView).clear()
+        await self.query_one(".gallery-cards").remove_children()
+
+    def show_error(self, message: str) -> None:
+        status = self.query_one(".page-status", Static)
+        status.display = True
+        status.add_class("error")
+        status.update(message)
+
+    def jump_to(self, section: str) -> bool:
+        """Scroll to ``section`` and select it in the sidebar."""
+        if not self.view.jump_to(section):
+            return False
+        target_id = f"nav-{section.replace(' ', '_')}"
+        sidebar = self.query_one(".section-list", ListView)
+        for i, item in enumerate(sidebar.query(ListItem)):
+            if item.id == target_id:
+                sidebar.index = i
+                break
+        return True
+
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        event.stop()
+        if event.item and event.item.id:
+            section_name = event.item.id.replace("nav-", "").replace("_", " ").upper()
+            self.view.jump_to(section_name)
+
+
 class SmartManApp(App):
-    """Textual TUI application for SmartMan."""
+    """Textual TUI application for SmartMan.
+
+    The app opens at once with an empty layout. Pages not passed in are
+    fetched by thread workers after it starts, and each page's sections
+    appear one by one as ``man`` produces them. With several commands
+    each page gets a tab.
+
+    SEE ALSO references are links. Following one replaces the page in the
+    current tab, which keeps a back/forward history. Pages read recently
+    are kept in a :class:`PageLRU`. The pages a page refers to are
+    prefetched into it while it is being read.
+    """
 
     TITLE = "SmartMan"
     BINDINGS = [
@@ -67,6 +224,15 @@ class SmartManApp(App):
         Binding("e", "jump_section('EXAMPLES')", "EXAMPLES", show=True),
         Binding("/", "toggle_search", "Search", show=True),
         Binding("escape", "hide_search", "Close Search", show=False),
+        Binding("ctrl+n,f3", "next_match", "Next Match", show=False),
+        Binding("ctrl+b,shift+f3", "previous_match", "Previous Match", show=False),
+        Binding("l", "next_link(1)", "Next Link", show=False),
+        Binding("L", "next_link(-1)", "Previous Link", show=False),
+        Binding("enter", "follow_link", "Follow Link", show=False),
+        Binding("backspace,alt+left", "history_back", "Back", show=False),
+        Binding("alt+right", "history_forward", "Forward", show=False),
+        Binding("right_square_bracket", "switch_tab(1)", "Next Page", show=False),
+        Binding("left_square_bracket", "switch_tab(-1)", "Previous Page", show=False),
         Binding("?", "toggle_help", "Help", show=False),
     ]
 
@@ -86,18 +252,35 @@ class SmartManApp(App):
         color: $text-muted;
     }
 
-    #layout {
+    #pages {
+        height: 1fr;
+    }
+
+    #pages.single ContentTabs {
+        display: none;
+    }
+
+    #pages ContentSwitcher {
+        height: 1fr;
+    }
+
+    #pages TabPane {
+        height: 1fr;
+        padding: 0;
+    }
+
+    .layout {
         layout: horizontal;
         height: 1fr;
     }
 
-    #sidebar {
+    .sidebar {
         width: 22;
         border-right: solid $accent;
         background: $surface;
     }
 
-    #sidebar-title {
+    .sidebar-title {
         width: 22;
         text-align: center;
         background: $accent 30%;
@@ -107,7 +290,7 @@ class SmartManApp(App):
         border-bottom: solid $accent;
     }
 
-    #section-list {
+    .section-list {
         background: transparent;
         border: none;
     }
@@ -122,16 +305,26 @@ class SmartManApp(App):
         background: $accent 10%;
     }
 
-    #content-area {
+    .content-area {
         height: 1fr;
     }
 
-    #main-scroll {
+    .main-scroll {
         height: 1fr;
+    }
+
+    .page-status {
+        color: $text-muted;
+        text-style: italic;
         padding: 1 3;
     }
 
-    #gallery {
+    .page-status.error {
+        color: $error;
+        text-style: bold;
+    }
+
+    .gallery {
         height: auto;
         margin: 1 0;
         padding: 1 0;
@@ -139,11 +332,11 @@ class SmartManApp(App):
         display: none;
     }
 
-    #gallery.has-examples {
+    .gallery.has-examples {
         display: block;
     }
 
-    #gallery-label {
+    .gallery-label {
         color: $accent;
         text-style: bold italic;
         margin-left: 2;
@@ -156,15 +349,6 @@ class SmartManApp(App):
         overflow-x: auto;
     }
 
-    .man-section {
-        margin-bottom: 2;
-    }
-
-    .section-content {
-        padding-left: 4;
-        color: $text;
-    }
-
     #search-bar {
         display: none;
         height: 3;
@@ -172,7 +356,6 @@ class SmartManApp(App):
         border: tall $accent;
         padding: 0 1;
         margin: 0 1;
-        dock: bottom;
     }
 
     #search-bar.visible {
@@ -184,129 +367,293 @@ class SmartManApp(App):
         border: none;
         background: transparent;
     }
+
+    #search-count {
+        width: auto;
+        color: $text-muted;
+        padding: 0 1;
+    }
     """
 
     show_search = reactive(False)
 
-    def __init__(self, page: ManPage, theme: dict) -> None:
+    def __init__(
+        self,
+        page: ManPage | None,
+        theme: dict,
+        commands: list[str] | None = None,
+        parser: ManParser | None = None,
+    ) -> None:
+        """Show ``page``, or fetch each of ``commands`` (``page``, if given, is the first).
+
+        A single command whose page does not exist closes the app again,
+        with the error as its exit message and return code 1. A missing
+        page reached through a link is only reported in its tab.
+        """
         super().__init__()
-        self.page = page
+        self.commands = commands or [page.command]
+        self.pages: list[ManPage | None] = [page] + [None] * (len(self.commands) - 1)
+        self.histories = [PageHistory(command) for command in self.commands]
+        self.recent = PageLRU()
+        self.parser = parser
+        self._prefetcher: Prefetcher | None = None
         self.theme_data = theme
         self.formatter = Formatter(theme)
-        self._section_widgets: dict[str, Static] = {}
+        self._fetch_slots = threading.BoundedSemaphore(FETCH_WORKERS)
+        self._first_section = False
         self._last_search = ""
+        self._search_timer: Timer | None = None
+        self._search_origin = 0
+        self._trace_start = trace.now()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
 
-        with Horizontal(id="layout"):
-            with Container(id="sidebar"):
-                yield Static(f" 📖 {self.page.command.upper()}", id="sidebar-title")
-                sidebar = ListView(id="section-list")
-                yield sidebar
-
-            with Vertical(id="content-area"):
-                with Container(id="gallery"):
-                    yield Label("✨ QUICK-WIN EXAMPLES", id="gallery-label")
-                    with Horizontal(classes="gallery-container", id="gallery-cards"):
-                        pass
-                
-                with VerticalScroll(id="main-scroll"):
-                    pass
-                
-                with Horizontal(id="search-bar"):
-                    yield Label("🔍 ", id="search-icon")
-                    yield Input(placeholder="Search keywords...", id="search-input")
+        with TabbedContent(id="pages", classes="single" if len(self.commands) == 1 else None):
+            for i, command in enumerate(self.commands):
+                with TabPane(command, id=f"page-{i}"):
+                    yield PagePane(command, self.theme_data)
+
+        with Horizontal(id="search-bar"):
+            yield Label("🔍 ", id="search-icon")
+            yield Input(placeholder="Search keywords...", id="search-input")
+            yield Label("", id="search-count")
 
         yield Footer()
 
     def on_mount(self) -> None:
-        self.title = f"SmartMan — {self.page.command}"
+        with trace.span("tui.mount"):
+            self._populate()
+        self.call_after_refresh(trace.record, "tui.first_paint", self._trace_start)
+
+    def _populate(self) -> None:
+        self._update_title()
         self.sub_title = "Press / to search | q to quit"
+        if len(self.commands) > 1:
+            self.sub_title = "Press / to search | [ ] to switch pages | q to quit"
+
+        for pane, page in zip(self._panes(), self.pages):
+            if page is None:
+                self._fetch(pane)
+            else:
+                pane.show_page(page)
+                self._page_ready(pane, page)
+        self._view().focus()
+
+    def on_unmount(self) -> None:
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown()
+
+    def _page_parser(self) -> ManParser:
+        if self.parser is None:
+            self.parser = ManParser()
+        return self.parser
+
+    def _fetch(self, pane: PagePane) -> None:
+        pane.fetch_worker = self.run_worker(
+            partial(self._load, self._page_parser(), pane),
+            name=f"fetch {pane.command}",
+            group="fetch",
+            thread=True,
+        )
 
-        sidebar = self.query_one("#section-list", ListView)
-        content_container = self.query_one("#main-scroll", VerticalScroll)
+    def _load(self, parser: ManParser, pane: PagePane) -> None:
+        """Fetch one page on a worker thread, posting each section as it is complete."""
+        worker = get_current_worker()
+        command = pane.command
+        generation = pane.generation
 
-        # 1. Populating Gallery
-        examples = self.page.get_quick_examples()
-        if examples:
-            gallery = self.query_one("#gallery")
-            gallery.add_class("has-examples")
-            cards_container = self.query_one("#gallery-cards")
-            for ex in examples:
-                cards_container.mount(QuickExampleCard(ex["desc"], ex["cmd"]))
+        prefetched = self._prefetcher.pending(command) if self._prefetcher is not None else None
+        if prefetched is not None:
+            # A link followed while its page is being prefetched: wait for that fetch.
+            try:
+                self.post_message(PageLoaded(pane, generation, prefetched.result()))
+                return
+            except Exception:
+                pass
 
-        # 2. Populating Sections
-        for section_name, content in self.page.sections.items():
-            safe_name = section_name.replace(' ', '_')
-            item = ListItem(
-                Label(f" {section_name}", classes="section-label"),
-                id=f"nav-{safe_name}",
-            )
-            sidebar.append(item)
-
-            section_widget = self._create_section_widget(section_name, content)
-            self._section_widgets[section_name.upper()] = section_widget
-            content_container.mount(section_widget)
-
-    def _get_section_renderable(self, name: str, content: str, highlight_query: str = "") -> Group:
-        """Generate the renderable Group for a section, with optional highlights."""
-        heading_style = self.theme_data.get("heading", "bold cyan")
-        flag_style = self.theme_data.get("flag", "bold yellow")
-        desc_style = self.theme_data.get("description", "white")
-        synopsis_style = self.theme_data.get("synopsis", "italic bright_green")
-        border_style = self.theme_data.get("border", "blue")
-        search_style = "bold white on magenta"
-        
-        FLAG_PAT = re.compile(r"(-{1,2}[a-zA-Z][\w-]*)")
-
-        renderables = []
-        renderables.append(Rule(f"[{heading_style}]{name}[/]", style=border_style))
-        renderables.append(Text("")) # Spacer
-
-        for line in content.splitlines():
-            text = Text()
-            parts = FLAG_PAT.split(line)
-            for part in parts:
-                if FLAG_PAT.match(part):
-                    style = flag_style
-                elif name.upper() == "SYNOPSIS":
-                    style = synopsis_style
-                else:
-                    style = desc_style
-                
-                # Apply search highlighting if query exists
-                if highlight_query and highlight_query.lower() in part.lower():
-                    # Simple split-and-style for search
-                    search_parts = re.split(f"({re.escape(highlight_query)})", part, flags=re.IGNORECASE)
-                    for s_part in search_parts:
-                        if s_part.lower() == highlight_query.lower():
-                            text.append(s_part, style=search_style)
-                        else:
-                            text.append(s_part, style=style)
-                else:
-                    text.append(part, style=style)
-            renderables.append(text)
-
-        return Group(*renderables)
-
-    def _create_section_widget(self, name: str, content: str, highlight_query: str = "") -> Static:
-        """Create a styled Static widget for a man page section."""
-        renderable = self._get_section_renderable(name, content, highlight_query)
-        return Static(renderable, classes="man-section", id=f"section-{name.replace(' ', '_')}")
+        def deliver(name: str, body: str) -> None:
+            # Quitting cancels the worker; raising here stops man mid-page.
+            if worker.is_cancelled:
+                raise WorkerCancelled(command)
+            self.post_message(SectionLoaded(pane, generation, name, body))
+
+        # At most FETCH_WORKERS pages are fetched at once; the rest wait their turn.
+        with self._fetch_slots:
+            if worker.is_cancelled:
+                return
+            try:
+                with trace.span("tui.fetch", command=command):
+                    page = parser.parse(command, on_section=deliver)
+            except WorkerCancelled:
+                return
+            except ManPageNotFoundError as error:
+                missing = error
+            except Exception as error:
+                self.post_message(PageLoaded(pane, generation, None, error))
+                return
+            else:
+                self.post_message(PageLoaded(pane, generation, page))
+                return
+        # Outside the fetch slot: the first suggestion may build the finder index.
+        from smartman.index.finder import did_you_mean
+
+        self.post_message(PageLoaded(pane, generation, None, missing, did_you_mean(command)))
+
+    def _page_ready(self, pane: PagePane, page: ManPage) -> None:
+        """Remember a finished page, and prefetch what it refers to once it has been read for a moment."""
+        self.recent.put(pane.command, page)
+        references = page.see_also()
+        if references:
+            self.set_timer(PREFETCH_DELAY, partial(self._prefetch, pane, pane.generation, references))
+
+    def _prefetch(self, pane: PagePane, generation: int, references: list[str]) -> None:
+        if generation != pane.generation:
+            # Already moved on to another page.
+            return
+        if self._prefetcher is None:
+            self._prefetcher = Prefetcher(self._page_parser(), self.recent)
+        self._prefetcher.prefetch(references)
+
+    def on_section_loaded(self, message: SectionLoaded) -> None:
+        if message.generation != message.pane.generation:
+            # The tab moved on to another page meanwhile.
+            return
+        message.pane.add_section(message.name, message.body)
+        if not self._first_section:
+            self._first_section = True
+            trace.record("tui.first_section", self._trace_start, command=message.pane.command)
+
+    def on_page_loaded(self, message: PageLoaded) -> None:
+        pane = message.pane
+        if message.generation != pane.generation:
+            return
+        if message.error is not None:
+            if isinstance(message.error, ManPageNotFoundError):
+                hint = f"\n{message.suggestion}" if message.suggestion else ""
+                if len(self.commands) == 1 and not self.histories[0].can_go_back:
+                    # The page asked for on the command line: nothing to show.
+                    self.exit(
+                        return_code=1,
+                        message=Text.assemble(("Error:", "bold red"), f" {message.error}", (hint, "bold yellow")),
+                    )
+                    return
+                pane.show_error(f"{message.error}{hint}")
+            else:
+                pane.show_error(f"Could not load {pane.command}: {message.error}")
+            return
+        self.pages[self._panes().index(pane)] = message.page
+        pane.show_page(message.page)
+        self._page_ready(pane, message.page)
+        trace.record("tui.page_ready", self._trace_start, command=pane.command)
+        if pane is self._pane():
+            if self.show_search and self._last_search:
+                self._run_search(self._last_search)
+            elif not self.show_search:
+                pane.view.focus()
+
+    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        self._update_title()
+        view = self._view()
+        if self.show_search and self._last_search:
+            self._search_origin = view.scroll_offset.y
+            self._run_search(self._last_search)
+        else:
+            view.focus()
+
+    def _panes(self) -> list[PagePane]:
+        return list(self.query(PagePane))
+
+    def _pane(self) -> PagePane:
+        """The page in the active tab."""
+        return self.query_one("#pages", TabbedContent).active_pane.query_one(PagePane)
+
+    def _view(self) -> ManPageView:
+        return self._pane().view
+
+    def _update_title(self) -> None:
+        self.title = f"SmartMan — {self._pane().command}"
+
+    def action_next_link(self, step: int) -> None:
+        view = self._view()
+        if not view.links:
+            self.notify("No SEE ALSO links on this page", timeout=2)
+            return
+        view.select_link(view.current_link + step if view.current_link >= 0 else (0 if step > 0 else -1))
+
+    async def action_follow_link(self, target: str | None = None) -> None:
+        """Open ``target`` (the selected link by default) in the current tab."""
+        target = target or self._view().link_target
+        if not target:
+            return
+        index = self._panes().index(self._pane())
+        self.histories[index].visit(target)
+        await self._open(index, target)
+
+    async def action_history_back(self) -> None:
+        index = self._panes().index(self._pane())
+        command = self.histories[index].back()
+        if command is None:
+            self.bell()
+            return
+        await self._open(index, command)
+
+    async def action_history_forward(self) -> None:
+        index = self._panes().index(self._pane())
+        command = self.histories[index].forward()
+        if command is None:
+            self.bell()
+            return
+        await self._open(index, command)
+
+    async def _open(self, index: int, command: str) -> None:
+        """Replace the page in tab ``index`` with ``command``, from memory when it was read recently."""
+        tabs = self.query_one("#pages", TabbedContent)
+        pane = self._panes()[index]
+        await pane.reset(command)
+        self.commands[index] = command
+        tabs.get_tab(f"page-{index}").label = command
+
+        page = self.recent.get(command)
+        self.pages[index] = page
+        if page is None:
+            self._fetch(pane)
+        else:
+            with trace.span("tui.show_recent", command=command):
+                pane.show_page(page)
+            self._page_ready(pane, page)
+
+        self._update_title()
+        if self.show_search and self._last_search:
+            self._search_origin = 0
+            self._run_search(self._last_search)
+        else:
+            pane.view.focus()
+
+    def action_switch_tab(self, step: int) -> None:
+        tabs = self.query_one("#pages", TabbedContent)
+        index = int(tabs.active.removeprefix("page-"))
+        tabs.active = f"page-{(index + step) % len(self.commands)}"
 
     def watch_show_search(self, show: bool) -> None:
         """Toggle search bar visibility."""
         search_bar = self.query_one("#search-bar")
         if show:
             search_bar.add_class("visible")
-            self.query_one("#search-input").focus()
+            search_input = self.query_one("#search-input", Input)
+            search_input.focus()
+            self._search_origin = self._view().scroll_offset.y
+            if search_input.value.strip():
+                self._run_search(search_input.value.strip())
         else:
             search_bar.remove_class("visible")
-            # If we cleared search, re-render sections to remove highlights
+            self._cancel_search_timer()
+            # If we cleared search, remove the highlights
             if self._last_search:
                 self._last_search = ""
-                self._refresh_content()
+                for pane in self._panes():
+                    pane.view.set_highlight("")
+                self._view().focus()
 
     def action_toggle_search(self) -> None:
         self.show_search = not self.show_search
@@ -314,77 +661,94 @@ class SmartManApp(App):
     def action_hide_search(self) -> None:
         self.show_search = False
 
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search as the user types, once typing pauses for SEARCH_DEBOUNCE."""
+        if event.input.id != "search-input":
+            return
+        self._cancel_search_timer()
+        query = event.value.strip()
+        self._search_timer = self.set_timer(SEARCH_DEBOUNCE, lambda: self._run_search(query))
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Perform search when user presses Enter."""
+        """Enter moves to the next match; on an empty box it closes search."""
         query = event.value.strip()
         if not query:
             self.show_search = False
             return
 
+        if query != self._last_search:
+            self._cancel_search_timer()
+            self._run_search(query)
+        else:
+            self.action_next_match()
+
+    def action_next_match(self) -> None:
+        self._step_match(1)
+
+    def action_previous_match(self) -> None:
+        self._step_match(-1)
+
+    def _step_match(self, step: int) -> None:
+        view = self._view()
+        if view.matches:
+            view.select_match(view.current_match + step)
+            self._update_search_count()
+
+    def _run_search(self, query: str) -> None:
+        self._search_timer = None
         self._last_search = query
-        self._refresh_content(query)
-        self._jump_to_first_match(query)
-
-    def _refresh_content(self, query: str = "") -> None:
-        """Update all section widgets with search highlights."""
-        for section_name, content in self.page.sections.items():
-            section_upper = section_name.upper()
-            if section_upper in self._section_widgets:
-                widget = self._section_widgets[section_upper]
-                renderable = self._get_section_renderable(section_name, content, query)
-                widget.update(renderable)
-
-    def _jump_to_first_match(self, query: str) -> None:
-        """Find the first section containing the query and scroll to it."""
-        for name, content in self.page.sections.items():
-            if query.lower() in content.lower() or query.lower() in name.lower():
-                self.action_jump_section(name)
-                break
+        view = self._view()
+        with trace.span("tui.search", query=query):
+            found = self._refresh_content(query)
+        if found:
+            # Start from where the reader was when they opened the search box.
+            view.select_match(view.first_match_below(self._search_origin))
+        self._update_search_count()
+
+    def _cancel_search_timer(self) -> None:
+        if self._search_timer is not None:
+            self._search_timer.stop()
+            self._search_timer = None
+
+    def _update_search_count(self) -> None:
+        view = self._view()
+        label = self.query_one("#search-count", Label)
+        if not self._last_search:
+            label.update("")
+        elif not view.matches:
+            label.update("no matches")
+        else:
+            label.update(f"{view.current_match + 1} of {len(view.matches)}")
+
+    def _refresh_content(self, query: str = "") -> int:
+        """Update search highlights; only lines whose matches changed are re-styled."""
+        return self._view().set_highlight(query)
 
     def action_jump_section(self, section: str) -> None:
         """Scroll content to a specific section."""
-        section_upper = section.upper()
-        if section_upper in self._section_widgets:
-            widget = self._section_widgets[section_upper]
-            content_container = self.query_one("#main-scroll", VerticalScroll)
-            content_container.scroll_to_widget(widget, animate=True)
-            
-            target_id = f"nav-{section.replace(' ', '_')}"
-            try:
-                sidebar = self.query_one("#section-list", ListView)
-                for i, item in enumerate(sidebar.query(ListItem)):
-                    if item.id == target_id:
-                        sidebar.index = i
-                        break
-            except NoMatches:
-                pass
-
-    def on_list_view_selected(self, event: ListView.Selected) -> None:
-        if event.item and event.item.id:
-            section_name = event.item.id.replace("nav-", "").replace("_", " ").upper()
-            if section_name in self._section_widgets:
-                widget = self._section_widgets[section_name]
-                self.query_one("#main-scroll", VerticalScroll).scroll_to_widget(widget, animate=True)
+        self._pane().jump_to(section)
 
     def action_scroll_down(self) -> None:
         """Scroll down slightly."""
-        self.query_one("#main-scroll", VerticalScroll).scroll_down(animate=False)
+        self._view().scroll_down(animate=False)
 
     def action_scroll_up(self) -> None:
         """Scroll up slightly."""
-        self.query_one("#main-scroll", VerticalScroll).scroll_up(animate=False)
+        self._view().scroll_up(animate=False)
 
     def action_scroll_top(self) -> None:
         """Scroll to the very top."""
-        self.query_one("#main-scroll", VerticalScroll).scroll_to(0, 0, animate=True)
+        self._view().scroll_to(0, 0, animate=True)
 
     def action_scroll_bottom(self) -> None:
         """Scroll to the very bottom."""
-        self.query_one("#main-scroll", VerticalScroll).scroll_to(0, 1000000, animate=True)
+        self._view().scroll_to(0, 1000000, animate=True)
 
     def action_toggle_help(self) -> None:
         self.notify(
-            "/=Search  n=NAME  s=SYNOPSIS  d=DESCRIPTION  o=OPTIONS  e=EXAMPLES  q=Quit",
+            "/=Search  Ctrl+N/Ctrl+B=Next/Prev match  n=NAME  s=SYNOPSIS  d=DESCRIPTION  o=OPTIONS  e=EXAMPLES  "
+            "l/L=Next/Prev link  Enter=Follow link  Backspace/Alt+Right=Back/Forward  "
+            "]/[=Next/Prev page  q=Quit",
             title="Keyboard Shortcuts",
             timeout=5,
         )
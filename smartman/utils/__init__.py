@@ -1,8 +1,7 @@
+import os
 import shutil
 from pathlib import Path
 
-import yaml
-
 
 def get_man_binary() -> str:
     """Resolve the man binary path across different Linux distributions."""
@@ -21,13 +20,16 @@ def get_themes_dir() -> Path:
     return Path(__file__).parent.parent / "themes"
 
 
-def load_theme(name: str) -> dict:
-    """Load a theme YAML file by name. Falls back to default if not found."""
-    themes_dir = get_themes_dir()
-    theme_file = themes_dir / f"{name}.yaml"
+def get_cache_dir() -> Path:
+    """Return the smartman cache directory, honouring XDG_CACHE_HOME."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "smartman"
 
-    if not theme_file.exists():
-        theme_file = themes_dir / "default.yaml"
 
-    with theme_file.open() as f:
-        return yaml.safe_load(f)
+def load_theme(name: str) -> dict:
+    """Load a theme by name (see ``smartman.utils.themes``). Falls back to default if not found."""
+    from smartman.utils.themes import load_theme as load_compiled_theme
+    from smartman.utils.trace import span
+
+    with span("theme.load", theme=name):
+        return load_compiled_theme(name)
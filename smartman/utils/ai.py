@@ -1,60 +1,107 @@
 import os
-import requests
 import re
+from collections.abc import Iterator
 
-def explain_command(command: str, raw_text: str) -> str:
+from smartman.utils import trace
+from smartman.utils.ai_client import API_KEY_ENV, AIError, get_client
+
+MODEL = "llama-3.3-70b-versatile"
+# Bump whenever the prompt or request parameters change, so cached
+# explanations produced by the old prompt are not served.
+PROMPT_VERSION = 2
+
+EXPLAIN_PROMPT = "You are a Linux systems expert. Explain the following command based on its manual page. Keep it concise, practical, and easy for a beginner to understand. Focus on the core purpose and 2-3 most useful flags shown in the text. Use plain text formatting."
+QUESTION_PROMPT = "You are a Linux systems expert. Answer the user's question about the following command using its manual page excerpts. Keep it concise and practical, and show the exact command line when one helps. Use plain text formatting."
+
+def explain_command(command: str, context: str, question: str | None = None, cache=None, refresh: bool = False) -> str:
     """
     Returns an AI-powered explanation of the command based on its manual page using Groq.
     Requires GROQ_API_KEY to be set in the environment.
     """
-    api_key = os.getenv("GROQ_API_KEY")
-    
-    if not api_key:
-        return _mock_explanation(command)
+    return "".join(stream_explanation(command, context, question=question, cache=cache, refresh=refresh))
 
-    # Groq API endpoint for chat completions
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+def stream_explanation(command: str, context: str, question: str | None = None, cache=None, refresh: bool = False) -> Iterator[str]:
+    """
+    Yields the explanation piece by piece as the model produces it.
+
+    ``context`` is the page text to send, normally the excerpts picked by
+    ``ai_context.build_context``; ``question`` turns the explanation into an
+    answer to that question.
 
+    With an ``ExplanationCache``, a stored answer for the same command, model,
+    prompt and page text is yielded at once without any request; ``refresh``
+    skips the lookup but still stores the new answer. Only complete answers
+    are cached, never errors or partial streams.
+    """
     # Clean the man text of control characters and backspaces
-    cleaned_text = _clean_man_text(raw_text)
-    truncated_text = cleaned_text[:12000] 
+    cleaned_text = _clean_man_text(context)
+    cache_text = f"{question or ''}\0{cleaned_text}"
+
+    if cache is not None and not refresh:
+        with trace.span("ai.cache_get"):
+            cached = cache.get(command, MODEL, PROMPT_VERSION, cache_text)
+        if cached is not None:
+            yield cached
+            return
+
+    api_key = os.getenv(API_KEY_ENV)
+    
+    if not api_key:
+        yield _mock_explanation(command)
+        return
 
     payload = {
-        "model": "llama-3.3-70b-versatile",
+        "model": MODEL,
         "messages": [
             {
                 "role": "system", 
-                "content": "You are a Linux systems expert. Explain the following command based on its manual page. Keep it concise, practical, and easy for a beginner to understand. Focus on the core purpose and 2-3 most useful flags shown in the text. Use plain text formatting."
+                "content": QUESTION_PROMPT if question else EXPLAIN_PROMPT
             },
             {
                 "role": "user", 
-                "content": f"Command: {command}\n\nManual Page Content:\n{truncated_text}"
+                "content": f"Command: {command}\n\nManual Page Content:\n{cleaned_text}"
+                + (f"\n\nQuestion: {question}" if question else "")
             }
         ],
         "temperature": 0.5,
         "max_tokens": 500
     }
 
+    parts = []
+    start = trace.now()
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
-        if response.status_code != 200:
-            error_msg = response.text
-            return f"[bold red]AI Error (Groq {response.status_code}):[/bold red] {error_msg}\n\n{_mock_explanation(command, real_key_found=True)}"
-        
-        data = response.json()
-        return data["choices"][0]["message"]["content"].strip()
+        for part in get_client(api_key).stream(payload):
+            # The answer is stripped like the non-streaming one was.
+            if not parts:
+                part = part.lstrip()
+                if not part:
+                    continue
+            if not parts:
+                trace.record("ai.first_token", start)
+            parts.append(part)
+            yield part
+        trace.record("ai.response", start, chunks=len(parts))
+    except AIError as e:
+        yield _error_text(f"AI Error (Groq {e.status}):" if e.status else "AI Error (Groq):", str(e), command, started=bool(parts))
+        return
     except Exception as e:
-        return f"[bold red]AI Error (Groq):[/bold red] {str(e)}\n\n[dim]Falling back to offline summary...[/dim]\n\n{_mock_explanation(command, real_key_found=True)}"
+        yield _error_text("AI Error (Groq):", f"{str(e)}\n\n[dim]Falling back to offline summary...[/dim]", command, started=bool(parts))
+        return
+
+    if cache is not None and parts:
+        cache.put(command, MODEL, PROMPT_VERSION, cache_text, "".join(parts).strip())
+
+def _error_text(title: str, message: str, command: str, started: bool) -> str:
+    """The error shown in place of (or after part of) an explanation."""
+    if started:
+        # Part of the answer is already on screen; do not append a mock to it.
+        return f"\n\n[bold red]{title}[/bold red] {message}"
+    return f"[bold red]{title}[/bold red] {message}\n\n{_mock_explanation(command, real_key_found=True)}"
 
 def _clean_man_text(text: str) -> str:
     """Strips backspaces and other control characters used for man page formatting."""
     # Remove backspace overstrikes (e.g., 'a\ba' or '_\ba')
-    text = re.sub(r'.\b', '', text)
+    text = re.sub(r'.\x08', '', text)
     # Remove remaining non-printable characters except whitespace
     text = "".join(char for char in text if char.isprintable() or char in "\n\r\t")
     return text
@@ -0,0 +1,93 @@
+"""On-disk cache of AI explanations."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+from smartman.utils.cache import DiskCache
+
+
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+TTL_ENV = "SMARTMAN_EXPLAIN_TTL"
+MAX_BYTES_ENV = "SMARTMAN_EXPLAIN_CACHE_BYTES"
+
+
+class ExplanationCache:
+    """Explanations keyed by command, model, prompt version and a hash of the page text.
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped; the
+    store evicts least-recently-used entries beyond ``max_bytes``. Hits and
+    misses are counted both for this instance and persistently on disk.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        store: DiskCache | None = None,
+    ) -> None:
+        self.ttl = ttl if ttl is not None else _env_number(TTL_ENV, DEFAULT_TTL)
+        if max_bytes is None:
+            max_bytes = int(_env_number(MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+        self.store = store or DiskCache("explanations", max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, command: str, model: str, prompt_version: int, text: str) -> str | None:
+        key = self._key(command, model, prompt_version, text)
+        entry = _decode(self.store.get(key))
+        if entry is not None and time.time() - entry["created"] > self.ttl:
+            self.store.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self.store.bump("misses")
+            return None
+        self.hits += 1
+        self.store.bump("hits")
+        return entry["explanation"]
+
+    def put(self, command: str, model: str, prompt_version: int, text: str, explanation: str) -> None:
+        entry = {"created": time.time(), "explanation": explanation}
+        self.store.put(self._key(command, model, prompt_version, text), json.dumps(entry).encode("utf-8"))
+
+    def stats(self) -> dict[str, int]:
+        """Persistent hit/miss totals plus the current number of entries and bytes."""
+        counters = self.store.counters()
+        entries, size = self.store.usage()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    @staticmethod
+    def _key(command: str, model: str, prompt_version: int, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{command}\0{model}\0{prompt_version}\0{digest}"
+
+
+def _decode(data: bytes | None) -> dict | None:
+    if data is None:
+        return None
+    try:
+        entry = json.loads(data)
+        float(entry["created"]), str(entry["explanation"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    return entry
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
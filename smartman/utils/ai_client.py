@@ -0,0 +1,115 @@
+"""HTTP client for OpenAI-compatible chat completion APIs (Groq by default).
+
+One ``requests.Session`` per process keeps TLS connections to the API
+alive between calls, and transient failures (429 and 5xx) are retried with
+exponential backoff before any token is shown.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_BASE_URL = "https://api.groq.com/openai/v1"
+BASE_URL_ENV = "SMARTMAN_AI_BASE_URL"
+API_KEY_ENV = "GROQ_API_KEY"
+
+CONNECT_TIMEOUT = 5.0
+# Per read: while streaming this bounds the gap between two chunks, not the whole answer.
+READ_TIMEOUT = 30.0
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AIError(Exception):
+    """The API answered with an error status, or with something unreadable."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        self.status = status
+        super().__init__(message)
+
+
+class AIClient:
+    """Chat completions over a pooled, retrying session."""
+
+    def __init__(self, api_key: str, base_url: str | None = None, retries: int = RETRIES) -> None:
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        retry = Retry(
+            total=retries,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            # Hand the last error response back instead of raising, so its body can be shown.
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def complete(self, payload: dict) -> str:
+        """Return the whole completion at once."""
+        response = self._post(dict(payload, stream=False), stream=False)
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            raise AIError(f"Unexpected response: {response.text[:200]}", response.status_code) from exc
+
+    def stream(self, payload: dict) -> Iterator[str]:
+        """Yield completion text as the server sends it (``stream: true`` SSE)."""
+        response = self._post(dict(payload, stream=True), stream=True)
+        with response:
+            for line in response.iter_lines(decode_unicode=False):
+                if not line.startswith(b"data:"):
+                    # Blank separators, comments and other SSE fields.
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    return
+                try:
+                    choice = json.loads(data)["choices"][0]
+                except (ValueError, KeyError, IndexError, TypeError) as exc:
+                    raise AIError(f"Unexpected stream event: {data[:200]!r}", response.status_code) from exc
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _post(self, payload: dict, stream: bool) -> requests.Response:
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            stream=stream,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        )
+        if response.status_code != 200:
+            message = response.text
+            response.close()
+            raise AIError(message, response.status_code)
+        return response
+
+
+_clients: dict[tuple[str, str], AIClient] = {}
+
+
+def get_client(api_key: str, base_url: str | None = None) -> AIClient:
+    """Shared client per key and endpoint, so repeated calls reuse connections."""
+    base_url = (base_url or os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+    client = _clients.get((api_key, base_url))
+    if client is None:
+        client = _clients[(api_key, base_url)] = AIClient(api_key, base_url)
+    return client
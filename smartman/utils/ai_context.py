@@ -0,0 +1,201 @@
+"""Pick the most useful parts of a man page for an AI prompt, under a token budget."""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from smartman.parser.man_parser import ManPage
+from smartman.parser.options import DASHES
+
+
+DEFAULT_TOKEN_BUDGET = 1500
+TOKEN_BUDGET_ENV = "SMARTMAN_EXPLAIN_TOKENS"
+# Smallest budget taken from the environment: enough for NAME and part of SYNOPSIS.
+MIN_TOKEN_BUDGET = 100
+# Rough size of one token in English prose and code for the Llama/GPT tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Base score of a chunk by section; sections not listed score DEFAULT_WEIGHT.
+SECTION_WEIGHTS = {
+    "NAME": 100.0,
+    "SYNOPSIS": 90.0,
+    "EXAMPLES": 50.0,
+    "EXAMPLE": 50.0,
+    "DESCRIPTION": 25.0,
+    "OPTIONS": 20.0,
+    "EXIT STATUS": 8.0,
+    "RETURN VALUE": 8.0,
+    "ENVIRONMENT": 5.0,
+}
+DEFAULT_WEIGHT = 6.0
+# Boilerplate that never helps explain a command.
+SKIPPED_SECTIONS = {"AUTHOR", "AUTHORS", "COPYRIGHT", "REPORTING BUGS", "SEE ALSO", "HISTORY", "COLOPHON"}
+# Chunks that are always kept (trimmed if they alone exceed the budget).
+REQUIRED_SECTIONS = {"NAME", "SYNOPSIS"}
+
+# Later paragraphs of a section matter less than its opening.
+POSITION_DECAY = 0.85
+# Each mention of an option elsewhere on the page (examples, synopsis, other options).
+REFERENCE_BONUS = 5.0
+MAX_REFERENCE_BONUS = 80.0
+# A question word found in a chunk, scaled up by how rare the word is on the page.
+QUESTION_BONUS = 30.0
+
+FLAG_MENTION = re.compile(r"(?<![\w-])(-{1,2}[A-Za-z0-9?@#][\w-]*)")
+WORD = re.compile(r"[a-z0-9][a-z0-9_-]+")
+STOPWORDS = {
+    "the", "and", "for", "with", "how", "what", "does", "can", "you", "use", "using",
+    "this", "that", "from", "into", "when", "which", "are", "is", "do", "to", "of", "in", "a", "an",
+}
+
+
+@dataclass
+class Chunk:
+    section: str
+    text: str
+    order: int
+    score: float
+    tokens: int
+
+
+@dataclass
+class Context:
+    text: str
+    tokens: int
+    page_tokens: int
+    chunks: int
+    total_chunks: int
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def token_budget() -> int:
+    try:
+        return max(int(os.environ[TOKEN_BUDGET_ENV]), MIN_TOKEN_BUDGET)
+    except (KeyError, ValueError):
+        return DEFAULT_TOKEN_BUDGET
+
+
+def build_context(page: ManPage, question: str | None = None, budget: int | None = None) -> Context:
+    """Rank the page's paragraphs and option entries and pack the best into ``budget`` tokens.
+
+    The chosen chunks are emitted in page order under their section names,
+    so the prompt still reads like a (shorter) man page.
+    """
+    if budget is None:
+        budget = token_budget()
+    chunks = _chunks(page)
+    _score(chunks, page, question)
+
+    used = 0
+    chosen = []
+    for chunk in sorted(chunks, key=lambda c: c.section not in REQUIRED_SECTIONS):
+        if chunk.section in REQUIRED_SECTIONS:
+            if used + chunk.tokens > budget:
+                chunk.text = chunk.text[:max(0, budget - used) * CHARS_PER_TOKEN]
+                chunk.tokens = estimate_tokens(chunk.text)
+            chosen.append(chunk)
+            used += chunk.tokens
+    optional = [c for c in chunks if c.section not in REQUIRED_SECTIONS]
+    # Best value first. Dividing by the square root of the size keeps one huge
+    # paragraph from crowding out many small ones without starving every long entry.
+    for chunk in sorted(optional, key=lambda c: c.score / math.sqrt(max(c.tokens, 1)), reverse=True):
+        if chunk.score > 0 and used + chunk.tokens <= budget:
+            chosen.append(chunk)
+            used += chunk.tokens
+
+    lines = []
+    section = None
+    for chunk in sorted(chosen, key=lambda c: c.order):
+        if chunk.section != section:
+            section = chunk.section
+            lines.append(f"{section}:")
+        lines.append(chunk.text)
+    text = "\n".join(lines)
+    return Context(
+        text=text,
+        tokens=estimate_tokens(text),
+        page_tokens=estimate_tokens(page.raw_text),
+        chunks=len(chosen),
+        total_chunks=len(chunks),
+    )
+
+
+def _chunks(page: ManPage) -> list[Chunk]:
+    """Split sections into paragraphs; option entries are one chunk each."""
+    option_spans = sorted((entry.start, entry.end) for entry in page.options.entries)
+    chunks: list[Chunk] = []
+    for name, (start, end) in page.spans.items():
+        section = name.upper()
+        body = page.raw_text[start:end]
+        if section in SKIPPED_SECTIONS or not body.strip():
+            continue
+        pieces = _section_pieces(body, start, option_spans)
+        for piece in pieces:
+            chunks.append(Chunk(section, piece, len(chunks), 0.0, estimate_tokens(piece)))
+    return chunks
+
+
+def _section_pieces(body: str, start: int, option_spans: list[tuple[int, int]]) -> list[str]:
+    """Paragraphs of one section; each option entry becomes one chunk."""
+    end = start + len(body)
+    pieces = []
+    pos = start
+    for entry_start, entry_end in option_spans:
+        if entry_start < pos or entry_start >= end:
+            # Nested entries are already part of their parent.
+            continue
+        pieces.extend(_paragraphs(body[pos - start:entry_start - start]))
+        entry = body[entry_start - start:entry_end - start]
+        # The first paragraph says what an option does; the rest is mostly caveats.
+        pieces.append(_dedent(re.split(r"\n\s*\n", entry, 1)[0]))
+        pos = entry_end
+    pieces.extend(_paragraphs(body[pos - start:]))
+    return [piece for piece in pieces if piece]
+
+
+def _paragraphs(text: str) -> list[str]:
+    return [_dedent(p) for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def _dedent(text: str) -> str:
+    # Indentation carries no meaning for the model and costs tokens.
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def _score(chunks: list[Chunk], page: ManPage, question: str | None) -> None:
+    mentions = _flag_mentions(page)
+    terms = {w for w in WORD.findall(question.lower()) if w not in STOPWORDS} if question else set()
+    words = [set(WORD.findall(chunk.text.lower())) & terms for chunk in chunks]
+    # Question words that are rare on this page say more about which chunk is wanted.
+    frequency = Counter(term for found in words for term in found)
+    weights = {term: QUESTION_BONUS * math.log(len(chunks) / count) for term, count in frequency.items()}
+    position: Counter[str] = Counter()
+    for chunk, found in zip(chunks, words):
+        score = SECTION_WEIGHTS.get(chunk.section, DEFAULT_WEIGHT)
+        score *= POSITION_DECAY ** position[chunk.section]
+        position[chunk.section] += 1
+
+        entries = page.options.lookup(_head_flag(chunk.text))
+        if entries:
+            # An option's own entry mentions it once; everything else is a reference.
+            # A flag FLAG_MENTION does not recognise is counted nowhere, not even in its own entry.
+            references = max(0, sum(mentions[flag] for flag in entries[0].flags) - len(entries[0].flags))
+            score = SECTION_WEIGHTS["OPTIONS"] + min(REFERENCE_BONUS * references, MAX_REFERENCE_BONUS)
+        score += sum(weights[term] for term in found)
+        chunk.score = score
+
+
+def _flag_mentions(page: ManPage) -> Counter[str]:
+    return Counter(FLAG_MENTION.findall(page.raw_text.translate(DASHES)))
+
+
+def _head_flag(text: str) -> str:
+    head = text.split(None, 1)
+    return head[0].rstrip(",") if head and head[0].startswith("-") else ""
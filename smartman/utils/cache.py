@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from smartman.utils import get_cache_dir
+
+
+class DiskCache:
+    """Size-bounded key/value store on disk, safe to share between processes.
+
+    Entries are written atomically (temp file + rename) so readers never see a
+    partial entry and do not need a lock. Writers and the evictor serialize on
+    an ``flock`` held on a lock file inside the cache directory. Every hit bumps
+    the entry's mtime, which makes eviction least-recently-used. A running
+    byte total is kept next to the entries so that a put only walks the
+    directory when the bound is actually exceeded.
+    """
+
+    def __init__(self, name: str, max_bytes: int, root: Path | None = None) -> None:
+        self.directory = (root or get_cache_dir()) / name
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path_for(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def contains(self, key: str) -> bool:
+        return self._path_for(key).is_file()
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path_for(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                try:
+                    replaced = path.stat().st_size
+                except OSError:
+                    replaced = 0
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                if self._adjust_total(len(data) - replaced) > self.max_bytes:
+                    self._evict()
+        except OSError:
+            # A cache that cannot be written is just a cache miss next time.
+            pass
+
+    def delete(self, key: str) -> None:
+        path = self._path_for(key)
+        try:
+            with self._locked():
+                size = path.stat().st_size
+                os.unlink(path)
+                self._adjust_total(-size)
+        except OSError:
+            pass
+
+    def usage(self) -> tuple[int, int]:
+        """Number of entries and their total size in bytes."""
+        try:
+            entries = self._entries()
+        except OSError:
+            return 0, 0
+        return len(entries), sum(entry.stat().st_size for entry in entries)
+
+    def bump(self, counter: str) -> None:
+        """Increment a named counter kept next to the entries (e.g. hits, misses)."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                counters = self._read_counters()
+                counters[counter] = counters.get(counter, 0) + 1
+                (self.directory / ".counters").write_text(json.dumps(counters))
+        except OSError:
+            pass
+
+    def counters(self) -> dict[str, int]:
+        try:
+            with self._locked(shared=True):
+                return self._read_counters()
+        except OSError:
+            # No cache directory yet, so nothing counted.
+            return {}
+
+    def clear(self) -> None:
+        if not self.directory.is_dir():
+            return
+        with self._locked():
+            for entry in self._entries():
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+            self._write_total(0)
+            try:
+                os.unlink(self.directory / ".counters")
+            except OSError:
+                pass
+
+    def _read_counters(self) -> dict[str, int]:
+        try:
+            return json.loads((self.directory / ".counters").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.bin"
+
+    def _entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as it:
+            return [e for e in it if e.name.endswith(".bin") and e.is_file()]
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self._entries():
+            st = entry.stat()
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            total += st.st_size
+
+        if total > self.max_bytes:
+            entries.sort()
+            for _mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+        self._write_total(total)
+
+    def _adjust_total(self, delta: int) -> int:
+        """Apply ``delta`` to the stored byte total (caller holds the lock).
+
+        Callers adjust after the change is on disk. Without a stored total the
+        directory is summed instead, and that sum already includes the change.
+        """
+        try:
+            stored = int((self.directory / ".size").read_text())
+        except (OSError, ValueError):
+            total = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            total = stored + delta
+        self._write_total(total)
+        return total
+
+    def _write_total(self, total: int) -> None:
+        (self.directory / ".size").write_text(str(total))
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        # flock is per open file: never nest these within one process.
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
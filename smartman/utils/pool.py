@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any
+
+
+# Tasks queued per worker. Keeps every core busy while bounding the number of
+# live futures (and the man pipes behind them) to a small multiple of --jobs.
+IN_FLIGHT_PER_JOB = 2
+
+
+def run_bounded(
+    worker: Callable[..., Any],
+    tasks: Iterable[tuple],
+    on_result: Callable[[Any], None],
+    jobs: int | None = None,
+) -> None:
+    """Call ``worker(*task)`` for every task in a process pool.
+
+    Tasks are submitted lazily, at most ``IN_FLIGHT_PER_JOB`` per worker, and
+    ``on_result`` runs in the calling process as each one finishes. On any
+    exception, Ctrl+C included, queued tasks are cancelled before it
+    propagates, so an interrupt does not wait for the whole backlog.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    limit = jobs * IN_FLIGHT_PER_JOB
+    queue = iter(tasks)
+    in_flight: set[Future] = set()
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            while True:
+                for task in queue:
+                    in_flight.add(pool.submit(worker, *task))
+                    if len(in_flight) >= limit:
+                        break
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    on_result(future.result())
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
@@ -0,0 +1,69 @@
+"""Import-time breakdown behind ``smartman --startup-profile``."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+# What each way of running smartman imports on top of ``smartman.cli`` itself.
+STARTUP_MODES: dict[str, tuple[str, ...]] = {
+    "--version": (),
+    "--plain": ("smartman.parser.man_parser", "smartman.renderer.formatter", "smartman.utils.themes"),
+    "tui": ("smartman.parser.man_parser", "smartman.renderer.tui", "smartman.utils.themes"),
+    "--explain": ("smartman.parser.man_parser", "smartman.utils.ai", "smartman.utils.ai_cache", "rich.live"),
+}
+
+# Imports done by the interpreter before any smartman code runs.
+INTERPRETER_MODULES = {"site", "encodings", "_io", "marshal", "posix", "zipimport", "_frozen_importlib_external"}
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def profile_imports(modules: tuple[str, ...] = ()) -> list[ImportTiming]:
+    """Import ``smartman.cli`` plus ``modules`` in a fresh interpreter and time every import."""
+    code = "; ".join(f"import {name}" for name in ("smartman.cli", *modules))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(ImportTiming(name.strip(), int(fields[0]) / 1000, int(fields[1]) / 1000, depth))
+    return timings
+
+
+def startup_cost(timings: list[ImportTiming]) -> float:
+    """Milliseconds spent in imports attributable to smartman (interpreter startup excluded)."""
+    return sum(t.cumulative_ms for t in timings if t.depth == 0 and t.module not in INTERPRETER_MODULES)
+
+
+def by_package(timings: list[ImportTiming]) -> list[tuple[str, float]]:
+    """Self time summed per top-level package, heaviest first."""
+    totals: dict[str, float] = {}
+    top_level = None
+    # importtime lists children before their parent, so walk it backwards.
+    for t in reversed(timings):
+        if t.depth == 0:
+            top_level = t.module
+        if top_level in INTERPRETER_MODULES:
+            continue
+        package = t.module.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + t.self_ms
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,169 @@
+"""Themes read from YAML once, then loaded from a cache.
+
+Bundled themes live in ``smartman/themes``. ``*.yaml`` files in
+``$XDG_CONFIG_HOME/smartman/themes`` add themes, or replace bundled ones of
+the same name. The values of every theme are kept in one JSON file in the
+cache directory. The file is stamped with the size and mtime of each theme
+file, so editing, adding or removing one rebuilds it on the next launch.
+Until then, loading a theme does not import yaml, and only the styles of the
+theme asked for are parsed. The cache is plain data, never code: a pickle
+there would run whatever anyone able to write to the cache put in it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from rich.errors import StyleSyntaxError
+from rich.style import Style
+
+from smartman import __version__
+from smartman.utils import get_cache_dir, get_themes_dir
+
+
+THEME_CACHE_VERSION = 2
+THEME_CACHE_FILE = "themes.json"
+DEFAULT_THEME = "default"
+
+# Every style a renderer asks for, with the value used when a theme leaves it out.
+THEME_DEFAULTS = {
+    "heading": "bold cyan",
+    "subheading": "bold blue",
+    "flag": "bold yellow",
+    "code": "bright_white on grey19",
+    "synopsis": "italic bright_green",
+    "description": "white",
+    "accent": "cyan",
+    "border": "blue",
+    "highlight": "bold magenta",
+    "muted": "dim white",
+}
+
+
+class Theme(dict):
+    """A theme's values as written in its YAML, plus every style already parsed.
+
+    It is still the plain ``{key: "bold cyan"}`` mapping themes have always
+    been; renderers use :attr:`styles` instead of parsing those strings.
+    """
+
+    def __init__(self, values: dict, styles: dict[str, Style]) -> None:
+        super().__init__(values)
+        self.styles = styles
+
+
+def get_user_themes_dir() -> Path:
+    """Return the directory for user themes, honouring XDG_CONFIG_HOME."""
+    base = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(base) / "smartman" / "themes"
+
+
+def theme_files() -> dict[str, Path]:
+    """Theme name -> YAML file; user themes win over bundled ones."""
+    files = {}
+    for directory in (get_themes_dir(), get_user_themes_dir()):
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.endswith(".yaml") and entry.is_file():
+                files[entry.name[:-len(".yaml")]] = Path(entry.path)
+    return files
+
+
+def available_themes() -> list[str]:
+    return sorted(theme_files())
+
+
+def load_theme(name: str) -> Theme:
+    """The compiled theme called ``name``, or the default theme if there is none."""
+    themes = _theme_values()
+    values = themes.get(name) or themes.get(DEFAULT_THEME)
+    return compile_theme(values if values is not None else {})
+
+
+def compile_theme(values: dict) -> Theme:
+    """Parse every style of a theme; values that are not valid styles fall back to the default."""
+    styles = {}
+    for key, value in {**THEME_DEFAULTS, **values}.items():
+        if not isinstance(value, str):
+            continue
+        try:
+            styles[key] = Style.parse(value)
+        except StyleSyntaxError:
+            if key in THEME_DEFAULTS:
+                styles[key] = Style.parse(THEME_DEFAULTS[key])
+    return Theme(values, styles)
+
+
+def theme_styles(theme: dict) -> dict[str, Style]:
+    """Parsed styles for ``theme``; a plain dict (not from :func:`load_theme`) is compiled here."""
+    if isinstance(theme, Theme):
+        return theme.styles
+    return compile_theme(theme).styles
+
+
+def _theme_values() -> dict[str, dict]:
+    """Theme name -> the values in its YAML, from the cache while no theme file changed."""
+    files = theme_files()
+    stamp = _stamp(files)
+    path = get_cache_dir() / THEME_CACHE_FILE
+    try:
+        with path.open(encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["stamp"] == stamp and isinstance(cached["themes"], dict):
+            return cached["themes"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    themes = _read_files(files)
+    _write_cache(path, stamp, themes)
+    return themes
+
+
+def _stamp(files: dict[str, Path]) -> list:
+    # Lists, not tuples, so that it compares equal after a round trip through JSON.
+    parts = []
+    for name, path in sorted(files.items()):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        parts.append([name, str(path), stat.st_mtime_ns, stat.st_size])
+    return [THEME_CACHE_VERSION, __version__, parts]
+
+
+def _read_files(files: dict[str, Path]) -> dict[str, dict]:
+    import yaml
+
+    themes = {}
+    for name, path in files.items():
+        try:
+            with path.open() as f:
+                values = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError):
+            continue
+        if isinstance(values, dict):
+            themes[name] = values
+    return themes
+
+
+def _write_cache(path: Path, stamp: list, themes: dict[str, dict]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                # Values YAML parsed into something JSON lacks (dates) are kept as text.
+                json.dump({"stamp": stamp, "themes": themes}, f, default=str)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        # A read-only cache only means compiling again next time.
+        pass
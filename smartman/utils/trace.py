@@ -0,0 +1,266 @@
+"""Span timing behind ``smartman --trace`` and ``SMARTMAN_TRACE``.
+
+Instrumented code wraps each stage in ``with span("parser.split"):``. While
+tracing is off, :func:`span` returns one shared no-op context manager, so an
+untraced run pays a global lookup and a call per span and nothing else.
+
+``SMARTMAN_TRACE`` (or ``--trace``) selects the report:
+
+* ``summary``: a table of stages on stderr when the process exits
+* ``json``: every span as JSON on stderr
+* ``chrome``: a Chrome trace (``chrome://tracing``, Perfetto) written to
+  ``smartman-trace.json``
+
+A ``:path`` suffix (``chrome:/tmp/ls.json``) writes the report to a file.
+``SMARTMAN_TRACE_MEMORY=1`` (or ``--trace-memory``) adds each stage's peak
+memory from ``tracemalloc``; that slows everything down, so only compare
+timings between runs that both have it on or off.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+# json and tracemalloc are imported only once tracing is enabled: this module
+# is loaded on every run, traced or not.
+
+
+TRACE_ENV = "SMARTMAN_TRACE"
+MEMORY_ENV = "SMARTMAN_TRACE_MEMORY"
+FORMATS = ("summary", "json", "chrome")
+DEFAULT_CHROME_PATH = "smartman-trace.json"
+
+_NOOP = nullcontext()
+_tracer: Tracer | None = None
+
+
+class SpanRecord:
+    __slots__ = ("name", "start_ns", "end_ns", "depth", "thread", "args", "peak_bytes")
+
+    def __init__(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        depth: int,
+        thread: int,
+        args: dict,
+        peak_bytes: int | None = None,
+    ) -> None:
+        self.name = name
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.depth = depth
+        self.thread = thread
+        self.args = args
+        # Peak traced memory above the level at span start, when memory tracing is on.
+        self.peak_bytes = peak_bytes
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start_ns", "depth", "base", "peak")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> _Span:
+        stack = self.tracer._stack()
+        self.depth = len(stack)
+        if self.tracer.memory and threading.current_thread() is threading.main_thread():
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # The parent's peak so far, before it is reset for this span.
+                stack[-1].peak = max(stack[-1].peak or 0, peak)
+            tracemalloc.reset_peak()
+            self.base = current
+            self.peak = current
+        else:
+            self.base = self.peak = None
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        end_ns = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        stack.pop()
+        peak_bytes = None
+        if self.base is not None:
+            import tracemalloc
+
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            peak_bytes = self.peak - self.base
+            if stack and stack[-1].peak is not None:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+            tracemalloc.reset_peak()
+        self.tracer.add(SpanRecord(self.name, self.start_ns, end_ns, self.depth, threading.get_ident(), self.args, peak_bytes))
+
+
+class Tracer:
+    """Collects spans from every thread and reports them once at exit."""
+
+    def __init__(self, fmt: str = "summary", path: str | None = None, memory: bool = False) -> None:
+        self.format = fmt
+        self.path = path
+        self.memory = memory
+        self.origin_ns = time.perf_counter_ns()
+        self.records: list[SpanRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def span(self, name: str, args: dict) -> _Span:
+        return _Span(self, name, args)
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def report(self) -> None:
+        import json
+
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r.start_ns)
+        if self.format == "chrome":
+            text = json.dumps(self._chrome(records))
+        elif self.format == "json":
+            text = json.dumps([self._as_dict(r) for r in records], indent=2)
+        else:
+            text = self._summary(records)
+        path = self.path or (DEFAULT_CHROME_PATH if self.format == "chrome" else None)
+        if path is None:
+            sys.stderr.write(text + "\n")
+        else:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+            sys.stderr.write(f"smartman: trace written to {path}\n")
+
+    def _stack(self) -> list[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _as_dict(self, record: SpanRecord) -> dict:
+        data = {
+            "name": record.name,
+            "start_ms": round((record.start_ns - self.origin_ns) / 1e6, 3),
+            "duration_ms": round(record.duration_ms, 3),
+            "depth": record.depth,
+            "thread": record.thread,
+        }
+        if record.args:
+            data["args"] = record.args
+        if record.peak_bytes is not None:
+            data["peak_kb"] = round(record.peak_bytes / 1024, 1)
+        return data
+
+    def _chrome(self, records: list[SpanRecord]) -> dict:
+        pid = os.getpid()
+        events = []
+        for record in records:
+            args = dict(record.args)
+            if record.peak_bytes is not None:
+                args["peak_kb"] = round(record.peak_bytes / 1024, 1)
+            events.append({
+                "name": record.name,
+                "cat": record.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (record.start_ns - self.origin_ns) / 1000,
+                "dur": (record.end_ns - record.start_ns) / 1000,
+                "pid": pid,
+                "tid": record.thread,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def _summary(self, records: list[SpanRecord]) -> str:
+        """One row per stage (repeats folded together), indented by nesting, in first-seen order."""
+        rows: dict[tuple[str, int], list] = {}
+        for record in records:
+            row = rows.setdefault((record.name, record.depth), [0, 0.0, None])
+            row[0] += 1
+            row[1] += record.duration_ms
+            if record.peak_bytes is not None:
+                row[2] = max(row[2] or 0, record.peak_bytes)
+        total_ms = (time.perf_counter_ns() - self.origin_ns) / 1e6
+        memory = any(row[2] is not None for row in rows.values())
+        lines = [f"{'stage':36} {'calls':>5} {'total':>10}" + (f" {'peak':>10}" if memory else "")]
+        for (name, depth), (count, duration, peak) in rows.items():
+            line = f"{'  ' * depth + name:36} {count:5} {duration:8.1f}ms"
+            if memory:
+                line += f" {peak / 1024:8.0f}kB" if peak is not None else f" {'':>10}"
+            lines.append(line)
+        lines.append(f"{'(process, since tracing started)':36} {'':5} {total_ms:8.1f}ms")
+        return "\n".join(lines)
+
+
+def span(name: str, **args):
+    """Time the enclosed block as a stage called ``name``; a no-op unless tracing is on."""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.span(name, args)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def now() -> int:
+    """A timestamp for :func:`record`; 0 while tracing is off."""
+    return time.perf_counter_ns() if _tracer is not None else 0
+
+
+def record(name: str, start_ns: int, **args) -> None:
+    """Add a span that started at ``start_ns`` (from :func:`now`) and ends now.
+
+    For stages that do not fit in one ``with`` block, such as mount to first paint.
+    """
+    if _tracer is None or not start_ns:
+        return
+    _tracer.add(SpanRecord(name, start_ns, time.perf_counter_ns(), 0, threading.get_ident(), args))
+
+
+def enable(spec: str = "summary", memory: bool = False) -> Tracer:
+    """Turn tracing on for the rest of the process; the report is written at exit."""
+    global _tracer
+    fmt, _, path = spec.partition(":")
+    fmt = fmt.lower() or "summary"
+    if fmt in ("1", "true", "yes", "on"):
+        fmt = "summary"
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown trace format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if _tracer is not None:
+        return _tracer
+    if memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    _tracer = Tracer(fmt, path or None, memory)
+    atexit.register(_tracer.report)
+    return _tracer
+
+
+def enable_from_env() -> None:
+    """Honour ``SMARTMAN_TRACE`` / ``SMARTMAN_TRACE_MEMORY``; ignores unknown formats."""
+    spec = os.environ.get(TRACE_ENV)
+    if not spec or spec.lower() in ("0", "false", "no", "off"):
+        return
+    try:
+        enable(spec, memory=os.environ.get(MEMORY_ENV, "") not in ("", "0"))
+    except ValueError as e:
+        sys.stderr.write(f"smartman: {e}\n")
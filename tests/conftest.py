@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from smartman.parser import names
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def manpath(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A manpath holding only the fixture pages, with a cache directory of its own."""
+    root = tmp_path / "man"
+    shutil.copytree(FIXTURES / "man", root)
+    monkeypatch.setenv("MANPATH", str(root))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("SMARTMAN_DAEMON", raising=False)
+    # The name index of the real manpath may already be loaded in this process.
+    monkeypatch.setattr(names, "_index", None)
+    return root
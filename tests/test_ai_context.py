@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from smartman.parser.man_parser import ManPage, split_sections
+from smartman.parser.options import OptionTable, parse_options
+from smartman.utils.ai_context import (
+    DEFAULT_TOKEN_BUDGET,
+    MIN_TOKEN_BUDGET,
+    SECTION_WEIGHTS,
+    TOKEN_BUDGET_ENV,
+    _chunks,
+    _score,
+    build_context,
+    token_budget,
+)
+
+
+PAGE = """NAME
+       widget - frobnicate widgets
+
+SYNOPSIS
+       widget [-a] [-v] FILE
+
+DESCRIPTION
+       widget frobnicates each FILE. Use -a to include hidden widgets.
+
+OPTIONS
+       -a, --all
+              include hidden widgets
+
+       -v     explain what is being done
+
+       --max.size=N
+              stop at N widgets"""
+
+
+def make_page(text: str = PAGE) -> ManPage:
+    text, spans = split_sections(text.split("\n"))
+    return ManPage("widget", text, spans, OptionTable(text, parse_options(text, spans)))
+
+
+def test_required_sections_come_first_in_page_order() -> None:
+    context = build_context(make_page(), budget=1000)
+    assert context.text.startswith("NAME:\nwidget - frobnicate widgets\nSYNOPSIS:")
+    assert context.chunks == context.total_chunks
+
+
+def test_explicit_budget_is_honoured() -> None:
+    # Only the headings of the required sections are left.
+    assert build_context(make_page(), budget=0).text == "NAME:\n\nSYNOPSIS:\n"
+    assert build_context(make_page(), budget=20).tokens <= 20
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("0", MIN_TOKEN_BUDGET), ("-5", MIN_TOKEN_BUDGET), ("800", 800), ("many", DEFAULT_TOKEN_BUDGET)],
+)
+def test_token_budget_from_environment(monkeypatch: pytest.MonkeyPatch, value: str, expected: int) -> None:
+    monkeypatch.setenv(TOKEN_BUDGET_ENV, value)
+    assert token_budget() == expected
+
+
+def test_options_never_score_below_the_section_weight() -> None:
+    page = make_page()
+    chunks = _chunks(page)
+    _score(chunks, page, None)
+    scores = {chunk.text.split()[0]: chunk.score for chunk in chunks if chunk.section == "OPTIONS"}
+    # -a is also mentioned in SYNOPSIS and DESCRIPTION.
+    assert scores["-a,"] > SECTION_WEIGHTS["OPTIONS"]
+    # The flag pattern reads "--max.size" as "--max", so it is mentioned nowhere, not even once.
+    assert scores["--max.size=N"] == SECTION_WEIGHTS["OPTIONS"]
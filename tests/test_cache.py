@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+from smartman.parser.cache import CACHE_MAGIC, CACHE_VERSION, PageCache, decode_page, encode_page
+from smartman.parser.man_parser import ManParser
+from smartman.parser.options import OptionEntry
+from smartman.utils.cache import DiskCache
+
+
+TEXT = "NAME\n       tar - an archiver ‐ with “unicode”\n\nOPTIONS\n       -z, --gzip\n              compress"
+SPANS = {"NAME": (12, 46), "OPTIONS": (56, len(TEXT))}
+OPTIONS = [OptionEntry(("-z", "--gzip"), None, 56, len(TEXT)), OptionEntry(("--color",), "WHEN", 60, 70)]
+
+
+def test_round_trip() -> None:
+    assert decode_page(encode_page(TEXT, SPANS, OPTIONS)) == (TEXT, SPANS, OPTIONS)
+
+
+def test_round_trip_without_options() -> None:
+    assert decode_page(encode_page(TEXT, SPANS)) == (TEXT, SPANS, [])
+
+
+def test_foreign_and_stale_blobs_are_misses() -> None:
+    blob = encode_page(TEXT, SPANS, OPTIONS)
+    assert decode_page(b"not a page") is None
+    assert decode_page(b"XXXX" + blob[4:]) is None
+    older = struct.pack("<4sH", CACHE_MAGIC, CACHE_VERSION - 1) + blob[6:]
+    assert decode_page(older) is None
+    assert decode_page(blob[:20]) is None
+
+
+def test_page_cache_is_keyed_by_source_and_width(tmp_path: Path) -> None:
+    source = tmp_path / "tar.1"
+    source.write_text(".TH TAR 1\n")
+    cache = PageCache(store=DiskCache("pages", 1 << 20, root=tmp_path))
+    cache.put(source, 80, TEXT, SPANS, OPTIONS)
+    assert cache.get(source, 80) == (TEXT, SPANS, OPTIONS)
+    assert cache.get(source, 100) is None
+    # Editing the source changes its stamp, which invalidates the entry.
+    source.write_text(".TH TAR 1\n.SH NAME\n")
+    assert cache.get(source, 80) is None
+
+
+def test_parser_fills_and_reuses_the_cache(manpath: Path) -> None:
+    parser = ManParser()
+    first = parser.parse("widget")
+    source = manpath / "man1" / "widget.1"
+    assert parser.cache.contains(source, parser.width)
+    again = ManParser().parse("widget")
+    assert again.raw_text == first.raw_text
+    assert again.spans == first.spans
+    assert again.options.entries == first.options.entries
+
+
+def test_eviction_keeps_the_total_under_the_bound(tmp_path: Path) -> None:
+    store = DiskCache("entries", 250, root=tmp_path)
+    for i in range(5):
+        store.put(f"key{i}", bytes(100))
+    entries, size = store.usage()
+    assert size <= 250
+    assert store.get("key4") == bytes(100)
+    assert int((store.directory / ".size").read_text()) == size
+
+
+def test_lost_total_is_recounted_once(tmp_path: Path) -> None:
+    store = DiskCache("entries", 1000, root=tmp_path)
+    store.put("a", bytes(100))
+    (store.directory / ".size").unlink()
+    store.put("b", bytes(100))
+    assert int((store.directory / ".size").read_text()) == 200
+    assert store.usage() == (2, 200)
+
+
+def test_counters(tmp_path: Path) -> None:
+    store = DiskCache("entries", 1000, root=tmp_path)
+    assert store.counters() == {}
+    store.bump("hits")
+    store.bump("hits")
+    store.bump("misses")
+    assert store.counters() == {"hits": 2, "misses": 1}
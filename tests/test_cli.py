@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from smartman.cli import run
+from smartman.daemon import build_request
+
+
+def run_cli(monkeypatch: pytest.MonkeyPatch, *argv: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["smartman", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        run()
+    return exit_info.value.code or 0
+
+
+def test_bare_words_are_page_names(manpath: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    # With "alias man=smartman", "man daemon" must open daemon(7), not start a server.
+    assert run_cli(monkeypatch, "daemon", "--plain") == 0
+    assert "without a controlling terminal" in capsys.readouterr().out
+
+
+def test_maintenance_commands_are_options(manpath: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    assert run_cli(monkeypatch, "--cache") == 0
+    assert "explanations" in capsys.readouterr().out
+    assert build_request(["--search", "widget"])["op"] == "search"
+    assert build_request(["search", "--plain"])["op"] == "plain"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from smartman.index.finder import default_finder_path, did_you_mean, open_finder_index, read_summary, trigrams
+
+
+def test_trigrams_are_padded_per_word() -> None:
+    assert trigrams("git-commit") == trigrams("git commit")
+    assert {" gi", "git", "it "} <= trigrams("git")
+
+
+def test_summaries_from_man_and_mdoc_sources(manpath: Path) -> None:
+    assert read_summary(manpath / "man1" / "widget.1") == "frobnicate widgets and gadgets"
+    assert read_summary(manpath / "man1" / "doohickey.1") == "print the current doohickey"
+    # A .so page takes the summary of the page it includes.
+    assert read_summary(manpath / "man1" / "gizmo.1") == "list directory contents of a gadget"
+
+
+def test_every_page_is_indexed(manpath: Path) -> None:
+    with open_finder_index() as index:
+        assert len(index) == 6
+        assert not index.is_stale()
+
+
+def test_find_by_name_typo_and_description(manpath: Path) -> None:
+    with open_finder_index() as index:
+        assert index.find("widget")[0].reference == "widget(1)"
+        assert index.find("widgte")[0].name == "widget"
+        assert index.find("directory contents")[0].name in ("gadget", "gizmo")
+        assert index.find("g")[0].name in ("gadget", "gizmo")
+        assert index.find("") == []
+
+
+def test_section_order_breaks_ties(manpath: Path) -> None:
+    with open_finder_index() as index:
+        assert [hit.reference for hit in index.find("widget", limit=2)] == ["widget(1)", "widget(3)"]
+
+
+def test_did_you_mean(manpath: Path) -> None:
+    assert did_you_mean("widgte") == "Did you mean widget(1) or widget(3)?"
+    assert did_you_mean("widgte(3)").startswith("Did you mean widget(3)")
+    assert did_you_mean("zzzzzz") is None
+
+
+def test_new_pages_are_picked_up(manpath: Path) -> None:
+    with open_finder_index() as index:
+        assert all(hit.name != "sprocket" for hit in index.find("sprocket"))
+    page = manpath / "man1" / "sprocket.1"
+    page.write_text(".TH SPROCKET 1\n.SH NAME\nsprocket \\- turn the sprockets\n")
+    # The directory's mtime is what marks it as changed.
+    stat = os.stat(manpath / "man1")
+    os.utime(manpath / "man1", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with open_finder_index() as index:
+        hit = index.find("sprocket")[0]
+    assert (hit.reference, hit.description) == ("sprocket(1)", "turn the sprockets")
+
+
+def test_unreadable_index_is_rebuilt(manpath: Path) -> None:
+    open_finder_index().close()
+    default_finder_path().write_bytes(b"garbage")
+    with open_finder_index() as index:
+        assert len(index) == 6
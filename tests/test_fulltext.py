@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from smartman.index.fulltext import FullTextIndex, build_fulltext_index
+
+
+def test_symlinked_pages_are_indexed_once(manpath: Path) -> None:
+    (manpath / "man1" / "unwidget.1").symlink_to("widget.1")
+    build_fulltext_index(jobs=1)
+    with FullTextIndex() as index:
+        hits = index.search("frobnicate")
+    assert [(hit.name, hit.aliases) for hit in hits] == [("widget", ["unwidget(1)"])]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from smartman.cli import app
+from smartman.parser.man_parser import ManParser, split_sections
+from smartman.parser.options import OptionTable, parse_options
+
+
+def widget_options() -> OptionTable:
+    return ManParser(use_cache=False).parse_options("widget")
+
+
+def test_entries_and_aliases(manpath: Path) -> None:
+    table = widget_options()
+    assert [entry.flags for entry in table.entries] == [("-a", "--all"), ("-v", "--verbose"), ("-z",), ("--color",)]
+    assert table.lookup("--all") == table.lookup("-a")
+    assert table.describe(table.lookup("-z")[0]) == "compress the output"
+    assert table.describe(table.lookup("-v")[0]) == "explain what is being done"
+
+
+def test_arguments_and_values(manpath: Path) -> None:
+    table = widget_options()
+    (color,) = table.lookup("--color=always")
+    assert color.argument == "[=WHEN]"
+    # groff may print U+2010 for a hyphen.
+    assert table.lookup("‐‐color") == [color]
+
+
+def test_bundled_short_flags(manpath: Path) -> None:
+    table = widget_options()
+    assert [entry.flags[0] for entry in table.lookup("-zav")] == ["-z", "-a", "-v"]
+    assert table.lookup("-zq") == []
+    assert table.lookup("--missing") == []
+
+
+def test_synopsis_and_see_also_are_not_options() -> None:
+    text, spans = split_sections([
+        "SYNOPSIS", "       -x     not an option here", "",
+        "OPTIONS", "       -y     an option", "",
+        "SEE ALSO", "       -z     not one either",
+    ])
+    assert [entry.flags for entry in parse_options(text, spans)] == [("-y",)]
+
+
+def test_cli_prints_each_flag_once(manpath: Path) -> None:
+    result = CliRunner().invoke(app, ["widget", "-zav", "-z"])
+    assert result.exit_code == 0
+    assert result.output.count("compress the output") == 1
+    assert "include hidden widgets" in result.output
+
+
+def test_cli_reports_missing_flags(manpath: Path) -> None:
+    result = CliRunner().invoke(app, ["widget", "-q"])
+    assert result.exit_code == 1
+    assert "No entry for -q" in result.output
+
+
+def test_cli_own_options_after_the_page_name(manpath: Path) -> None:
+    result = CliRunner().invoke(app, ["widget", "--theme", "dracula", "--plain"])
+    assert result.exit_code == 0
+    assert "frobnicate widgets and gadgets" in result.output
+    # After "--" they are the page's flags again.
+    result = CliRunner().invoke(app, ["widget", "--", "--plain"])
+    assert result.exit_code == 1
+    assert "No entry for --plain" in result.output
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from smartman.parser.man_parser import ManParser
+from smartman.parser.roff import RoffRenderer, UnsupportedRoff, render_man_source
+
+
+def render(source: str, width: int = 80) -> list[str]:
+    return list(RoffRenderer(width).render(source.splitlines()))
+
+
+def test_headings_flush_left_and_body_indented(manpath: Path) -> None:
+    lines = list(render_man_source(manpath / "man1" / "widget.1"))
+    assert "NAME" in lines
+    assert "       widget - frobnicate widgets and gadgets" in lines
+    assert "SEE ALSO" in lines
+    assert "       gadget(1), widget(3)" in lines
+
+
+def test_tagged_paragraphs() -> None:
+    lines = render(".SH OPTIONS\n.TP\n\\fB\\-a\\fR, \\fB\\-\\-all\\fR\ninclude hidden\n.TP\n\\fB\\-z\\fR\ncompress\n")
+    assert lines[1:] == [
+        "       -a, --all",
+        "              include hidden",
+        "",
+        "       -z     compress",
+    ]
+
+
+def test_escapes_and_fonts() -> None:
+    lines = render(".SH NAME\n\\fBfoo\\fP \\(em bar\\ baz \\(lqquoted\\(rq \\e\n")
+    assert lines[1] == "       foo — bar baz “quoted” \\"
+
+
+def test_fill_wraps_at_width() -> None:
+    lines = render(".SH DESCRIPTION\n" + "word " * 40 + "\n", width=40)
+    body = lines[1:]
+    assert len(body) > 1
+    assert all(len(line) <= 40 and line.startswith("       word") for line in body)
+
+
+def test_nofill_keeps_lines() -> None:
+    lines = render(".SH EXAMPLES\n.nf\nfoo  \\-x\n  bar\n.fi\n")
+    assert lines[1:] == ["       foo  -x", "         bar"]
+
+
+def test_am_appends_to_a_macro() -> None:
+    lines = render(".de XX\nfirst\n..\n.am XX\nsecond\n..\n.SH NAME\n.XX\n")
+    assert lines[1] == "       first second"
+
+
+def test_so_redirect_is_followed(manpath: Path) -> None:
+    lines = list(render_man_source(manpath / "man1" / "gizmo.1"))
+    assert "       gadget - list directory contents of a gadget" in lines
+
+
+def test_mdoc_is_unsupported(manpath: Path) -> None:
+    with pytest.raises(UnsupportedRoff):
+        list(render_man_source(manpath / "man1" / "doohickey.1"))
+
+
+def test_so_in_the_middle_of_a_page_is_unsupported() -> None:
+    with pytest.raises(UnsupportedRoff):
+        render(".SH NAME\nfoo \\- bar\n.so man1/other.1\n")
+
+
+def test_self_referential_string_is_unsupported() -> None:
+    with pytest.raises(UnsupportedRoff):
+        render(".ds X a\\*X\n.SH NAME\n\\*X\n")
+
+
+def test_fallback_replaces_the_whole_page(manpath: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # The renderer handles NAME, then gives up at the .so: every section must come from man.
+    (manpath / "man1" / "late.1").write_text(
+        ".TH LATE 1\n.SH NAME\nlate \\- native name\n.SH DESCRIPTION\n.so man1/widget.1\n"
+    )
+    man_output = ["NAME", "       late - from man", "", "DESCRIPTION", "       man's description"]
+    monkeypatch.setattr(ManParser, "_stream_man", lambda self, command: iter(man_output))
+
+    sections = list(ManParser(use_cache=False).iter_sections("late"))
+    assert sections == [("NAME", "late - from man"), ("DESCRIPTION", "man's description")]
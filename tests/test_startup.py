@@ -0,0 +1,53 @@
+"""Cold CLI startup stays within its millisecond budget.
+
+Each run is a fresh ``python -m smartman.cli`` process, as behind
+``alias man=smartman``. Budgets count the time beyond a bare
+``python -c pass``, so a slow interpreter does not fail them, and the
+fastest of a few runs is compared, so a busy machine does not either. See
+``benchmarks/startup_budget.py`` for the same measurement on real pages.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+VERSION_BUDGET_MS = 150.0
+PLAIN_BUDGET_MS = 250.0
+RUNS = 5
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def _time_run(args: list[str], env: dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.fixture
+def cli_env(manpath: Path) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO), env.get("PYTHONPATH")]))
+    return env
+
+
+@pytest.mark.parametrize(
+    ("args", "budget"),
+    [(["--version"], VERSION_BUDGET_MS), (["--plain", "widget"], PLAIN_BUDGET_MS)],
+    ids=["version", "plain"],
+)
+def test_cold_startup_within_budget(cli_env: dict[str, str], args: list[str], budget: float) -> None:
+    command = [sys.executable, "-m", "smartman.cli", *args]
+    # The first run fills the page cache: what is measured is startup and a cache hit.
+    _time_run(command, cli_env)
+    interpreter = min(_time_run([sys.executable, "-c", "pass"], cli_env) for _ in range(RUNS))
+    fastest = min(_time_run(command, cli_env) for _ in range(RUNS))
+    overhead = fastest - interpreter
+    assert overhead <= budget, f"{' '.join(args)}: {overhead:.0f} ms over a bare interpreter"
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from rich.style import Style
+
+from smartman.utils import get_cache_dir
+from smartman.utils.themes import THEME_CACHE_FILE, load_theme
+
+
+@pytest.fixture
+def user_themes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    directory = tmp_path / "config" / "smartman" / "themes"
+    directory.mkdir(parents=True)
+    return directory
+
+
+def test_cache_is_plain_json(user_themes: Path) -> None:
+    (user_themes / "mine.yaml").write_text('heading: "bold red"\n')
+    theme = load_theme("mine")
+    cached = json.loads((get_cache_dir() / THEME_CACHE_FILE).read_text())
+    assert cached["themes"]["mine"] == {"heading": "bold red"}
+    assert theme.styles["heading"] == Style.parse("bold red")
+    # Keys the theme leaves out get the default style.
+    assert theme.styles["flag"] == Style.parse("bold yellow")
+
+
+def test_cached_load_matches_fresh_load(user_themes: Path) -> None:
+    (user_themes / "mine.yaml").write_text('heading: "bold red"\nflag: "not a style ["\n')
+    fresh = load_theme("mine")
+    cached = load_theme("mine")
+    assert cached == fresh
+    assert cached.styles == fresh.styles
+
+
+def test_edited_theme_is_reloaded(user_themes: Path) -> None:
+    path = user_themes / "mine.yaml"
+    path.write_text('heading: "bold red"\n')
+    load_theme("mine")
+    path.write_text('heading: "italic green"\n# longer, so the size changes too\n')
+    assert load_theme("mine").styles["heading"] == Style.parse("italic green")
+
+
+def test_unknown_theme_falls_back_to_default(user_themes: Path) -> None:
+    assert load_theme("no-such-theme") == load_theme("default")